@@ -13,7 +13,14 @@ from conans.util.files import load
 
 # complex_search: With ORs and not filtering by not restricted settings
 COMPLEX_SEARCH_CAPABILITY = "complex_search"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, ]
+# xz_archives: The remote accepts (and its clients can read) xz compressed conan_xxx.tgz files.
+# Not a default capability, the server cannot know it of the clients, xz_archives in server.conf
+XZ_ARCHIVES_CAPABILITY = "xz_archives"
+# batch_info: Manifests and conaninfo of many references in a single request
+BATCH_INFO_CAPABILITY = "batch_info"
+# checksum_deploy: The file uploads accept X-Checksum-Deploy requests, deduplicating by sha1
+CHECKSUM_DEPLOY_CAPABILITY = "checksum_deploy"
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, BATCH_INFO_CAPABILITY, CHECKSUM_DEPLOY_CAPABILITY]
 
 
 __version__ = '1.4.0-dev'
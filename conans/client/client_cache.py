@@ -6,6 +6,7 @@ from conans.client.conf import ConanClientConfigParser, default_client_conf, def
 from conans.client.conf.detect import detect_defaults_settings
 from conans.client.output import Color
 from conans.client.profile_loader import read_profile
+from conans.client.store.blob_store import BlobStore
 from conans.errors import ConanException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
@@ -14,8 +15,10 @@ from conans.model.ref import ConanFileReference
 from conans.model.settings import Settings
 from conans.paths import SimplePaths, CONANINFO, PUT_HEADERS, check_ref_case,\
     CONAN_MANIFEST
+from conans.util.env_reader import get_env
 from conans.util.files import save, load, normalize, list_folder_subdirs
-from conans.util.locks import SimpleLock, ReadLock, WriteLock, NoLock, Lock
+from conans.util.locks import SimpleLock, ReadLock, WriteLock, NoLock, Lock, FcntlReadLock, \
+    FcntlWriteLock
 import shutil
 from conans.unicode import get_cwd
 
@@ -47,6 +50,7 @@ class ClientCache(SimplePaths):
         self._store_folder = store_folder or self.conan_config.storage_path or self.conan_folder
         self._default_profile = None
         self._no_lock = None
+        self._fcntl_locks = None
         self.client_cert_path = normpath(join(self.conan_folder, CLIENT_CERT))
         self.client_cert_key_path = normpath(join(self.conan_folder, CLIENT_KEY))
 
@@ -61,21 +65,37 @@ class ClientCache(SimplePaths):
             self._no_lock = self.conan_config.cache_no_locks
         return self._no_lock
 
+    def _rw_lock(self, conan_ref, write):
+        if self._fcntl_locks is None:
+            backend = self.conan_config.cache_lock_backend
+            if backend not in ("count", "fcntl"):
+                raise ConanException("Invalid cache_lock_backend '%s', use 'count' or 'fcntl'"
+                                     % backend)
+            self._fcntl_locks = backend == "fcntl" and FcntlReadLock.available()
+            if backend == "fcntl" and not self._fcntl_locks:
+                self._output.warn("fcntl cache locks not available, using 'count' locks")
+        if self._fcntl_locks:
+            lock_class = FcntlWriteLock if write else FcntlReadLock
+            return lock_class(self.conan(conan_ref), conan_ref, self._output,
+                              self.conan_config.cache_lock_timeout)
+        lock_class = WriteLock if write else ReadLock
+        return lock_class(self.conan(conan_ref), conan_ref, self._output)
+
     def conanfile_read_lock(self, conan_ref):
         if self._no_locks():
             return NoLock()
-        return ReadLock(self.conan(conan_ref), conan_ref, self._output)
+        return self._rw_lock(conan_ref, write=False)
 
     def conanfile_write_lock(self, conan_ref):
         if self._no_locks():
             return NoLock()
-        return WriteLock(self.conan(conan_ref), conan_ref, self._output)
+        return self._rw_lock(conan_ref, write=True)
 
     def conanfile_lock_files(self, conan_ref):
         # Used in ConanRemover
         if self._no_locks():
             return ()
-        return WriteLock(self.conan(conan_ref), conan_ref, self._output).files
+        return self._rw_lock(conan_ref, write=True).files
 
     def package_lock(self, package_ref):
         if self._no_locks():
@@ -106,6 +126,20 @@ class ClientCache(SimplePaths):
         except Exception:
             raise ConanException("Invalid %s file!" % self.put_headers_path)
 
+    @property
+    def blob_store(self):
+        """ The BlobStore deduplicating the package files, None if not enabled """
+        folder = get_env("CONAN_BLOB_STORE", None)
+        if not folder:
+            return None
+        return BlobStore(os.path.abspath(os.path.expanduser(folder)), self._output)
+
+    def deduplicate_package(self, package_folder):
+        """ Hardlinks the files of a new package folder to the blob store, if enabled """
+        blob_store = self.blob_store
+        if blob_store:
+            blob_store.deduplicate(package_folder)
+
     @property
     def registry(self):
         return join(self.conan_folder, REGISTRY)
@@ -237,18 +271,21 @@ class ClientCache(SimplePaths):
         if not os.path.exists(os.path.join(export_folder, CONAN_MANIFEST)):
             return None, None
         export_sources_path = self.export_sources(conan_reference, short_paths=None)
-        return self._digests(export_folder, export_sources_path)
+        return self._digests(export_folder, self.hashes_cache(conan_reference),
+                             export_sources_path)
 
     def package_manifests(self, package_reference):
         package_folder = self.package(package_reference, short_paths=None)
         if not os.path.exists(os.path.join(package_folder, CONAN_MANIFEST)):
             return None, None
-        return self._digests(package_folder)
+        return self._digests(package_folder, self.hashes_cache(package_reference.conan,
+                                                               package_reference.package_id))
 
     @staticmethod
-    def _digests(folder, exports_sources_folder=None):
+    def _digests(folder, hashes_cache, exports_sources_folder=None):
         readed_digest = FileTreeManifest.load(folder)
-        expected_digest = FileTreeManifest.create(folder, exports_sources_folder)
+        expected_digest = FileTreeManifest.create(folder, exports_sources_folder,
+                                                  hashes_cache=hashes_cache)
         return readed_digest, expected_digest
 
     def delete_empty_dirs(self, deleted_refs):
@@ -279,6 +316,7 @@ class ClientCache(SimplePaths):
         self._settings = None
         self._default_profile = None
         self._no_lock = None
+        self._fcntl_locks = None
 
 
 def _mix_settings_with_env(settings):
@@ -66,6 +66,7 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
     user_io.out.info("Copied sources %s to %s" % (str(src_ref), str(dest_ref)))
 
     # Copy packages
+    blob_store = getattr(paths, "blob_store", None)
     for package_id in package_ids:
         package_origin = PackageReference(src_ref, package_id)
         package_dest = PackageReference(dest_ref, package_id)
@@ -76,5 +77,8 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
                                                          " Override?" % str(package_id)):
                 continue
             rmdir(package_path_dest)
-        shutil.copytree(package_path_origin, package_path_dest, symlinks=True)
+        if blob_store:
+            blob_store.copy_folder(package_path_origin, package_path_dest)
+        else:
+            shutil.copytree(package_path_origin, package_path_dest, symlinks=True)
         user_io.out.info("Copied %s to %s" % (str(package_id), str(dest_ref)))
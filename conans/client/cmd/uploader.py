@@ -1,5 +1,8 @@
 import time
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
+from conans.client.output import ThreadBufferedStream, ScopedOutput
 from conans.errors import ConanException, NotFoundException
 from conans.model.ref import PackageReference, ConanFileReference
 from conans.util.log import logger
@@ -29,8 +32,11 @@ class CmdUpload(object):
 
     def upload(self, recorder, reference_or_pattern, package_id=None, all_packages=None,
                force=False, confirm=False, retry=0, retry_wait=0, skip_upload=False,
-               integrity_check=False, no_overwrite=None, remote_name=None):
-        """If package_id is provided, conan_reference_or_pattern is a ConanFileReference"""
+               integrity_check=False, no_overwrite=None, remote_name=None, parallel=1):
+        """If package_id is provided, conan_reference_or_pattern is a ConanFileReference
+        With parallel > 1, up to that number of packages (of any of the references) are
+        compressed and uploaded concurrently, while the next recipes are being uploaded
+        """
 
         if package_id and not _is_a_reference(reference_or_pattern):
             raise ConanException("-p parameter only allowed with a valid recipe reference, "
@@ -46,31 +52,37 @@ class CmdUpload(object):
                 raise NotFoundException(("No packages found matching pattern '%s'" %
                                          reference_or_pattern))
 
-        for conan_ref in references:
-            upload = True
-            if not confirm:
-                msg = "Are you sure you want to upload '%s'?" % str(conan_ref)
-                upload = self._user_io.request_boolean(msg)
-            if upload:
-                try:
-                    conanfile_path = self._client_cache.conanfile(conan_ref)
-                    conan_file = load_conanfile_class(conanfile_path)
-                except NotFoundException:
-                    raise NotFoundException(("There is no local conanfile exported as %s" %
-                                          str(conan_ref)))
-                if all_packages:
-                    packages_ids = self._client_cache.conan_packages(conan_ref)
-                elif package_id:
-                    packages_ids = [package_id, ]
-                else:
-                    packages_ids = []
-                self._upload(conan_file, conan_ref, force, packages_ids, retry, retry_wait,
-                             skip_upload, integrity_check, no_overwrite, remote_name, recorder)
+        package_uploads = _PackageUploads(self._user_io.out, recorder, parallel)
+        try:
+            for conan_ref in references:
+                upload = True
+                if not confirm:
+                    msg = "Are you sure you want to upload '%s'?" % str(conan_ref)
+                    upload = self._user_io.request_boolean(msg)
+                if upload:
+                    try:
+                        conanfile_path = self._client_cache.conanfile(conan_ref)
+                        conan_file = load_conanfile_class(conanfile_path)
+                    except NotFoundException:
+                        raise NotFoundException(("There is no local conanfile exported as %s" %
+                                                 str(conan_ref)))
+                    if all_packages:
+                        packages_ids = self._client_cache.conan_packages(conan_ref)
+                    elif package_id:
+                        packages_ids = [package_id, ]
+                    else:
+                        packages_ids = []
+                    self._upload(conan_file, conan_ref, force, packages_ids, retry, retry_wait,
+                                 skip_upload, integrity_check, no_overwrite, remote_name, recorder,
+                                 package_uploads)
+            package_uploads.report(wait=True)
+        finally:
+            package_uploads.close()
 
         logger.debug("====> Time manager upload: %f" % (time.time() - t1))
 
     def _upload(self, conan_file, conan_ref, force, packages_ids, retry, retry_wait, skip_upload,
-                integrity_check, no_overwrite, remote_name, recorder):
+                integrity_check, no_overwrite, remote_name, recorder, package_uploads):
         """Uploads the recipes and binaries identified by conan_ref"""
 
         defined_remote = self._registry.get_ref(conan_ref)
@@ -97,15 +109,14 @@ class CmdUpload(object):
                                      "no packages can be uploaded")
             total = len(packages_ids)
             for index, package_id in enumerate(packages_ids):
-                ret_upload_package = self._upload_package(PackageReference(conan_ref, package_id),
-                                                          index + 1, total, retry, retry_wait,
-                                                          skip_upload, integrity_check,
-                                                          no_overwrite, upload_remote)
-                if ret_upload_package:
-                    recorder.add_package(str(conan_ref), package_id)
+                package_uploads.upload(conan_ref, package_id, self._upload_package,
+                                       PackageReference(conan_ref, package_id), index + 1, total,
+                                       retry, retry_wait, skip_upload, integrity_check,
+                                       no_overwrite, upload_remote)
 
         if not defined_remote and not skip_upload:
-            self._registry.set_ref(conan_ref, upload_remote)
+            # Once all its packages are uploaded
+            package_uploads.then(self._registry.set_ref, conan_ref, upload_remote)
 
     def _upload_recipe(self, conan_reference, retry, retry_wait, skip_upload, no_overwrite, remote):
         conan_file_path = self._client_cache.conanfile(conan_reference)
@@ -149,3 +160,72 @@ class CmdUpload(object):
             raise ConanException("Remote recipe is newer than local recipe: "
                                  "\n Remote date: %s\n Local date: %s" %
                                  (remote_recipe_manifest.time, local_manifest.time))
+
+
+class _PackageUploads(object):
+    """ Runs the package uploads, up to 'parallel' at the same time, and reports them (output,
+    recorder and any later action) in the same order they would have happened sequentially
+    """
+
+    def __init__(self, output, recorder, parallel):
+        self._output = output
+        self._recorder = recorder
+        self._pending = deque()
+        self._pool = None
+        if parallel and parallel > 1:
+            self._pool = ThreadPool(parallel)
+            # So every upload output is printed at once, not mixed with the concurrent ones
+            self._stream = ThreadBufferedStream(output._stream)
+            output._stream = self._stream
+
+    def upload(self, conan_ref, package_id, upload_package, *args):
+        if not self._pool:
+            if upload_package(*args):
+                self._recorder.add_package(str(conan_ref), package_id)
+            return
+        result = self._pool.apply_async(self._buffered_upload, (upload_package, args))
+        self._pending.append((conan_ref, package_id, result))
+        self.report(wait=False)
+
+    def then(self, action, *args):
+        """ Runs the action once the previous uploads have finished successfully """
+        if not self._pool:
+            action(*args)
+            return
+        self._pending.append((None, None, lambda: action(*args)))
+
+    def _buffered_upload(self, upload_package, args):
+        with self._stream.buffered() as buffer:
+            try:
+                return upload_package(*args), buffer.getvalue(), None
+            except Exception as exc:
+                return None, buffer.getvalue(), exc
+
+    def report(self, wait):
+        """ Reports the finished uploads, in order, raising the first failure """
+        while self._pending:
+            conan_ref, package_id, result = self._pending[0]
+            if conan_ref is None:
+                self._pending.popleft()
+                result()
+                continue
+            if not wait and not result.ready():
+                return
+            self._pending.popleft()
+            uploaded, text, exc = result.get()
+            scoped_output = ScopedOutput(str(conan_ref), self._output)
+            for line in text.splitlines():
+                line = line.split("\r")[-1].rstrip()  # Only the final state of rewritten lines
+                if line:
+                    scoped_output.writeln(line)
+            if exc:
+                raise exc
+            if uploaded:
+                self._recorder.add_package(str(conan_ref), package_id)
+
+    def close(self):
+        if self._pool:
+            # Pending uploads are not started if there was an error
+            self._pool.terminate()
+            self._pool.join()
+            self._output._stream = self._stream.stream
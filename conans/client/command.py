@@ -879,6 +879,9 @@ class Command(object):
                             help="Uploads package only if recipe is the same as the remote one")
         parser.add_argument("-j", "--json", default=None, action=OnceArgument,
                             help='json file path where the install information will be written to')
+        parser.add_argument("--parallel", default=1, type=int, action=OnceArgument,
+                            help='Number of packages compressed and uploaded at the same time. '
+                                 'Defaulted to 1')
 
         args = parser.parse_args(*args)
 
@@ -890,7 +893,8 @@ class Command(object):
                                       remote=args.remote, all_packages=args.all, force=args.force,
                                       confirm=args.confirm, retry=args.retry,
                                       retry_wait=args.retry_wait, skip_upload=args.skip_upload,
-                                      integrity_check=args.check, no_overwrite=args.no_overwrite)
+                                      integrity_check=args.check, no_overwrite=args.no_overwrite,
+                                      parallel=args.parallel)
         except ConanException as exc:
             info = exc.info
             raise
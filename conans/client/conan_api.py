@@ -23,6 +23,7 @@ from conans.client.rest.conan_requester import ConanRequester
 from conans.client.rest.version_checker import VersionCheckerRequester
 from conans.client.runner import ConanRunner
 from conans.client.store.localdb import LocalDB
+from conans.client.store.metadata_cache import MetadataCache
 from conans.client.cmd.test import PackageTester
 from conans.client.userio import UserIO
 from conans.errors import ConanException
@@ -74,7 +75,11 @@ def api_method(f):
             log_command(f.__name__, kwargs)
             with tools.environment_append(the_self._client_cache.conan_config.env_vars):
                 # Patch the globals in tools
-                return f(*args, **kwargs)
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    # The references registered by the command, written once
+                    the_self._registry.flush()
         except Exception as exc:
             msg = exception_message_safe(exc)
             try:
@@ -142,8 +147,13 @@ class ConanAPIV1(object):
 
         # To handle remote connections
         put_headers = client_cache.read_put_headers()
+        metadata_cache_ttl = get_env("CONAN_METADATA_CACHE_TTL", 0)
+        metadata_cache = None
+        if metadata_cache_ttl > 0:
+            metadata_cache = MetadataCache(os.path.join(client_cache.conan_folder,
+                                                        "metadata_cache"), metadata_cache_ttl)
         rest_api_client = RestApiClient(user_io.out, requester=version_checker_req,
-                                        put_headers=put_headers)
+                                        put_headers=put_headers, metadata_cache=metadata_cache)
         # To store user and token
         localdb = LocalDB(client_cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -685,7 +695,7 @@ class ConanAPIV1(object):
     @api_method
     def upload(self, pattern, package=None, remote=None, all_packages=False, force=False,
                confirm=False, retry=2, retry_wait=5, skip_upload=False, integrity_check=False,
-               no_overwrite=None):
+               no_overwrite=None, parallel=1):
         """ Uploads a package recipe and the generated binary packages to a specified remote
         """
 
@@ -701,7 +711,8 @@ class ConanAPIV1(object):
                              self._registry)
         try:
             uploader.upload(recorder, pattern, package, all_packages, force, confirm, retry,
-                            retry_wait, skip_upload, integrity_check, no_overwrite, remote)
+                            retry_wait, skip_upload, integrity_check, no_overwrite, remote,
+                            parallel)
             return recorder.get_info()
         except ConanException as exc:
             recorder.error = True
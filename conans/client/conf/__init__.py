@@ -83,16 +83,28 @@ print_run_commands = False  # environment CONAN_PRINT_RUN_COMMANDS
 [general]
 default_profile = %s
 compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
+# compression_threads = 1             # environment CONAN_COMPRESSION_THREADS (parallel gzip of the archives)
+# hash_threads = 4                    # environment CONAN_HASH_THREADS (parallel md5 of the manifests, default the cpu count)
+# compression_format = gzip           # environment CONAN_COMPRESSION_FORMAT (gzip/xz of the package archive, xz if the remote supports it)
+# xz_compression_preset = 6           # environment CONAN_XZ_COMPRESSION_PRESET (0-9, the highest ones need hundreds of MB)
 sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
 request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
+# http_pool_size = 10                 # environment CONAN_HTTP_POOL_SIZE (kept alive connections per host)
+# metadata_cache_ttl = 0              # environment CONAN_METADATA_CACHE_TTL (seconds, lower than the server authorize_timeout)
 # sysrequires_mode = enabled            # environment CONAN_SYSREQUIRES_MODE (allowed modes enabled/verify/disabled)
 # vs_installation_preference = Enterprise, Professional, Community, BuildTools # environment CONAN_VS_INSTALLATION_PREFERENCE
 # verbose_traceback = False           # environment CONAN_VERBOSE_TRACEBACK
 # bash_path = ""                      # environment CONAN_BASH_PATH (only windows)
 # recipe_linter = False               # environment CONAN_RECIPE_LINTER
+# recipe_bytecode_cache = your_path   # environment CONAN_RECIPE_BYTECODE_CACHE (folder to keep the compiled recipes)
 # read_only_cache = True              # environment CONAN_READ_ONLY_CACHE
+# blob_store = your_path              # environment CONAN_BLOB_STORE (hardlinked package files, same filesystem as the storage)
+# download_cache = your_path          # environment CONAN_DOWNLOAD_CACHE (files of tools.get/tools.download, can be shared)
+# download_cache_max_size = 0         # environment CONAN_DOWNLOAD_CACHE_MAX_SIZE (MB, least recently used files removed, 0 unlimited)
 # pylintrc = path/to/pylintrc_file    # environment CONAN_PYLINTRC
 # cache_no_locks = True
+# cache_lock_backend = fcntl          # "count" (default) or "fcntl" (kernel reader/writer locks, not in Windows)
+# cache_lock_timeout = 0              # seconds waiting for a fcntl lock, 0 waits forever (parallel install jobs poll it)
 # user_home_short = your_path         # environment CONAN_USER_HOME_SHORT
 # skip_vs_projects_upgrade = False    # environment CONAN_SKIP_VS_PROJECTS_UPGRADE
 # non_interactive = False             # environment CONAN_NON_INTERACTIVE
@@ -111,6 +123,9 @@ request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (secon
 # cmake_find_root_path_mode_include   # environment CONAN_CMAKE_FIND_ROOT_PATH_MODE_INCLUDE
 
 # cpu_count = 1             # environment CONAN_CPU_COUNT
+# install_jobs = 1          # environment CONAN_INSTALL_JOBS (parallel binary packages retrieval)
+# parallel_transfers = 1    # environment CONAN_PARALLEL_TRANSFERS (concurrent files of a package)
+# parallel_remotes = False  # environment CONAN_PARALLEL_REMOTES (look for recipes in all the remotes at once)
 
 # Change the default location for building test packages to a temporary folder
 # which is deleted after the test.
@@ -157,16 +172,29 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_TRACE_FILE": self._env_c("log.trace_file", "CONAN_TRACE_FILE", None),
                "CONAN_PRINT_RUN_COMMANDS": self._env_c("log.print_run_commands", "CONAN_PRINT_RUN_COMMANDS", "False"),
                "CONAN_COMPRESSION_LEVEL": self._env_c("general.compression_level", "CONAN_COMPRESSION_LEVEL", "9"),
+               "CONAN_COMPRESSION_THREADS": self._env_c("general.compression_threads", "CONAN_COMPRESSION_THREADS", None),
+               "CONAN_HASH_THREADS": self._env_c("general.hash_threads", "CONAN_HASH_THREADS", None),
+               "CONAN_COMPRESSION_FORMAT": self._env_c("general.compression_format", "CONAN_COMPRESSION_FORMAT", None),
+               "CONAN_XZ_COMPRESSION_PRESET": self._env_c("general.xz_compression_preset", "CONAN_XZ_COMPRESSION_PRESET", None),
                "CONAN_NON_INTERACTIVE": self._env_c("general.non_interactive", "CONAN_NON_INTERACTIVE", "False"),
                "CONAN_PYLINTRC": self._env_c("general.pylintrc", "CONAN_PYLINTRC", None),
                "CONAN_PYLINT_WERR": self._env_c("general.pylint_werr", "CONAN_PYLINT_WERR", None),
                "CONAN_SYSREQUIRES_SUDO": self._env_c("general.sysrequires_sudo", "CONAN_SYSREQUIRES_SUDO", "False"),
                "CONAN_SYSREQUIRES_MODE": self._env_c("general.sysrequires_mode", "CONAN_SYSREQUIRES_MODE", "enabled"),
                "CONAN_REQUEST_TIMEOUT": self._env_c("general.request_timeout", "CONAN_REQUEST_TIMEOUT", None),
+               "CONAN_HTTP_POOL_SIZE": self._env_c("general.http_pool_size", "CONAN_HTTP_POOL_SIZE", None),
+               "CONAN_METADATA_CACHE_TTL": self._env_c("general.metadata_cache_ttl", "CONAN_METADATA_CACHE_TTL", None),
                "CONAN_VS_INSTALLATION_PREFERENCE": self._env_c("general.vs_installation_preference", "CONAN_VS_INSTALLATION_PREFERENCE", None),
                "CONAN_RECIPE_LINTER": self._env_c("general.recipe_linter", "CONAN_RECIPE_LINTER", "True"),
+               "CONAN_RECIPE_BYTECODE_CACHE": self._env_c("general.recipe_bytecode_cache", "CONAN_RECIPE_BYTECODE_CACHE", None),
                "CONAN_CPU_COUNT": self._env_c("general.cpu_count", "CONAN_CPU_COUNT", None),
+               "CONAN_INSTALL_JOBS": self._env_c("general.install_jobs", "CONAN_INSTALL_JOBS", None),
+               "CONAN_PARALLEL_TRANSFERS": self._env_c("general.parallel_transfers", "CONAN_PARALLEL_TRANSFERS", None),
+               "CONAN_PARALLEL_REMOTES": self._env_c("general.parallel_remotes", "CONAN_PARALLEL_REMOTES", None),
                "CONAN_READ_ONLY_CACHE": self._env_c("general.read_only_cache", "CONAN_READ_ONLY_CACHE", None),
+               "CONAN_BLOB_STORE": self._env_c("general.blob_store", "CONAN_BLOB_STORE", None),
+               "CONAN_DOWNLOAD_CACHE": self._env_c("general.download_cache", "CONAN_DOWNLOAD_CACHE", None),
+               "CONAN_DOWNLOAD_CACHE_MAX_SIZE": self._env_c("general.download_cache_max_size", "CONAN_DOWNLOAD_CACHE_MAX_SIZE", None),
                "CONAN_USER_HOME_SHORT": self._env_c("general.user_home_short", "CONAN_USER_HOME_SHORT", None),
                "CONAN_VERBOSE_TRACEBACK": self._env_c("general.verbose_traceback", "CONAN_VERBOSE_TRACEBACK", None),
                # http://www.vtk.org/Wiki/CMake_Cross_Compiling
@@ -286,6 +314,20 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return False
 
+    @property
+    def cache_lock_backend(self):
+        try:
+            return self.get_item("general.cache_lock_backend")
+        except ConanException:
+            return "count"
+
+    @property
+    def cache_lock_timeout(self):
+        try:
+            return float(self.get_item("general.cache_lock_timeout"))
+        except ConanException:
+            return None
+
     @property
     def storage(self):
         return dict(self.get_conf("storage"))
@@ -1,6 +1,6 @@
 from conans.model.ref import PackageReference
 from conans.model.info import ConanInfo
-from conans.errors import conanfile_exception_formatter
+from conans.errors import conanfile_exception_formatter, ConanException
 
 
 class Node(object):
@@ -85,15 +85,24 @@ class Edge(object):
 class DepsGraph(object):
     def __init__(self):
         self.nodes = set()
+        # Memoized levels and closures, only valid while the graph is not modified
+        self._levels = {}
+        self._closures = {}
+
+    def _invalidate(self):
+        self._levels = {}
+        self._closures = {}
 
     def add_node(self, node):
         self.nodes.add(node)
+        self._invalidate()
 
     def add_edge(self, src, dst, private=False):
         assert src in self.nodes and dst in self.nodes
         edge = Edge(src, dst, private)
         src.add_edge(edge)
         dst.add_edge(edge)
+        self._invalidate()
 
     def propagate_info(self):
         """ takes the exports from upper level and updates the imports
@@ -145,46 +154,50 @@ class DepsGraph(object):
         return open_nodes
 
     def ordered_closure(self, node, flat):
-        closure = set()
-        current = node.neighbors()
-        while current:
-            new_current = set()
-            for n in current:
-                closure.add(n)
-                new_neighs = n.public_neighbors()
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
-            current = new_current
+        key = ("ordered", node)
+        closure = self._closures.get(key)
+        if closure is None:
+            closure = set()
+            current = node.neighbors()
+            while current:
+                closure.update(current)
+                new_current = set()
+                for n in current:
+                    new_current.update(n.public_neighbors())
+                current = new_current.difference(closure)
+            self._closures[key] = closure
 
         result = [n for n in flat if n in closure]
         return result
 
     def public_closure(self, node):
-        closure = {}
-        current = node.neighbors()
-        while current:
-            new_current = set()
-            for n in current:
-                closure[n.conan_ref.name] = n
-                new_neighs = n.public_neighbors()
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
-            current = new_current
-
-        return closure
+        key = ("public", node)
+        closure = self._closures.get(key)
+        if closure is None:
+            closure = {}
+            current = node.neighbors()
+            while current:
+                new_current = set()
+                for n in current:
+                    closure[n.conan_ref.name] = n
+                    new_neighs = n.public_neighbors()
+                    to_add = set(new_neighs).difference(current)
+                    new_current.update(to_add)
+                current = new_current
+            self._closures[key] = closure
+
+        return dict(closure)
 
     def _inverse_closure(self, references):
-        closure = set()
-        current = [n for n in self.nodes if str(n.conan_ref) in references or "ALL" in references]
-        closure.update(current)
+        closure = set(n for n in self.nodes
+                      if str(n.conan_ref) in references or "ALL" in references)
+        current = closure
         while current:
             new_current = set()
             for n in current:
-                closure.add(n)
-                new_neighs = n.inverse_neighbors()
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
-            current = new_current
+                new_current.update(n.inverse_neighbors())
+            current = new_current.difference(closure)
+            closure.update(current)
         return closure
 
     def build_order(self, references):
@@ -209,23 +222,47 @@ class DepsGraph(object):
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        current_level = []
+        levels = self._levels.get(direct)
+        if levels is None:
+            levels = self._compute_levels(direct)
+            self._levels[direct] = levels
+        # Copies, the callers pop and extend them
+        return [list(level) for level in levels]
+
+    def _compute_levels(self, direct):
+        """ Kahn topological sort, every node is visited once. A node goes to the level after
+        the last of its neighbors, the pending counter of a node is the number of neighbors
+        still not assigned to a level
+        """
+        pending = {}
+        inverse = {}
+        for node in self.nodes:
+            neighbors = node.neighbors() if direct else node.inverse_neighbors()
+            neighbors = [n for n in neighbors if n in self.nodes]
+            pending[node] = len(neighbors)
+            for neighbor in neighbors:
+                inverse.setdefault(neighbor, []).append(node)
+
+        current_level = sorted(node for node, count in pending.items() if count == 0)
         result = [current_level]
-        opened = self.nodes.copy()
-        while opened:
-            current = opened.copy()
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-                    current.discard(o)
-            current_level.sort()
-            # now initialize new level
-            opened = current
-            if opened:
-                current_level = []
-                result.append(current_level)
-
+        assigned = len(current_level)
+        while current_level:
+            next_level = []
+            for node in current_level:
+                for user in inverse.get(node, []):
+                    pending[user] -= 1
+                    if pending[user] == 0:
+                        next_level.append(user)
+            if not next_level:
+                break
+            next_level.sort()
+            result.append(next_level)
+            assigned += len(next_level)
+            current_level = next_level
+
+        if assigned != len(self.nodes):
+            loop = sorted(str(node.conan_ref) for node, count in pending.items() if count)
+            raise ConanException("Loop detected in the dependency graph: %s" % ", ".join(loop))
         return result
 
     def private_nodes(self, built_private_nodes):
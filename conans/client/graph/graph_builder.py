@@ -26,6 +26,9 @@ class DepsGraphBuilder(object):
         returns a dict of conan_reference: 1 if there is an update,
         0 if don't and -1 if local is newer
         """
+        references = [node.conan_ref for node in deps_graph.nodes if node.conan_ref]
+        if references:
+            self._retriever.prefetch_info(references=references)
         return {node.conan_ref: self._retriever.update_available(node.conan_ref)
                 for node in deps_graph.nodes}
 
@@ -2,20 +2,26 @@ from conans.model.ref import ConanFileReference
 from conans.errors import ConanException
 
 
-def satisfying(list_versions, versionexpr, output):
+def satisfying(list_versions, versionexpr, output, semvers=None):
     """ returns the maximum version that satisfies the expression
     if some version cannot be converted to loose SemVer, it is discarded with a msg
     This provides some woraround for failing comparisons like "2.1" not matching "<=2.1"
+    semvers: optional {version: SemVer} dict of already parsed versions, updated with the new ones
     """
     from semver import SemVer, max_satisfying
     version_range = versionexpr.replace(",", " ")
+    semvers = semvers if semvers is not None else {}
     candidates = {}
     for v in list_versions:
-        try:
-            ver = SemVer(v, loose=True)
+        if v not in semvers:
+            try:
+                semvers[v] = SemVer(v, loose=True)
+            except (ValueError, AttributeError):
+                semvers[v] = None
+                output.warn("Version '%s' is not semver, cannot be compared with a range" % str(v))
+        ver = semvers[v]
+        if ver is not None:
             candidates[ver] = v
-        except (ValueError, AttributeError):
-            output.warn("Version '%s' is not semver, cannot be compared with a range" % str(v))
     result = max_satisfying(candidates, version_range, loose=True)
     return candidates.get(result)
 
@@ -26,6 +32,10 @@ class RequireResolver(object):
         self._output = output
         self._local_search = local_search
         self._remote_search = remote_search
+        # The same ranges are usually required many times in the same graph
+        self._remote_found = {}  # search pattern: remote search result
+        self._semvers = {}  # version: parsed SemVer, None if not semver
+        self._resolved = {}  # (version range, candidate versions): satisfying version
 
     def resolve(self, require, base_conanref, update):
         version_range = require.version_range
@@ -76,12 +86,17 @@ class RequireResolver(object):
                     return resolved_version
 
     def _resolve_remote(self, search_ref, version_range):
-        # We should use ignorecase=False, we want the exact case!
-        remote_found = self._remote_search.search_remotes(search_ref, ignorecase=False)
+        if search_ref not in self._remote_found:
+            # We should use ignorecase=False, we want the exact case!
+            self._remote_found[search_ref] = self._remote_search.search_remotes(search_ref,
+                                                                                ignorecase=False)
+        remote_found = self._remote_found[search_ref]
         if remote_found:
             return self._resolve_version(version_range, remote_found)
 
     def _resolve_version(self, version_range, refs_found):
         versions = {ref.version: ref for ref in refs_found}
-        result = satisfying(versions, version_range, self._output)
-        return versions.get(result)
+        key = version_range, frozenset(versions)
+        if key not in self._resolved:
+            self._resolved[key] = satisfying(versions, version_range, self._output, self._semvers)
+        return versions.get(self._resolved[key])
@@ -2,6 +2,7 @@ import os
 import time
 import shutil
 import platform
+from multiprocessing.pool import ThreadPool
 
 from conans.client import tools
 from conans.client.recorder.action_recorder import INSTALL_ERROR_MISSING_BUILD_FOLDER, INSTALL_ERROR_BUILDING
@@ -18,7 +19,7 @@ from conans.errors import (ConanException, conanfile_exception_formatter,
 from conans.client.packager import create_package
 from conans.client.generators import write_generators, TXTGenerator
 from conans.model.build_info import CppInfo
-from conans.client.output import ScopedOutput
+from conans.client.output import ScopedOutput, ThreadBufferedStream
 from conans.client.source import config_source, complete_recipe_sources
 from conans.util.env_reader import get_env
 from conans.client.importer import remove_imports
@@ -133,6 +134,7 @@ class _ConanPackageBuilder(object):
             install_folder = self.build_folder  # While installing, the infos goes to build folder
             create_package(self._conan_file, source_folder, self.build_folder, self.package_folder,
                            install_folder, self._out)
+        self._client_cache.deduplicate_package(self.package_folder)
 
         if get_env("CONAN_READ_ONLY_CACHE", False):
             make_read_only(self.package_folder)
@@ -226,6 +228,8 @@ class ConanInstaller(object):
         self._build_mode = build_mode
         self._built_packages = set()  # To avoid re-building twice the same package reference
         self._recorder = recorder
+        # Number of binary packages that can be retrieved from remotes concurrently
+        self._jobs = max(get_env("CONAN_INSTALL_JOBS", 1), 1)
 
     def install(self, deps_graph, profile_build_requires, keep_build=False, update=False):
         """ given a DepsGraph object, build necessary nodes or retrieve them
@@ -304,25 +308,42 @@ class ConanInstaller(object):
             level = sorted(level, key=lambda x: x.conan_ref)
             flat.extend(n for n in level if n not in skip_nodes)
 
-        for node, package_id, build_needed in nodes_to_process:
-            conan_ref, conan_file = node.conan_ref, node.conanfile
-            output = ScopedOutput(str(conan_ref), self._out)
-            package_ref = PackageReference(conan_ref, package_id)
-            package_folder = self._client_cache.package(package_ref,
-                                                        conan_file.short_paths)
-
-            with self._client_cache.package_lock(package_ref):
-                set_dirty(package_folder)
-                if build_needed and (conan_ref, package_id) not in self._built_packages:
-                    self._build_package(node, package_id, package_ref, output,
-                                        keep_build, profile_build_requires, flat, deps_graph, update)
-                else:
-                    self._get_existing_package(conan_file, package_ref, output, package_folder, update)
-                    self._propagate_info(node, flat, deps_graph)
-
-                # Call the info method
-                self._call_package_info(conan_file, package_folder)
-                clean_dirty(package_folder)
+        pool, downloads = self._download_packages(nodes_to_process, update)
+        try:
+            for node, package_id, build_needed in nodes_to_process:
+                conan_ref, conan_file = node.conan_ref, node.conanfile
+                output = ScopedOutput(str(conan_ref), self._out)
+                package_ref = PackageReference(conan_ref, package_id)
+                package_folder = self._client_cache.package(package_ref,
+                                                            conan_file.short_paths)
+
+                download = downloads.pop(package_ref, None)
+                if download is not None:
+                    # Wait for it out of the lock, the download task is holding it
+                    installed = self._report_download(download)
+
+                with self._client_cache.package_lock(package_ref):
+                    set_dirty(package_folder)
+                    if build_needed and (conan_ref, package_id) not in self._built_packages:
+                        self._build_package(node, package_id, package_ref, output, keep_build,
+                                            profile_build_requires, flat, deps_graph, update)
+                    else:
+                        if download is None:
+                            installed = get_package(conan_file, package_ref, package_folder,
+                                                    output, self._recorder, self._remote_proxy,
+                                                    update=update)
+                        self._handle_existing_package(conan_file, package_ref, output, installed)
+                        self._propagate_info(node, flat, deps_graph)
+
+                    # Call the info method
+                    self._call_package_info(conan_file, package_folder)
+                    clean_dirty(package_folder)
+        finally:
+            if pool:
+                # Do not leave transfers running in background, just wait for them
+                pool.close()
+                pool.join()
+                self._out._stream = self._stream.stream
 
         # Finally, propagate information to root node (conan_ref=None)
         self._propagate_info(root_node, flat, deps_graph)
@@ -382,9 +403,69 @@ class ConanInstaller(object):
                 self._log_built_package(builder.build_folder, package_ref, time.time() - t1)
                 self._built_packages.add((conan_ref, package_id))
 
-    def _get_existing_package(self, conan_file, package_reference, output, package_folder, update):
-        installed = get_package(conan_file, package_reference, package_folder, output,
-                                self._recorder, self._remote_proxy, update=update)
+    def _download_packages(self, nodes_to_process, update):
+        """ Launches the retrieval of the binaries that are not going to be built with a pool of
+        CONAN_INSTALL_JOBS threads. Tasks are submitted in levels order, so the sequential
+        install loop, that keeps calling package_info() in order, can consume them while the
+        ones of the upper levels are still being downloaded and unzipped.
+        return: (pool, {package_reference: AsyncResult of _buffered_download()})
+        """
+        if self._jobs <= 1:
+            return None, {}
+
+        to_download = []
+        processed = set()
+        for node, package_id, build_needed in nodes_to_process:
+            package_ref = PackageReference(node.conan_ref, package_id)
+            # Only the first node of a package reference decides if it has to be built
+            if package_ref in processed:
+                continue
+            processed.add(package_ref)
+            if not build_needed:
+                to_download.append((node, package_ref))
+
+        if not to_download:
+            return None, {}
+
+        pool = ThreadPool(min(self._jobs, len(to_download)))
+        # So every download output is printed at once, not mixed with the concurrent ones
+        self._stream = ThreadBufferedStream(self._out._stream)
+        self._out._stream = self._stream
+        downloads = {package_ref: pool.apply_async(self._buffered_download,
+                                                   (node, package_ref, update))
+                     for node, package_ref in to_download}
+        return pool, downloads
+
+    def _buffered_download(self, node, package_ref, update):
+        with self._stream.buffered() as buffer:
+            try:
+                return self._download_package(node, package_ref, update), buffer.getvalue(), None
+            except Exception as exc:
+                return None, buffer.getvalue(), exc
+
+    def _report_download(self, download):
+        """ Prints the output of a download task, when the install loop gets to it, so it is
+        in the same order as the sequential one. Returns the download result
+        """
+        installed, text, exc = download.get()
+        for line in text.splitlines():
+            line = line.split("\r")[-1].rstrip()  # Only the final state of rewritten lines
+            if line:  # Already scoped, as written by the task
+                self._stream.write(line + "\n")
+        if exc:
+            raise exc
+        return installed
+
+    def _download_package(self, node, package_ref, update):
+        conan_file = node.conanfile
+        output = ScopedOutput(str(node.conan_ref), self._out)
+        package_folder = self._client_cache.package(package_ref, conan_file.short_paths)
+        with self._client_cache.package_lock(package_ref):
+            set_dirty(package_folder)
+            return get_package(conan_file, package_ref, package_folder, output, self._recorder,
+                               self._remote_proxy, update=update)
+
+    def _handle_existing_package(self, conan_file, package_reference, output, installed):
         self._remote_proxy.handle_package_manifest(package_reference)
         if installed:
             _handle_system_requirements(conan_file, package_reference,
@@ -442,7 +523,7 @@ class ConanInstaller(object):
         defining what to do with each node
         """
 
-        nodes_to_build = []
+        nodes = []
         # Now build each level, starting from the most independent one
         package_references = set()
         for level in nodes_by_level:
@@ -450,7 +531,6 @@ class ConanInstaller(object):
                 if node in skip_nodes:
                     continue
                 conan_ref, conan_file = node.conan_ref, node.conanfile
-                build_node = False
                 logger.debug("Processing node %s", repr(conan_ref))
                 package_id = conan_file.info.package_id()
                 package_reference = PackageReference(conan_ref, package_id)
@@ -459,21 +539,37 @@ class ConanInstaller(object):
                     package_references.add(package_reference)
                     package_folder = self._client_cache.package(package_reference,
                                                                 short_paths=conan_file.short_paths)
+                    build_forced = self._build_mode.forced(conan_file, conan_ref)
+                    nodes.append((node, package_id, package_reference, package_folder,
+                                  build_forced))
+                else:
+                    nodes.append((node, package_id, None, None, False))
 
-                    with self._client_cache.package_lock(package_reference):
-                        if is_dirty(package_folder):
-                            output = ScopedOutput(str(conan_ref), self._out)
-                            output.warn("Package is corrupted, removing folder: %s" % package_folder)
-                            rmdir(package_folder)
-                    check_outdated = self._build_mode.outdated
-                    if self._build_mode.forced(conan_file, conan_ref):
-                        build_node = True
-                    else:
-                        available = self._remote_proxy.package_available(package_reference, package_folder,
-                                                                         check_outdated)
-                        build_node = not available
+        # The remote info of all the binaries not in the local cache, in a single request
+        missing = [package_reference for _, _, package_reference, package_folder, build_forced
+                   in nodes if package_reference and not build_forced and
+                   not os.path.exists(package_folder)]
+        if missing:
+            self._remote_proxy.prefetch_info(package_references=missing)
+
+        nodes_to_build = []
+        for node, package_id, package_reference, package_folder, build_forced in nodes:
+            build_node = False
+            if package_reference:
+                with self._client_cache.package_lock(package_reference):
+                    if is_dirty(package_folder):
+                        output = ScopedOutput(str(node.conan_ref), self._out)
+                        output.warn("Package is corrupted, removing folder: %s" % package_folder)
+                        rmdir(package_folder)
+                check_outdated = self._build_mode.outdated
+                if build_forced:
+                    build_node = True
+                else:
+                    available = self._remote_proxy.package_available(package_reference, package_folder,
+                                                                     check_outdated)
+                    build_node = not available
 
-                nodes_to_build.append((node, package_id, build_node))
+            nodes_to_build.append((node, package_id, build_node))
 
         # A check to be sure that if introduced a pattern, something is going to be built
         if self._build_mode.patterns:
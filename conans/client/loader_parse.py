@@ -1,7 +1,10 @@
+import hashlib
 import imp
 import inspect
+import marshal
 import os
 import sys
+import types
 import uuid
 
 from conans.errors import ConanException, NotFoundException
@@ -10,6 +13,13 @@ from conans.util.config_parser import ConfigParser
 from conans.tools import chdir
 from conans.client.generators import registered_generators
 from conans.model import Generator
+from conans.util.env_reader import get_env
+from conans.util.files import save
+from conans.util.log import logger
+
+
+# (conanfile path, contents md5): compiled code of the recipe module
+_recipe_code_cache = {}
 
 
 def load_conanfile_class(conanfile_path):
@@ -62,7 +72,7 @@ def _parse_file(conan_file_path):
         old_modules = list(sys.modules.keys())
         with chdir(current_dir):
             sys.dont_write_bytecode = True
-            loaded = imp.load_source(filename, conan_file_path)
+            loaded = _load_module(filename, conan_file_path)
             sys.dont_write_bytecode = False
         # Put all imported files under a new package name
         module_id = uuid.uuid1()
@@ -89,6 +99,57 @@ def _parse_file(conan_file_path):
     return loaded, filename
 
 
+def _load_module(module_name, conan_file_path):
+    """ Same as imp.load_source(), but reusing the compiled code of the recipe. The module is
+    always executed again, the callers modify the returned classes, they cannot be shared
+    """
+    code = _recipe_code(conan_file_path)
+    module = types.ModuleType(module_name)
+    module.__file__ = conan_file_path
+    sys.modules[module_name] = module
+    try:
+        exec(code, module.__dict__)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _recipe_code(conan_file_path):
+    """ The compiled code of a recipe is cached in memory by path and contents. If
+    CONAN_RECIPE_BYTECODE_CACHE is defined, it is also stored in that folder, not next to the
+    recipe (a __pycache__ would be part of the exported files)
+    """
+    with open(conan_file_path, "rb") as handle:
+        source = handle.read()
+    source_md5 = hashlib.md5(source).hexdigest()
+    key = conan_file_path, source_md5
+    code = _recipe_code_cache.get(key)
+    if code is not None:
+        return code
+
+    bytecode_folder = get_env("CONAN_RECIPE_BYTECODE_CACHE", None)
+    bytecode_path = None
+    if bytecode_folder:
+        # The magic number changes with the python version, so does the bytecode
+        name = hashlib.md5(imp.get_magic() + conan_file_path.encode("utf-8") + source).hexdigest()
+        bytecode_path = os.path.join(bytecode_folder, name)
+        try:
+            with open(bytecode_path, "rb") as handle:
+                code = marshal.load(handle)
+        except (IOError, OSError):
+            pass
+        except Exception as e:  # Corrupted, it will be compiled again
+            logger.debug("Invalid recipe bytecode %s: %s" % (bytecode_path, str(e)))
+
+    if code is None:
+        code = compile(source, conan_file_path, "exec", dont_inherit=True)
+        if bytecode_path:
+            save(bytecode_path, marshal.dumps(code))
+    _recipe_code_cache[key] = code
+    return code
+
+
 class ConanFileTextLoader(object):
     """Parse a conanfile.txt file"""
 
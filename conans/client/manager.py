@@ -204,6 +204,7 @@ class ConanManager(object):
         else:
             packager.create_package(conanfile, source_folder, build_folder, dest_package_folder,
                                     install_folder, package_output, local=True)
+        self._client_cache.deduplicate_package(dest_package_folder)
 
     def download(self, reference, package_ids, remote_name, recipe):
         """ Download conanfile and specified packages to local repository
@@ -1,5 +1,9 @@
+import threading
+from contextlib import contextmanager
+
 from colorama import Fore, Style
 import six
+from six import StringIO
 from conans.util.files import decode_text
 from conans.util.env_reader import get_env
 
@@ -104,9 +108,56 @@ class ConanOutput(object):
 class ScopedOutput(ConanOutput):
     def __init__(self, scope, output):
         self.scope = scope
-        self._stream = output._stream
+        self._output = output
         self._color = output._color
 
+    @property
+    def _stream(self):
+        # The one of the wrapped output, so replacing it (ThreadBufferedStream) applies to both
+        return self._output._stream
+
+    @_stream.setter
+    def _stream(self, stream):
+        self._output._stream = stream
+
     def write(self, data, front=None, back=None, newline=False):
         super(ScopedOutput, self).write("%s: " % self.scope, front, back, False)
         super(ScopedOutput, self).write("%s" % data, Color.BRIGHT_WHITE, back, newline)
+
+
+class ThreadBufferedStream(object):
+    """ Wraps an output stream, so what is written from the threads that are inside a
+    buffered() block is kept apart, and it can be printed at once, without being mixed with
+    the output of other concurrent tasks
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    @property
+    def _buffer(self):
+        return getattr(self._local, "buffer", None)
+
+    @contextmanager
+    def buffered(self):
+        """ Yields the StringIO where this thread output is written """
+        self._local.buffer = StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, data):
+        buffer = self._buffer
+        if buffer is not None:
+            buffer.write(data)
+        else:
+            self.stream.write(data)
+
+    def flush(self):
+        if self._buffer is None:
+            self.stream.flush()
+
+    def isatty(self):
+        # No progress bars for the buffered output
+        return self._buffer is None and hasattr(self.stream, "isatty") and self.stream.isatty()
@@ -1,4 +1,7 @@
 import os
+import threading
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import RequestException
 
@@ -8,10 +11,13 @@ from conans.client.remover import DiskRemover
 from conans.client.recorder.action_recorder import INSTALL_ERROR_MISSING, INSTALL_ERROR_NETWORK
 from conans.errors import (ConanException, NotFoundException, NoRemoteAvailable)
 from conans.model.ref import PackageReference
+from conans.util.env_reader import get_env
 from conans.util.log import logger
 from conans.util.tracer import log_recipe_got_from_local_cache
 from conans.client.source import complete_recipe_sources
 from conans.model.info import ConanInfo
+from conans.model.manifest import FileTreeManifest
+from conans.paths import CONAN_MANIFEST, CONANINFO
 
 
 class ConanProxy(object):
@@ -30,6 +36,8 @@ class ConanProxy(object):
         self._recorder = recorder
         # inputs
         self._remote_name = remote_name
+        # {(remote_name, reference, filename): contents} got by prefetch_info, used once
+        self._prefetched_files = {}
 
     @property
     def registry(self):
@@ -68,6 +76,47 @@ class ConanProxy(object):
 
         return True
 
+    def prefetch_info(self, references=None, package_references=None):
+        """ Retrieves at once, from every remote that supports it, the manifests of the recipes
+        and the conaninfo and manifests of the packages that are going to be checked
+        (update_available, package_available...), instead of a couple of requests for each one
+        """
+        batches = OrderedDict()  # {remote: ([references], [package_references])}
+        try:
+            for reference in references or []:
+                remote, _ = self._get_remote(reference)
+                batches.setdefault(remote, ([], []))[0].append(reference)
+            for package_reference in package_references or []:
+                remote, _ = self._get_remote(package_reference.conan)
+                batches.setdefault(remote, ([], []))[1].append(package_reference)
+        except NoRemoteAvailable:
+            return
+
+        for remote, (remote_references, remote_package_references) in batches.items():
+            try:
+                result = self._remote_manager.get_batch_info(remote_references,
+                                                             remote_package_references, remote)
+            except (ConanException, RequestException) as exc:
+                # Not critical, every reference will be requested and will fail later if needed
+                logger.debug("Cannot get batch info from remote %s: %s" % (remote.name, exc))
+                continue
+            if result is None:  # Not supported by the remote
+                continue
+            recipes, packages = result
+            for batch_files, filenames in ((recipes, [CONAN_MANIFEST]),
+                                           (packages, [CONANINFO, CONAN_MANIFEST])):
+                for reference, files in batch_files.items():
+                    for filename in filenames:
+                        contents = files.get(filename) if files else None
+                        self._prefetched_files[(remote.name, reference, filename)] = contents
+
+    def _prefetched(self, remote, reference, filename):
+        """ The contents of a file got by prefetch_info, None if it is not in the remote.
+        Raises KeyError if it was not prefetched. Every prefetched file is used just once, so
+        the next requests get fresh contents
+        """
+        return self._prefetched_files.pop((remote.name, reference, filename))
+
     def handle_package_manifest(self, package_ref):
         if self._manifest_manager:
             remote = self._registry.get_ref(package_ref.conan)
@@ -140,7 +189,15 @@ class ConanProxy(object):
         if read_manifest:
             try:  # get_conan_manifest can fail, not in server
                 remote, _ = self._get_remote(conan_reference)
-                upstream_manifest = self._remote_manager.get_conan_manifest(conan_reference, remote)
+                try:
+                    contents = self._prefetched(remote, conan_reference, CONAN_MANIFEST)
+                except KeyError:
+                    upstream_manifest = self._remote_manager.get_conan_manifest(conan_reference,
+                                                                                remote)
+                else:
+                    if contents is None:
+                        raise NotFoundException("No digest found")
+                    upstream_manifest = FileTreeManifest.loads(contents)
                 if upstream_manifest != read_manifest:
                     return 1 if upstream_manifest.time > read_manifest.time else -1
             except (NotFoundException, NoRemoteAvailable):  # 404
@@ -182,6 +239,14 @@ class ConanProxy(object):
 
         output.info("Not found in local cache, looking in remotes...")
         remotes = self._registry.remotes
+        if not remotes:
+            raise ConanException("No remote defined")
+        if _parallel_remotes(remotes):
+            # Only the first remote with the recipe manifest, in registry order, is tried
+            remote = next((remote for remote, found in _query_remotes(remotes, self._has_recipe,
+                                                                      conan_reference)
+                           if found), None)
+            remotes = [remote] if remote else []
         for remote in remotes:
             logger.debug("Trying with remote %s" % remote.name)
             try:
@@ -189,14 +254,19 @@ class ConanProxy(object):
                 return
             # If not found continue with the next, else raise
             except NotFoundException as exc:
-                if remote == remotes[-1]:  # Last element not found
-                    msg = "Unable to find '%s' in remotes" % str(conan_reference)
-                    logger.debug("Not found in any remote, raising...%s" % exc)
-                    self._recorder.recipe_install_error(conan_reference, INSTALL_ERROR_MISSING,
-                                                        msg, None)
-                    raise NotFoundException(msg)
+                logger.debug("Not found in remote %s: %s" % (remote.name, exc))
+
+        msg = "Unable to find '%s' in remotes" % str(conan_reference)
+        logger.debug("Not found in any remote, raising...")
+        self._recorder.recipe_install_error(conan_reference, INSTALL_ERROR_MISSING, msg, None)
+        raise NotFoundException(msg)
 
-        raise ConanException("No remote defined")
+    def _has_recipe(self, remote, conan_reference):
+        try:
+            self._remote_manager.get_conan_manifest(conan_reference, remote)
+            return True
+        except NotFoundException:
+            return False
 
     def _get_remote(self, conan_ref=None):
         # Prioritize -r , then reference registry and then the default remote
@@ -211,7 +281,14 @@ class ConanProxy(object):
         """ used by update to check the date of packages, require force if older
         """
         remote, ref_remote = self._get_remote(package_ref.conan)
-        result = self._remote_manager.get_package_manifest(package_ref, remote)
+        try:
+            contents = self._prefetched(remote, package_ref, CONAN_MANIFEST)
+        except KeyError:
+            result = self._remote_manager.get_package_manifest(package_ref, remote)
+        else:
+            if contents is None:
+                raise NotFoundException("No digest found")
+            result = FileTreeManifest.loads(contents)
         if not ref_remote:
             self._registry.set_ref(package_ref.conan, remote)
         return result
@@ -220,7 +297,15 @@ class ConanProxy(object):
         """ Gets the package info to check if outdated
         """
         remote, ref_remote = self._get_remote(package_ref.conan)
-        result = self._remote_manager.get_package_info(package_ref, remote)
+        try:
+            contents = self._prefetched(remote, package_ref, CONANINFO)
+        except KeyError:
+            result = self._remote_manager.get_package_info(package_ref, remote)
+        else:
+            if contents is None:
+                raise NotFoundException("Package %s doesn't have the %s file!" % (package_ref,
+                                                                                  CONANINFO))
+            result = ConanInfo.loads(contents)
         if not ref_remote:
             self._registry.set_ref(package_ref.conan, remote)
         return result
@@ -231,8 +316,15 @@ class ConanProxy(object):
             search_result = self._remote_manager.search_recipes(remote, pattern, ignorecase)
             return search_result
 
-        for remote in self._registry.remotes:
-            search_result = self._remote_manager.search_recipes(remote, pattern, ignorecase)
+        remotes = self._registry.remotes
+        if _parallel_remotes(remotes):
+            search_results = _query_remotes(remotes, self._remote_manager.search_recipes,
+                                            pattern, ignorecase)
+        else:
+            search_results = ((remote, self._remote_manager.search_recipes(remote, pattern,
+                                                                           ignorecase))
+                              for remote in remotes)
+        for _, search_result in search_results:
             if search_result:
                 return search_result
 
@@ -253,3 +345,46 @@ class ConanProxy(object):
             package_folder = self._client_cache.package(package_ref, short_paths=short_paths)
             self._out.info("Downloading %s" % str(package_ref))
             self._remote_manager.get_package(conanfile, package_ref, package_folder, remote, output, self._recorder)
+
+
+def _parallel_remotes(remotes):
+    return len(remotes) > 1 and get_env("CONAN_PARALLEL_REMOTES", False)
+
+
+_remotes_pool = None  # (size, ThreadPool)
+_remotes_pool_lock = threading.Lock()
+
+
+def _get_remotes_pool(size):
+    """ The pool of the remote queries, shared by all the lookups, so the queries to slow remotes
+    that were not waited for don't accumulate threads
+    """
+    global _remotes_pool
+    with _remotes_pool_lock:
+        if _remotes_pool is None or _remotes_pool[0] < size:
+            if _remotes_pool is not None:
+                _remotes_pool[1].close()  # Its threads finish the running queries and exit
+            _remotes_pool = size, ThreadPool(size)
+        return _remotes_pool[1]
+
+
+def _query_remotes(remotes, query, *args):
+    """ Calls query(remote, *args) for all the remotes at once, and yields (remote, result) in
+    the remotes order, raising the errors in that order too. The pending queries are not waited
+    for once the caller stops iterating, i.e. when the first remote in order has the recipe, and
+    the ones not started yet are skipped
+    """
+    stopped = threading.Event()
+
+    def run_query(remote):
+        if stopped.is_set():
+            return None
+        return query(remote, *args)
+
+    pool = _get_remotes_pool(len(remotes))
+    results = [pool.apply_async(run_query, (remote, )) for remote in remotes]
+    try:
+        for remote, result in zip(remotes, results):
+            yield remote, result.get()
+    finally:
+        stopped.set()
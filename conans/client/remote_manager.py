@@ -6,11 +6,13 @@ import traceback
 
 from requests.exceptions import ConnectionError
 
+from conans import XZ_ARCHIVES_CAPABILITY
 from conans.errors import ConanException, ConanConnectionError, NotFoundException
-from conans.model.manifest import gather_files
+from conans.model.manifest import gather_files, FileTreeManifest
 from conans.paths import PACKAGE_TGZ_NAME, CONANINFO, CONAN_MANIFEST, CONANFILE, EXPORT_TGZ_NAME, \
     rm_conandir, EXPORT_SOURCES_TGZ_NAME, EXPORT_SOURCES_DIR_OLD
-from conans.util.files import gzopen_without_timestamps, is_dirty
+from conans.util.env_reader import get_env
+from conans.util.files import taropen_for_write, is_dirty
 from conans.util.files import tar_extract, rmdir, exception_message_safe, mkdir
 from conans.util.files import touch_folder
 from conans.util.log import logger
@@ -112,7 +114,9 @@ class RemoteManager(object):
             logger.debug("====> Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        the_files = compress_package_files(files, symlinks, package_folder, self._output)
+        compression_format = self._compression_format(remote)
+        the_files = compress_package_files(files, symlinks, package_folder, self._output,
+                                           compression_format)
         if skip_upload:
             return None
 
@@ -127,6 +131,31 @@ class RemoteManager(object):
 
         return tmp
 
+    def _compression_format(self, remote):
+        """ The package tgz is gzip compressed, unless xz is requested (compression_format in
+        conan.conf) and the remote declares that its clients can handle xz archives, an opt-in
+        of its administrator (xz_archives in server.conf)
+        """
+        compression_format = get_env("CONAN_COMPRESSION_FORMAT", "gzip")
+        if compression_format == "gzip":
+            return None
+        if compression_format != "xz":
+            raise ConanException("Invalid compression format '%s', use 'gzip' or 'xz'"
+                                 % compression_format)
+        try:
+            import lzma  # @UnusedImport
+        except ImportError:
+            self._output.warn("xz compression not available in this python, using gzip")
+            return None
+        try:
+            _, _, capabilities = self._call_remote(remote, "server_info")
+        except NotFoundException:
+            capabilities = []
+        if XZ_ARCHIVES_CAPABILITY not in capabilities:
+            self._output.warn("Remote '%s' doesn't support xz archives, using gzip" % remote.name)
+            return None
+        return compression_format
+
     def get_conan_manifest(self, conan_reference, remote):
         """
         Read ConanDigest from remotes
@@ -151,6 +180,15 @@ class RemoteManager(object):
         returns (ConanInfo, remote_name)"""
         return self._call_remote(remote, "get_package_info", package_reference)
 
+    def get_batch_info(self, references, package_references, remote):
+        """
+        Read at once the manifests of many recipes and the conaninfo and manifests of many
+        packages
+
+        returns ({reference: {filename: contents}}, {package_reference: {filename: contents}}),
+        or None if the remote doesn't support it"""
+        return self._call_remote(remote, "get_batch_info", references, package_references)
+
     def get_recipe(self, conan_reference, remote):
         """
         Read the conans from remotes
@@ -179,6 +217,14 @@ class RemoteManager(object):
         log_recipe_download(conan_reference, duration, remote, zipped_files)
 
         unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME)
+        if zipped_files.resumed:
+            read_manifest = FileTreeManifest.load(dest_folder)
+            # The export sources are downloaded and checked later
+            read_manifest.file_sums = {name: file_md5
+                                       for name, file_md5 in read_manifest.file_sums.items()
+                                       if not name.startswith("export_source/")}
+            self._check_resumed(read_manifest, FileTreeManifest.create(dest_folder), dest_folder,
+                                "recipe '%s'" % str(conan_reference))
         # Make sure that the source dir is deleted
         rm_conandir(self._client_cache.source(conan_reference))
         touch_folder(dest_folder)
@@ -213,6 +259,11 @@ class RemoteManager(object):
         if os.path.exists(c_src_path):
             merge_directories(c_src_path, export_sources_folder)
             rmdir(c_src_path)
+        if zipped_files.resumed:
+            self._check_resumed(FileTreeManifest.load(export_folder),
+                                FileTreeManifest.create(export_folder, export_sources_folder),
+                                export_sources_folder,
+                                "recipe '%s' sources" % str(conan_reference))
         touch_folder(export_sources_folder)
 
     def get_package(self, conanfile, package_reference, dest_folder, remote, output, recorder):
@@ -222,19 +273,49 @@ class RemoteManager(object):
         t1 = time.time()
         try:
             urls = self._call_remote(remote, "get_package_urls", package_reference)
+            # The tgz is extracted while it is downloaded, it is never saved to disk
+            tgz_url = urls.pop(PACKAGE_TGZ_NAME, None)
             zipped_files = self._call_remote(remote, "download_files_to_folder", urls, dest_folder)
+            tgz_stream = None
+            if tgz_url:
+                tgz_stream = self._call_remote(remote, "download_file_stream", PACKAGE_TGZ_NAME,
+                                               tgz_url)
         except NotFoundException as e:
             output.warn('Binary for %s not in remote: %s' % (package_id, str(e)))
             raise_package_not_found_error(conanfile, package_reference.conan,
                                           package_id, output, recorder, remote.url)
         else:
+            checksums = {}
+            if tgz_stream:
+                uncompress_stream(tgz_stream, dest_folder)
+                zipped_files[PACKAGE_TGZ_NAME] = os.path.join(dest_folder, PACKAGE_TGZ_NAME)
+                checksums[PACKAGE_TGZ_NAME] = tgz_stream.checksums
+            if (tgz_stream and tgz_stream.resumed) or zipped_files.resumed:
+                read_manifest, expected_manifest = \
+                    self._client_cache.package_manifests(package_reference)
+                self._check_resumed(read_manifest, expected_manifest, dest_folder,
+                                    "package '%s'" % str(package_reference))
             duration = time.time() - t1
-            log_package_download(package_reference, duration, remote, zipped_files)
-            unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME)
+            log_package_download(package_reference, duration, remote, zipped_files, checksums)
             # Issue #214 https://github.com/conan-io/conan/issues/214
+            # Before deduplicating, the blobs are shared with other packages
             touch_folder(dest_folder)
+            self._client_cache.deduplicate_package(dest_folder)
             output.success('Package installed %s' % package_id)
 
+    @staticmethod
+    def _check_resumed(read_manifest, expected_manifest, dest_folder, description):
+        """ The contents of a resumed download come from several responses, the extracted
+        files are checked against the manifest, dest_folder is removed if they don't match
+        """
+        if read_manifest != expected_manifest:
+            diff = read_manifest.difference(expected_manifest)
+            error_msg = "\n".join("Mismatched checksum '%s' (manifest: %s, file: %s)"
+                                   % (fname, h1, h2) for fname, (h1, h2) in diff.items())
+            rm_conandir(dest_folder)
+            raise ConanException("Corrupted download of %s, try again\n%s"
+                                 % (description, error_msg))
+
     def search_recipes(self, remote, pattern=None, ignorecase=True):
         """
         Search exported conans information from remotes
@@ -300,19 +381,20 @@ def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder
     return result
 
 
-def compress_package_files(files, symlinks, dest_folder, output):
+def compress_package_files(files, symlinks, dest_folder, output, compression_format=None):
     tgz_path = files.get(PACKAGE_TGZ_NAME)
     if not tgz_path:
         output.rewrite_line("Compressing package...")
         tgz_files = {f: path for f, path in files.items() if f not in [CONANINFO, CONAN_MANIFEST]}
-        tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, dest_dir=dest_folder)
+        tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, dest_dir=dest_folder,
+                                  compression_format=compression_format)
 
     return {PACKAGE_TGZ_NAME: tgz_path,
             CONANINFO: files[CONANINFO],
             CONAN_MANIFEST: files[CONAN_MANIFEST]}
 
 
-def compress_files(files, symlinks, name, dest_dir):
+def compress_files(files, symlinks, name, dest_dir, compression_format=None):
     """Compress the package and returns the new dict (name => content) of files,
     only with the conanXX files and the compressed file"""
     t1 = time.time()
@@ -320,7 +402,7 @@ def compress_files(files, symlinks, name, dest_dir):
     tgz_path = os.path.join(dest_dir, name)
     with open(tgz_path, "wb") as tgz_handle:
         # tgz_contents = BytesIO()
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        tgz = taropen_for_write(name, tgz_handle, compression_format)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
@@ -365,15 +447,34 @@ def uncompress_file(src_path, dest_folder):
         with open(src_path, 'rb') as file_handler:
             tar_extract(file_handler, dest_folder)
     except Exception as e:
-        error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(e))
-        # try to remove the files
-        try:
-            if os.path.exists(dest_folder):
-                shutil.rmtree(dest_folder)
-                error_msg += "Folder removed"
-        except Exception as e:
-            error_msg += "Folder not removed, files/package might be damaged, remove manually"
-        raise ConanException(error_msg)
+        raise _uncompress_error(dest_folder, e)
 
     duration = time.time() - t1
     log_uncompressed_file(src_path, duration, dest_folder)
+
+
+def uncompress_stream(stream, dest_folder):
+    """ Extracts a tgz while it is being downloaded, reading the stream just once """
+    t1 = time.time()
+    try:
+        tar_extract(stream, dest_folder, stream=True)
+        # tarfile stops at the end of archive blocks, consume the rest (padding, gzip trailer)
+        # so the download is completed and checked
+        stream.read()
+    except Exception as e:
+        raise _uncompress_error(dest_folder, e)
+
+    duration = time.time() - t1
+    log_uncompressed_file(PACKAGE_TGZ_NAME, duration, dest_folder)
+
+
+def _uncompress_error(dest_folder, exc):
+    error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(exc))
+    # try to remove the files
+    try:
+        if os.path.exists(dest_folder):
+            shutil.rmtree(dest_folder)
+            error_msg += "Folder removed"
+    except Exception:
+        error_msg += "Folder not removed, files/package might be damaged, remove manually"
+    return ConanException(error_msg)
@@ -1,7 +1,10 @@
 import os
+import platform
+import threading
 import fasteners
 
 from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 
 from conans.errors import ConanException, NoRemoteAvailable
 from conans.util.files import load, save
@@ -17,11 +20,33 @@ Remote = namedtuple("Remote", "name url verify_ssl")
 class RemoteRegistry(object):
     """ conan_ref: remote
     remote is (name, url)
+
+    The parsed file is kept in memory while it is not modified (its mtime, size and inode), so
+    the reads don't lock or parse it again, and the file is replaced atomically when written.
+    The references registered with set_ref are kept pending and written at once by flush()
     """
     def __init__(self, filename, output):
         self._filename = filename
         self._output = output
         self._remotes = None
+        self._loaded = None  # (remotes, refs) parsed from the file
+        self._loaded_key = None  # the stat of the file when parsed
+        self._thread_lock = threading.RLock()
+        self._pending_refs = {}  # set_ref() references not written yet
+
+    @contextmanager
+    def _file_lock(self):
+        # The interprocess lock doesn't exclude the threads of the same process
+        with self._thread_lock:
+            with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+                yield
+
+    def _file_key(self):
+        try:
+            stat = os.stat(self._filename)
+        except OSError:
+            return None
+        return getattr(stat, "st_mtime_ns", stat.st_mtime), stat.st_size, stat.st_ino
 
     def _parse(self, contents):
         remotes = OrderedDict()
@@ -61,18 +86,46 @@ class RemoteRegistry(object):
         text = os.linesep.join(lines)
         return text
 
+    def _read(self):
+        """ The parsed (remotes, refs), must not be modified. Locks the file only if it has
+        been modified since it was parsed
+        """
+        if self._loaded_key is None or self._loaded_key != self._file_key():
+            with self._file_lock():
+                self._load()
+        return self._loaded
+
     def _load(self):
-        try:
-            contents = load(self._filename)
-        except:
-            self._output.warn("Remotes registry file missing, creating default one in %s"
-                              % self._filename)
-            contents = default_remotes
-            save(self._filename, contents)
-        return self._parse(contents)
+        """ A copy of the (remotes, refs) to be modified and saved, with the file locked """
+        if self._loaded_key is None or self._loaded_key != self._file_key():
+            try:
+                contents = load(self._filename)
+            except:
+                self._output.warn("Remotes registry file missing, creating default one in %s"
+                                  % self._filename)
+                contents = default_remotes
+                save(self._filename, contents)
+            self._loaded = self._parse(contents)
+            self._loaded_key = self._file_key()
+        remotes, refs = self._loaded
+        return OrderedDict(remotes), dict(refs)
+
+    def _load_pending(self):
+        """ As _load(), with the pending references applied, that are written by _save() """
+        remotes, refs = self._load()
+        refs.update(self._pending_refs)
+        return remotes, refs
 
     def _save(self, remotes, refs):
-        save(self._filename, self._to_string(remotes, refs))
+        # Replaced, not rewritten in place, every version of the file has a different inode
+        tmp_filename = "%s.%s.tmp" % (self._filename, os.getpid())
+        save(tmp_filename, self._to_string(remotes, refs))
+        if platform.system() == "Windows" and os.path.exists(self._filename):
+            os.remove(self._filename)  # rename() doesn't replace files in Windows
+        os.rename(tmp_filename, self._filename)
+        self._loaded = remotes, refs
+        self._loaded_key = self._file_key()
+        self._pending_refs = {}
 
     @property
     def default_remote(self):
@@ -95,31 +148,31 @@ class RemoteRegistry(object):
     @property
     def _remote_dict(self):
         if self._remotes is None:
-            with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-                remotes, _ = self._load()
-                self._remotes = OrderedDict([(ref, Remote(ref, remote, verify_ssl))
+            remotes, _ = self._read()
+            self._remotes = OrderedDict([(ref, Remote(ref, remote, verify_ssl))
                                              for ref, (remote, verify_ssl) in remotes.items()])
         return self._remotes
 
     @property
     def refs(self):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            _, refs = self._load()
-            return refs
+        _, refs = self._read()
+        refs = dict(refs)
+        refs.update(self._pending_refs)
+        return refs
 
     def get_ref(self, conan_reference):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
-            remote_name = refs.get(str(conan_reference))
-            try:
-                return Remote(remote_name, remotes[remote_name][0], remotes[remote_name][1])
-            except:
-                return None
+        remotes, refs = self._read()
+        conan_reference = str(conan_reference)
+        remote_name = self._pending_refs.get(conan_reference, refs.get(conan_reference))
+        try:
+            return Remote(remote_name, remotes[remote_name][0], remotes[remote_name][1])
+        except:
+            return None
 
     def remove_ref(self, conan_reference, quiet=False):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+        with self._file_lock():
             conan_reference = str(conan_reference)
-            remotes, refs = self._load()
+            remotes, refs = self._load_pending()
             try:
                 del refs[conan_reference]
                 self._save(remotes, refs)
@@ -129,16 +182,29 @@ class RemoteRegistry(object):
                                       % conan_reference)
 
     def set_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            refs[conan_reference] = remote.name
-            self._save(remotes, refs)
+        """ Registered in memory, written by the next flush() or other modification of the file.
+        A command retrieving many references writes the file once
+        """
+        conan_reference = str(conan_reference)
+        with self._thread_lock:
+            if self._pending_refs.get(conan_reference,
+                                      self._read()[1].get(conan_reference)) == remote.name:
+                return  # Already registered, don't write the file again
+            self._pending_refs[conan_reference] = remote.name
+
+    def flush(self):
+        """ Writes the pending set_ref() references, if any """
+        with self._thread_lock:
+            if not self._pending_refs:
+                return
+            with self._file_lock():
+                remotes, refs = self._load_pending()
+                self._save(remotes, refs)
 
     def add_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+        with self._file_lock():
             conan_reference = str(conan_reference)
-            remotes, refs = self._load()
+            remotes, refs = self._load_pending()
             if conan_reference in refs:
                 raise ConanException("%s already exists. Use update" % conan_reference)
             if remote not in remotes:
@@ -147,9 +213,9 @@ class RemoteRegistry(object):
             self._save(remotes, refs)
 
     def update_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+        with self._file_lock():
             conan_reference = str(conan_reference)
-            remotes, refs = self._load()
+            remotes, refs = self._load_pending()
             if conan_reference not in refs:
                 raise ConanException("%s does not exist. Use add" % conan_reference)
             if remote not in remotes:
@@ -159,8 +225,8 @@ class RemoteRegistry(object):
 
     def _upsert(self, remote_name, url, verify_ssl, insert):
         self._remotes = None  # invalidate cached remotes
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        with self._file_lock():
+            remotes, refs = self._load_pending()
             # Remove duplicates
             remotes.pop(remote_name, None)
             remotes_list = []
@@ -200,8 +266,8 @@ class RemoteRegistry(object):
 
     def remove(self, remote_name):
         self._remotes = None  # invalidate cached remotes
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        with self._file_lock():
+            remotes, refs = self._load_pending()
             if remote_name not in remotes:
                 raise ConanException("Remote '%s' not found in remotes" % remote_name)
             del remotes[remote_name]
@@ -216,8 +282,8 @@ class RemoteRegistry(object):
 
     def rename(self, remote_name, new_remote_name):
         self._remotes = None  # invalidate cached remotes
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        with self._file_lock():
+            remotes, refs = self._load_pending()
             if remote_name not in remotes:
                 raise ConanException("Remote '%s' not found in remotes" % remote_name)
             new_remotes = OrderedDict()
@@ -232,8 +298,8 @@ class RemoteRegistry(object):
 
     def define_remotes(self, remotes):
         self._remotes = None  # invalidate cached remotes
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            _, refs = self._load()
+        with self._file_lock():
+            _, refs = self._load_pending()
             new_remotes = OrderedDict()
             for remote in remotes:
                 new_remotes[remote.name] = (remote.url, remote.verify_ssl)
@@ -242,8 +308,8 @@ class RemoteRegistry(object):
 
     def _add_update(self, remote_name, url, verify_ssl, exists_function, insert=None):
         self._remotes = None  # invalidate cached remotes
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        with self._file_lock():
+            remotes, refs = self._load_pending()
             exists_function(remotes)
             urls = {r[0]: name for name, r in remotes.items() if name != remote_name}
             if url in urls:
@@ -3,7 +3,7 @@ import os
 from conans.errors import ConanException
 from conans.util.log import logger
 from conans.model.ref import PackageReference
-from conans.paths import SYSTEM_REQS, rm_conandir
+from conans.paths import SYSTEM_REQS, rm_conandir, HASHES_FOLDER, PACKAGES_FOLDER
 from conans.model.ref import ConanFileReference
 from conans.search.search import filter_outdated, DiskSearchManager
 
@@ -66,6 +66,8 @@ class DiskRemover(object):
             for package in self._paths.conan_packages(conan_ref):
                 self._remove(os.path.join(path, package), conan_ref, "package folder:%s" % package)
             self._remove(path, conan_ref, "packages")
+            self._remove(os.path.join(self._paths.conan(conan_ref), HASHES_FOLDER,
+                                      PACKAGES_FOLDER), conan_ref, "packages hashes")
             self._remove_file(self._paths.system_reqs(conan_ref), conan_ref, SYSTEM_REQS)
         else:
             for id_ in ids_filter:  # remove just the specified packages
@@ -73,6 +75,8 @@ class DiskRemover(object):
                 pkg_folder = self._paths.package(package_ref)
                 self._remove(pkg_folder, conan_ref, "package:%s" % id_)
                 self._remove_file(pkg_folder + ".dirty", conan_ref, "dirty flag")
+                self._remove(self._paths.hashes_cache(conan_ref, id_), conan_ref,
+                             "package:%s hashes" % id_)
                 self._remove_file(self._paths.system_reqs_package(package_ref),
                                   conan_ref, "%s/%s" % (id_, SYSTEM_REQS))
 
@@ -169,6 +173,9 @@ class ConanRemover(object):
 
         if not remote:
             self._client_cache.delete_empty_dirs(deleted_refs)
+            blob_store = self._client_cache.blob_store
+            if blob_store and deleted_refs:
+                blob_store.collect_garbage()
 
     def _ask_permission(self, conan_ref, src, build_ids, package_ids_filter, force):
         def stringlist(alist):
@@ -17,6 +17,10 @@ from uuid import getnode as get_mac
 import hashlib
 from conans.util.log import logger
 from conans.client.cmd.user import update_localdb
+import threading
+
+
+_login_lock = threading.Lock()
 
 
 def input_credentials_if_unauthorized(func):
@@ -59,7 +63,8 @@ def input_credentials_if_unauthorized(func):
         we can get a valid token from api_client. If a token is returned,
         credentials are stored in localdb and rest method is called"""
         for _ in range(LOGIN_RETRIES):
-            user, password = self._user_io.request_login(self._remote.name, self.user)
+            with _login_lock:  # The concurrent calls to the remotes ask one at a time
+                user, password = self._user_io.request_login(self._remote.name, self.user)
             try:
                 token = self.authenticate(user, password)
             except AuthenticationException:
@@ -82,21 +87,40 @@ def input_credentials_if_unauthorized(func):
     return wrapper
 
 
+class _AuthState(threading.local):
+    def __init__(self):
+        self.remote = None
+        self.user = None
+
+
 class ConanApiAuthManager(object):
 
     def __init__(self, rest_client, user_io, localdb):
         self._user_io = user_io
         self._rest_client = rest_client
         self._localdb = localdb
-        self._remote = None
+        # The remote and its user are per thread, as the rest client state
+        self._state = _AuthState()
+
+    @property
+    def _remote(self):
+        return self._state.remote
+
+    @property
+    def user(self):
+        return self._state.user
+
+    @user.setter
+    def user(self, user):
+        self._state.user = user
 
     @property
     def remote(self):
-        return self._remote
+        return self._state.remote
 
     @remote.setter
     def remote(self, remote):
-        self._remote = remote
+        self._state.remote = remote
         self._rest_client.remote_url = remote.url
         self._rest_client.verify_ssl = remote.verify_ssl
         self.user, self._rest_client.token = self._localdb.get_login(remote.url)
@@ -143,6 +167,10 @@ class ConanApiAuthManager(object):
     def get_package_manifest(self, package_reference):
         return self._rest_client.get_package_manifest(package_reference)
 
+    @input_credentials_if_unauthorized
+    def get_batch_info(self, references, package_references):
+        return self._rest_client.get_batch_info(references, package_references)
+
     @input_credentials_if_unauthorized
     def get_recipe_urls(self, conan_reference):
         return self._rest_client.get_recipe_urls(conan_reference)
@@ -155,6 +183,13 @@ class ConanApiAuthManager(object):
     def download_files_to_folder(self, urls, dest_folder):
         return self._rest_client.download_files_to_folder(urls, dest_folder)
 
+    @input_credentials_if_unauthorized
+    def download_file_stream(self, filename, url):
+        return self._rest_client.download_file_stream(filename, url)
+
+    def server_info(self):
+        return self._rest_client.server_info()
+
     @input_credentials_if_unauthorized
     def get_package_info(self, package_reference):
         return self._rest_client.get_package_info(package_reference)
@@ -1,9 +1,25 @@
 import fnmatch
 import os
 
+import requests
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+
+from conans.util.env_reader import get_env
 from conans.util.files import save
 
 
+def get_http_pool_size():
+    """ Maximum number of connections kept alive for each remote host. By default it is enough
+    for the concurrent transfers of parallel installs, so no connection is discarded and
+    handshaked again
+    """
+    pool_size = get_env("CONAN_HTTP_POOL_SIZE", 0)
+    if not pool_size:
+        concurrent = get_env("CONAN_INSTALL_JOBS", 1) * get_env("CONAN_PARALLEL_TRANSFERS", 1)
+        pool_size = max(DEFAULT_POOLSIZE, concurrent)
+    return pool_size
+
+
 class ConanRequester(object):
 
     def __init__(self, requester, client_cache, timeout):
@@ -20,6 +36,12 @@ class ConanRequester(object):
 
         self._requester = requester
         self._client_cache = client_cache
+        if isinstance(requester, requests.Session):
+            # The same session, and then its keep-alive connections, is shared by all the
+            # remote calls (rest api, authentication) and the tools.download() of recipes
+            adapter = HTTPAdapter(pool_maxsize=get_http_pool_size())
+            requester.mount("http://", adapter)
+            requester.mount("https://", adapter)
 
         if not os.path.exists(self._client_cache.cacert_path):
             from conans.client.rest.cacert import cacert
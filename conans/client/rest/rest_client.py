@@ -9,13 +9,19 @@ from conans.client.rest.differ import diff_snapshots
 from conans.util.files import decode_text, md5sum
 import os
 from conans.model.manifest import FileTreeManifest
-from conans.client.rest.uploader_downloader import Uploader, Downloader
-from conans.model.ref import ConanFileReference
+from conans.client.rest.uploader_downloader import Uploader, Downloader, run_transfers, \
+    DownloadedFiles
+from conans.model.ref import ConanFileReference, PackageReference
 from six.moves.urllib.parse import urlsplit, parse_qs, urlencode, urlparse, urljoin
-from conans import COMPLEX_SEARCH_CAPABILITY
+from conans import COMPLEX_SEARCH_CAPABILITY, BATCH_INFO_CAPABILITY, \
+    CHECKSUM_DEPLOY_CAPABILITY
 from conans.search.search import filter_packages
 from conans.model.info import ConanInfo
 from conans.util.tracer import log_client_rest_api_call
+import threading
+
+# Only the files from this size are deduplicated (X-Checksum-Deploy) in the conan_server uploads
+CHECKSUM_DEPLOY_MIN_SIZE = 1024 * 1024
 
 
 def handle_return_deserializer(deserializer=None):
@@ -63,22 +69,63 @@ class JWTAuth(AuthBase):
         return request
 
 
+class _RemoteState(threading.local):
+    """ The remote being accessed is assigned dynamically before each call. Keeping it per
+    thread allows concurrent calls (e.g. parallel package downloads) to different remotes
+    """
+    def __init__(self):
+        self.token = None
+        self.remote_url = None
+        self.custom_headers = {}  # Can set custom headers to each request
+        # Remote manager will set it to True or False dynamically depending on the remote
+        self.verify_ssl = True
+
+
 class RestApiClient(object):
     """
         Rest Api Client for handle remote.
     """
 
-    def __init__(self, output, requester, put_headers=None):
+    def __init__(self, output, requester, put_headers=None, metadata_cache=None):
 
         # Set to instance
-        self.token = None
-        self.remote_url = None
-        self.custom_headers = {}  # Can set custom headers to each request
+        self._state = _RemoteState()
         self._output = output
         self.requester = requester
-        # Remote manager will set it to True or False dynamically depending on the remote
-        self.verify_ssl = True
         self._put_headers = put_headers
+        self._metadata_cache = metadata_cache
+
+    @property
+    def token(self):
+        return self._state.token
+
+    @token.setter
+    def token(self, token):
+        self._state.token = token
+
+    @property
+    def remote_url(self):
+        return self._state.remote_url
+
+    @remote_url.setter
+    def remote_url(self, remote_url):
+        self._state.remote_url = remote_url
+
+    @property
+    def custom_headers(self):
+        return self._state.custom_headers
+
+    @custom_headers.setter
+    def custom_headers(self, custom_headers):
+        self._state.custom_headers = custom_headers
+
+    @property
+    def verify_ssl(self):
+        return self._state.verify_ssl
+
+    @verify_ssl.setter
+    def verify_ssl(self, verify_ssl):
+        self._state.verify_ssl = verify_ssl
 
     @property
     def auth(self):
@@ -89,12 +136,7 @@ class RestApiClient(object):
 
         # Obtain the URLs
         url = "%s/conans/%s/digest" % (self._remote_api_url, "/".join(conan_reference))
-        urls = self._get_file_to_url_dict(url)
-
-        # Get the digest
-        contents = self.download_files(urls)
-        # Unroll generator and decode shas (plain text)
-        contents = {key: decode_text(value) for key, value in dict(contents).items()}
+        contents = self._get_cached_files(url, CONAN_MANIFEST)
         return FileTreeManifest.loads(contents[CONAN_MANIFEST])
 
     def get_package_manifest(self, package_reference):
@@ -104,12 +146,7 @@ class RestApiClient(object):
         url = "%s/conans/%s/packages/%s/digest" % (self._remote_api_url,
                                                    "/".join(package_reference.conan),
                                                    package_reference.package_id)
-        urls = self._get_file_to_url_dict(url)
-
-        # Get the digest
-        contents = self.download_files(urls)
-        # Unroll generator and decode shas (plain text)
-        contents = {key: decode_text(value) for key, value in dict(contents).items()}
+        contents = self._get_cached_files(url, CONAN_MANIFEST)
         return FileTreeManifest.loads(contents[CONAN_MANIFEST])
 
     def get_package_info(self, package_reference):
@@ -118,18 +155,55 @@ class RestApiClient(object):
         url = "%s/conans/%s/packages/%s/download_urls" % (self._remote_api_url,
                                                           "/".join(package_reference.conan),
                                                           package_reference.package_id)
-        urls = self._get_file_to_url_dict(url)
-        if not urls:
-            raise NotFoundException("Package not found!")
+        contents = self._get_cached_files(url, CONANINFO, package_reference)
+        return ConanInfo.loads(contents[CONANINFO])
+
+    def _get_cached_files(self, url, filename, package_reference=None):
+        """ Downloads (in memory) the file from the url obtained in the json of url. The
+        contents are kept in the metadata cache, not the urls, as they might be signed and expire
+        """
+        cache_url = "%s#%s" % (url, filename)
+        if self._metadata_cache:
+            entry = self._metadata_cache.get(self.remote_url, cache_url, self._cache_user)
+            if entry and self._metadata_cache.is_fresh(entry):
+                return entry["content"]
 
-        if CONANINFO not in urls:
-            raise NotFoundException("Package %s doesn't have the %s file!" % (package_reference,
-                                                                              CONANINFO))
-        # Get the info (in memory)
-        contents = self.download_files({CONANINFO: urls[CONANINFO]})
+        urls = self._get_file_to_url_dict(url)
+        if package_reference:
+            if not urls:
+                raise NotFoundException("Package not found!")
+            if filename not in urls:
+                raise NotFoundException("Package %s doesn't have the %s file!"
+                                        % (package_reference, filename))
+        # Get the file (in memory)
+        contents = self.download_files({filename: urls[filename]})
         # Unroll generator and decode shas (plain text)
         contents = {key: decode_text(value) for key, value in dict(contents).items()}
-        return ConanInfo.loads(contents[CONANINFO])
+        if self._metadata_cache:
+            self._metadata_cache.store(self.remote_url, cache_url, contents,
+                                       user=self._cache_user)
+        return contents
+
+    def get_batch_info(self, references, package_references):
+        """Gets in a single request the manifest of the recipes and the manifest and conaninfo of
+        the packages, as dicts {reference: {filename: contents}}, None if not found.
+        Returns None if the server doesn't support it"""
+        try:
+            _, _, capabilities = self.server_info()
+        except NotFoundException:
+            capabilities = []
+        if BATCH_INFO_CAPABILITY not in capabilities:
+            return None
+
+        url = "%s/conans/batch_info" % self._remote_api_url
+        payload = {"recipes": [str(reference) for reference in references],
+                   "packages": [str(package_reference) for package_reference in package_references]}
+        result = self._get_json(url, data=payload)
+        recipes = {ConanFileReference.loads(reference): files
+                   for reference, files in result.get("recipes", {}).items()}
+        packages = {PackageReference.loads(package_reference): files
+                    for package_reference, files in result.get("packages", {}).items()}
+        return recipes, packages
 
     def get_recipe_urls(self, conan_reference):
         """Gets a dict of filename:contents from conans"""
@@ -156,6 +230,7 @@ class RestApiClient(object):
         the_files: dict with relative_path: content
         """
         self.check_credentials()
+        self._invalidate_metadata_cache()
 
         # Get the remote snapshot
         remote_snapshot = self._get_conan_snapshot(conan_reference)
@@ -194,6 +269,7 @@ class RestApiClient(object):
         relative_files: relative paths to upload
         """
         self.check_credentials()
+        self._invalidate_metadata_cache()
 
         t1 = time.time()
         # Get the remote snapshot
@@ -270,14 +346,14 @@ class RestApiClient(object):
             query = "?%s" % urlencode(params)
 
         url = "%s/conans/search%s" % (self._remote_api_url, query)
-        response = self._get_json(url)["results"]
+        response = self._get_json(url, cache=True)["results"]
         return [ConanFileReference.loads(ref) for ref in response]
 
     def search_packages(self, reference, query):
 
         url = "%s/conans/%s/search?" % (self._remote_api_url, "/".join(reference))
         if not query:
-            package_infos = self._get_json(url)
+            package_infos = self._get_json(url, cache=True)
             return package_infos
 
         # Read capabilities
@@ -288,16 +364,17 @@ class RestApiClient(object):
 
         if COMPLEX_SEARCH_CAPABILITY in capabilities:
             url += urlencode({"q": query})
-            package_infos = self._get_json(url)
+            package_infos = self._get_json(url, cache=True)
             return package_infos
         else:
-            package_infos = self._get_json(url)
+            package_infos = self._get_json(url, cache=True)
             return filter_packages(query, package_infos)
 
     @handle_return_deserializer()
     def remove_conanfile(self, conan_reference):
         """ Remove a recipe and packages """
         self.check_credentials()
+        self._invalidate_metadata_cache()
         url = "%s/conans/%s" % (self._remote_api_url, '/'.join(conan_reference))
         response = self.requester.delete(url,
                                          auth=self.auth,
@@ -309,6 +386,7 @@ class RestApiClient(object):
     def remove_packages(self, conan_reference, package_ids=None):
         """ Remove any packages specified by package_ids"""
         self.check_credentials()
+        self._invalidate_metadata_cache()
         payload = {"package_ids": package_ids}
         url = "%s/conans/%s/packages/delete" % (self._remote_api_url, '/'.join(conan_reference))
         return self._post_json(url, payload)
@@ -386,13 +464,35 @@ class RestApiClient(object):
 
     def _get_file_to_url_dict(self, url, data=None):
         """Call to url and decode the json returning a dict of {filepath: url} dict
-        converting the url to a complete url when needed"""
+        converting the url to a complete url when needed. Never cached, the urls might be signed
+        and expire"""
         urls = self._get_json(url, data=data)
         return {filepath: self._complete_url(url) for filepath, url in urls.items()}
 
-    def _get_json(self, url, data=None):
+    @property
+    def _cache_user(self):
+        """ The authenticated user, the metadata cache entries are per user """
+        return self.custom_headers.get("X-Client-Id") if self.token else None
+
+    def _invalidate_metadata_cache(self):
+        if self._metadata_cache:
+            self._metadata_cache.invalidate(self.remote_url)
+
+    def _get_json(self, url, data=None, cache=False):
+        """ cache: the GET response can be taken from the metadata cache, if enabled. Stale
+        entries are revalidated with their ETag, a 304 response keeps the cached content
+        """
         t1 = time.time()
         headers = self.custom_headers
+        entry = None
+        if cache and self._metadata_cache and not data:
+            entry = self._metadata_cache.get(self.remote_url, url, self._cache_user)
+            if entry and self._metadata_cache.is_fresh(entry):
+                return entry["content"]
+            if entry and entry["etag"]:
+                headers = dict(headers)
+                headers["If-None-Match"] = entry["etag"]
+
         if data:  # POST request
             headers.update({'Content-type': 'application/json',
                             'Accept': 'text/plain',
@@ -409,6 +509,10 @@ class RestApiClient(object):
         duration = time.time() - t1
         method = "POST" if data else "GET"
         log_client_rest_api_call(url, method, duration, headers)
+        if response.status_code == 304 and entry:  # Not modified
+            self._metadata_cache.store(self.remote_url, url, entry["content"], entry["etag"],
+                                       self._cache_user)
+            return entry["content"]
         if response.status_code != 200:  # Error message is text
             response.charset = "utf-8"  # To be able to access ret.text (ret.content are bytes)
             raise get_exception_from_error(response.status_code)(response.text)
@@ -416,6 +520,9 @@ class RestApiClient(object):
         result = json.loads(decode_text(response.content))
         if not isinstance(result, dict):
             raise ConanException("Unexpected server response %s" % result)
+        if cache and self._metadata_cache and not data:
+            self._metadata_cache.store(self.remote_url, url, result,
+                                       response.headers.get("ETag"), self._cache_user)
         return result
 
     @property
@@ -434,6 +541,14 @@ class RestApiClient(object):
             dedup = True
         return auth, dedup
 
+    def _checksum_deploy_capability(self):
+        """ The file server of conan_server, with signed urls, also understands dedup """
+        try:
+            _, _, capabilities = self.server_info()
+        except NotFoundException:
+            capabilities = []
+        return CHECKSUM_DEPLOY_CAPABILITY in capabilities
+
     def download_files(self, file_urls, output=None):
         """
         :param: file_urls is a dict with {filename: url}
@@ -459,42 +574,73 @@ class RestApiClient(object):
         It writes downloaded files to disk (appending to file, only keeps chunks in memory)
         """
         downloader = Downloader(self.requester, self._output, self.verify_ssl)
-        ret = {}
+        ret = DownloadedFiles()
+        tasks = []
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
         for filename, resource_url in sorted(file_urls.items(), reverse=True):
-            if self._output:
-                self._output.writeln("Downloading %s" % filename)
+            # Computed here, the remote state (token) is not visible from the transfer threads
             auth, _ = self._file_server_capabilities(resource_url)
             abs_path = os.path.join(to_folder, filename)
-            downloader.download(resource_url, abs_path, auth=auth)
+            tasks.append((filename, resource_url, abs_path, auth))
+            ret[filename] = abs_path
+
+        def download(filename, resource_url, abs_path, auth):
+            if self._output:
+                self._output.writeln("Downloading %s" % filename)
+            if downloader.download(resource_url, abs_path, auth=auth):
+                ret.resumed.add(filename)
             if self._output:
                 self._output.writeln("")
-            ret[filename] = abs_path
+
+        run_transfers(download, tasks)
         return ret
 
+    def download_file_stream(self, filename, file_url):
+        """
+        Returns a file-like object with the contents of file_url, downloaded as they are read,
+        so big files (conan_package.tgz) are never written to disk
+        """
+        auth, _ = self._file_server_capabilities(file_url)
+        if self._output:
+            self._output.writeln("Downloading %s" % filename)
+        downloader = Downloader(self.requester, self._output, self.verify_ssl)
+        return downloader.stream(file_url, auth=auth)
+
     def upload_files(self, file_urls, files, output, retry, retry_wait):
         t1 = time.time()
-        failed = []
+        failed = set()
         uploader = Uploader(self.requester, output, self.verify_ssl)
+        tasks = []
+        checksum_deploy = None
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
         for filename, resource_url in sorted(file_urls.items(), reverse=True):
-            output.rewrite_line("Uploading %s" % filename)
+            # Computed here, the remote state (token) is not visible from the transfer threads
             auth, dedup = self._file_server_capabilities(resource_url)
+            if not dedup and os.path.getsize(files[filename]) >= CHECKSUM_DEPLOY_MIN_SIZE:
+                # Small files are uploaded directly, cheaper than asking for them first
+                if checksum_deploy is None:
+                    checksum_deploy = self._checksum_deploy_capability()
+                dedup = checksum_deploy
+            tasks.append((filename, resource_url, auth, dedup))
+
+        def upload(filename, resource_url, auth, dedup):
+            output.rewrite_line("Uploading %s" % filename)
             try:
                 response = uploader.upload(resource_url, files[filename], auth=auth, dedup=dedup,
                                            retry=retry, retry_wait=retry_wait, headers=self._put_headers)
                 output.writeln("")
                 if not response.ok:
                     output.error("\nError uploading file: %s, '%s'" % (filename, response.content))
-                    failed.append(filename)
-                else:
-                    pass
+                    failed.add(filename)
             except Exception as exc:
                 output.error("\nError uploading file: %s, '%s'" % (filename, exc))
-                failed.append(filename)
+                failed.add(filename)
 
+        run_transfers(upload, tasks)
+        # Report them in the upload order, not in the order they failed
+        failed = [task[0] for task in tasks if task[0] in failed]
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
                                  % ", ".join(failed))
@@ -1,109 +1,117 @@
+import hashlib
+import json
 import os
+import platform
+import re
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
 import conans.tools
 from conans.errors import ConanException, ConanConnectionError, NotFoundException
-from conans.util.files import save_append, sha1sum, exception_message_safe, to_file_bytes, mkdir
+from conans.util.files import sha1sum, exception_message_safe, to_file_bytes, mkdir, load, save
+from conans.util.env_reader import get_env
 from conans.util.log import logger
 from conans.util.tracer import log_download
 
 
+# The http client sends every read() of the data in a single sendall()
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Seconds between refreshes of the progress bar
+PROGRESS_REFRESH = 0.1
+
+
 class Uploader(object):
 
-    def __init__(self, requester, output, verify, chunk_size=1000):
+    def __init__(self, requester, output, verify, chunk_size=UPLOAD_CHUNK_SIZE):
         self.chunk_size = chunk_size
         self.output = output
         self.requester = requester
         self.verify = verify
 
     def upload(self, url, abs_path, auth=None, dedup=False, retry=1, retry_wait=0, headers=None):
+        headers = dict(headers or {})
         if dedup:
-            dedup_headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1sum(abs_path)}
-            if headers:
-                dedup_headers.update(headers)
+            sha1 = sha1sum(abs_path)
+            dedup_headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1}
+            dedup_headers.update(headers)
             response = self.requester.put(url, data="", verify=self.verify, headers=dedup_headers,
                                           auth=auth)
             if response.status_code != 404:
                 return response
+            # The server verifies the uploaded file with it
+            headers["X-Checksum-Sha1"] = sha1
 
-        headers = headers or {}
         self.output.info("")
-        # Actual transfer of the real content
-        it = load_in_chunks(abs_path, self.chunk_size)
-        # Now it is a chunked read file
-        file_size = os.stat(abs_path).st_size
-        it = upload_with_progress(file_size, it, self.chunk_size, self.output)
-        # Now it will print progress in each iteration
-        iterable_to_file = IterableToFileAdapter(it, file_size)
-        # Now it is prepared to work with request
+        # Actual transfer of the real content, every retry reads the file again from the start
         ret = call_with_retry(self.output, retry, retry_wait, self._upload_file, url,
-                              data=iterable_to_file, headers=headers, auth=auth)
+                              abs_path=abs_path, headers=headers, auth=auth)
 
         return ret
 
-    def _upload_file(self, url, data,  headers, auth):
+    def _upload_file(self, url, abs_path, headers, auth):
         try:
-            response = self.requester.put(url, data=data, verify=self.verify,
-                                          headers=headers, auth=auth)
+            with FileUploadAdapter(abs_path, self.output, self.chunk_size) as data:
+                response = self.requester.put(url, data=data, verify=self.verify,
+                                              headers=headers, auth=auth)
         except Exception as exc:
             raise ConanException(exception_message_safe(exc))
 
         return response
 
 
-class IterableToFileAdapter(object):
-    def __init__(self, iterable, total_size):
-        self.iterator = iter(iterable)
-        self.total_size = total_size
+class FileUploadAdapter(object):
+    """ Read only file-like object of a file to upload, printing the progress as it is read.
+    Every read() returns a whole chunk_size block, whatever the size asked by the http client
+    (8KB), so the big files are sent with few reads and system calls. The progress is refreshed
+    by time, not for every block
+    """
+    def __init__(self, path, output, chunk_size=UPLOAD_CHUNK_SIZE):
+        self._path = path
+        self._output = output
+        self._chunk_size = chunk_size
+        self._total_size = os.stat(path).st_size
+        self._handle = None
+        self._read_size = 0
+        self._last_refresh = None
+
+    def __enter__(self):
+        self._handle = open(self._path, "rb")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._handle.close()
 
     def read(self, size=-1):  # @UnusedVariable
-        return next(self.iterator, b'')
+        data = self._handle.read(self._chunk_size)
+        self._read_size += len(data)
+        if self._output:
+            self._print_progress(finished=not data)
+        return data
+
+    def _print_progress(self, finished):
+        now = time.time()
+        if not finished and self._last_refresh is not None and \
+                now - self._last_refresh < PROGRESS_REFRESH:
+            return
+        self._last_refresh = now
+        if finished or not self._total_size:
+            units = progress_units(100, 100)
+        else:
+            units = progress_units(self._read_size, self._total_size)
+        print_progress(self._output, units,
+                       human_readable_progress(self._read_size, self._total_size))
 
     def __len__(self):
-        return self.total_size
-
-    def __iter__(self):
-        return self.iterator.__iter__()
-
-
-class upload_with_progress(object):
-    def __init__(self, totalsize, iterator, chunk_size, output):
-        self.totalsize = totalsize
-        self.output = output
-        self.chunk_size = chunk_size
-        self.aprox_chunks = self.totalsize * 1.0 / chunk_size
-        self.groups = iterator
+        return self._total_size
 
     def __iter__(self):
-        last_progress = None
-        for index, chunk in enumerate(self.groups):
-            if self.aprox_chunks == 0:
-                index = self.aprox_chunks
+        return iter(lambda: self.read(), b"")
 
-            units = progress_units(index, self.aprox_chunks)
-            progress = human_readable_progress(index * self.chunk_size, self.totalsize)
-            if last_progress != units:  # Avoid screen refresh if nothing has change
-                print_progress(self.output, units, progress)
-                last_progress = units
-            yield chunk
 
-        progress = human_readable_progress(self.totalsize, self.totalsize)
-        print_progress(self.output, progress_units(100, 100), progress)
-
-    def __len__(self):
-        return self.totalsize
-
-
-def load_in_chunks(path, chunk_size=1024):
-    """Lazy function (generator) to read a file piece by piece.
-    Default chunk size: 1k."""
-    with open(path, 'rb') as file_object:
-        while True:
-            data = file_object.read(chunk_size)
-            if not data:
-                break
-            yield data
+# Interrupted transfers resumed, not counted as retries, if every attempt downloads something
+MAX_RESUMES = 5
+PART_SUFFIX = ".part"
 
 
 class Downloader(object):
@@ -130,69 +138,143 @@ class Downloader(object):
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
         t1 = time.time()
+        if file_path:
+            # True if the contents come from several transfers, to be checked by the caller
+            resumed = self._download_to_file(url, file_path, auth, retry, retry_wait, headers)
+            log_download(url, time.time() - t1)
+            return resumed
+
         ret = bytearray()
-        response = call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth, headers)
-        if not response.ok:  # Do not retry if not found or whatever controlled error
-            if response.status_code == 404:
-                raise NotFoundException("Not found: %s" % url)
-            raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        response = self._get_response(url, auth, retry, retry_wait, headers)
 
         try:
             total_length = response.headers.get('content-length')
 
             if total_length is None:  # no content length header
-                if not file_path:
-                    ret += response.content
-                else:
-                    total_length = len(response.content)
-                    progress = human_readable_progress(total_length, total_length)
-                    print_progress(self.output, 50, progress)
-                    save_append(file_path, response.content)
+                ret += response.content
             else:
                 total_length = int(total_length)
                 encoding = response.headers.get('content-encoding')
                 gzip = (encoding == "gzip")
                 # chunked can be a problem: https://www.greenbytes.de/tech/webdav/rfc2616.html#rfc.section.4.4
                 # It will not send content-length or should be ignored
-
-                def download_chunks(file_handler=None, ret_buffer=None):
-                    """Write to a buffer or to a file handler"""
-                    chunk_size = 1024 if not file_path else 1024 * 100
-                    download_size = 0
-                    last_progress = None
-                    for data in response.iter_content(chunk_size=chunk_size):
-                        download_size += len(data)
-                        if ret_buffer is not None:
-                            ret_buffer.extend(data)
-                        if file_handler is not None:
-                            file_handler.write(to_file_bytes(data))
-
-                        units = progress_units(download_size, total_length)
-                        progress = human_readable_progress(download_size, total_length)
-                        if last_progress != units:  # Avoid screen refresh if nothing has change
-                            if self.output:
-                                print_progress(self.output, units, progress)
-                            last_progress = units
-                    return download_size
-
-                if file_path:
-                    mkdir(os.path.dirname(file_path))
-                    with open(file_path, 'wb') as handle:
-                        dl_size = download_chunks(file_handler=handle)
-                else:
-                    dl_size = download_chunks(ret_buffer=ret)
-
-                if dl_size != total_length and not gzip:
+                download_size = 0
+                last_progress = None
+                for data in response.iter_content(chunk_size=1024):
+                    download_size += len(data)
+                    ret.extend(data)
+                    units = progress_units(download_size, total_length)
+                    if last_progress != units:  # Avoid screen refresh if nothing has change
+                        if self.output:
+                            progress = human_readable_progress(download_size, total_length)
+                            print_progress(self.output, units, progress)
+                        last_progress = units
+
+                if download_size != total_length and not gzip:
                     raise ConanException("Transfer interrupted before "
-                                         "complete: %s < %s" % (dl_size, total_length))
+                                         "complete: %s < %s" % (download_size, total_length))
 
             duration = time.time() - t1
             log_download(url, duration)
+            return bytes(ret)
+        except Exception as e:
+            logger.debug(e.__class__)
+            logger.debug(traceback.format_exc())
+            # If this part failed, it means problems with the connection to server
+            raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                       % str(e))
 
-            if not file_path:
-                return bytes(ret)
-            else:
-                return
+    def _download_to_file(self, url, file_path, auth, retry, retry_wait, headers):
+        """ Downloads to a file_path.part file, renamed to file_path once complete. If the server
+        supports Range requests, the interrupted transfers are resumed by the next attempts. The
+        .part file is removed if all of them fail, so it is resumed by a later download of the
+        same url to the same file only if the process was killed. Returns True if the file was
+        completed by a resumed transfer
+        """
+        part = PartialDownload(file_path, url)
+        failures = 0
+        resumes = 0
+        while True:
+            part_size = part.size
+            try:
+                resumed = self._download_part(part, url, auth, headers)
+                break
+            except ConanConnectionError as exc:
+                if part.checkpoint and part.size > part_size and resumes < MAX_RESUMES:
+                    resumes += 1
+                    if self.output:
+                        self.output.warn("%s\nResuming the download from %s"
+                                         % (exception_message_safe(exc),
+                                            conans.tools.human_size(part.size)))
+                    continue
+                failures += 1
+                if failures >= retry:
+                    part.discard()
+                    raise
+                if self.output:
+                    self.output.error(exception_message_safe(exc))
+                    self.output.info("Waiting %d seconds to retry..." % retry_wait)
+                time.sleep(retry_wait)
+        part.complete()
+        return resumed
+
+    def _download_part(self, part, url, auth, headers):
+        """ Downloads to the .part file, appending to it if the checkpoint matches the remote
+        file. Returns True if appended
+        """
+        offset = part.size if part.checkpoint else 0
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers["Range"] = "bytes=%d-" % offset
+        response = self._download_file(url, auth, request_headers)
+        if offset and (response.status_code == 416 or
+                       (response.status_code == 206 and not part.matches(response, offset))):
+            # The remote file changed, or the .part is complete and was not renamed
+            response.close()
+            part.discard()
+            offset = 0
+            response = self._download_file(url, auth, headers)
+        _check_response(response, url)
+        if response.status_code != 206:
+            offset = 0  # Range not supported, the whole file
+
+        try:
+            total_length = response.headers.get('content-length')
+            if total_length is None:  # no content length header
+                content = response.content
+                total_length = len(content)
+                if self.output:
+                    progress = human_readable_progress(total_length, total_length)
+                    print_progress(self.output, 50, progress)
+                part.start(None)
+                with open(part.path, "wb") as handle:
+                    handle.write(to_file_bytes(content))
+                return False
+
+            total_length = offset + int(total_length)
+            # chunked can be a problem: https://www.greenbytes.de/tech/webdav/rfc2616.html#rfc.section.4.4
+            # It will not send content-length or should be ignored
+            gzip = (response.headers.get('content-encoding') == "gzip")
+            if not offset:
+                part.start(response if not gzip else None)
+            download_size = offset
+            last_progress = None
+            with open(part.path, "ab" if offset else "wb") as handle:
+                for data in response.iter_content(chunk_size=1024 * 100):
+                    download_size += len(data)
+                    handle.write(to_file_bytes(data))
+
+                    units = progress_units(download_size, total_length)
+                    if last_progress != units:  # Avoid screen refresh if nothing has change
+                        if self.output:
+                            progress = human_readable_progress(download_size, total_length)
+                            print_progress(self.output, units, progress)
+                        last_progress = units
+
+            if download_size != total_length and not gzip:
+                raise ConanException("Transfer interrupted before "
+                                     "complete: %s < %s" % (download_size, total_length))
+            return bool(offset)
         except Exception as e:
             logger.debug(e.__class__)
             logger.debug(traceback.format_exc())
@@ -200,16 +282,249 @@ class Downloader(object):
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
 
+    def stream(self, url, auth=None, retry=1, retry_wait=0, headers=None):
+        """ Returns a file-like object reading the body of the response as it arrives, so it can
+        be consumed, i.e. by tarfile in stream mode, without saving it to disk first. If the
+        transfer is interrupted it is resumed with a Range request, if the server supports them
+        """
+        response = self._get_response(url, auth, retry, retry_wait, headers)
+
+        def resume(offset):
+            request_headers = dict(headers or {})
+            request_headers["Range"] = "bytes=%d-" % offset
+            return self._download_file(url, auth, request_headers)
+
+        return DownloadStream(response, url, self.output, resume=resume)
+
+    def _get_response(self, url, auth, retry, retry_wait, headers):
+        response = call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth, headers)
+        _check_response(response, url)
+        return response
+
     def _download_file(self, url, auth, headers):
         try:
             response = self.requester.get(url, stream=True, verify=self.verify, auth=auth,
                                           headers=headers)
         except Exception as exc:
-            raise ConanException("Error downloading file %s: '%s'" % (url, exception_message_safe(exc)))
+            raise ConanConnectionError("Error downloading file %s: '%s'"
+                                       % (url, exception_message_safe(exc)))
 
         return response
 
 
+def _check_response(response, url):
+    if not response.ok:  # Do not retry if not found or whatever controlled error
+        if response.status_code == 404:
+            raise NotFoundException("Not found: %s" % url)
+        raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+
+
+def _resume_validators(response):
+    """ The headers that identify the version of the remote file """
+    return {"etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified")}
+
+
+def _content_range(response):
+    """ (first byte, total length) of a 206 response, or (None, None) """
+    try:
+        first, total = re.match(r"bytes (\d+)-\d+/(\d+)",
+                                response.headers.get("content-range", "")).groups()
+        return int(first), int(total)
+    except (AttributeError, TypeError):
+        return None, None
+
+
+class DownloadedFiles(dict):
+    """ {filename: abs_path} of the files downloaded to a folder, and the filenames whose
+    contents come from resumed transfers, that should be checked against the manifest
+    """
+    def __init__(self, *args, **kwargs):
+        super(DownloadedFiles, self).__init__(*args, **kwargs)
+        self.resumed = set()
+
+
+class PartialDownload(object):
+    """ The file_path.part file of a download, and its checkpoint file_path.part.json, with the
+    url, length and validators (ETag, Last-Modified) of the remote file. Only the transfers of
+    servers supporting Range requests and sending a validator have a checkpoint, and are resumed
+    while the url (without the query, the signatures change) and the remote file are the same
+    """
+    def __init__(self, file_path, url):
+        self.file_path = file_path
+        self.path = file_path + PART_SUFFIX
+        self._checkpoint_path = self.path + ".json"
+        self._url = url.split("?")[0]
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.path) or not os.path.exists(self._checkpoint_path):
+            return None
+        try:
+            checkpoint = json.loads(load(self._checkpoint_path))
+        except Exception as e:  # Corrupted, the download starts again
+            logger.debug("Invalid download checkpoint %s: %s" % (self._checkpoint_path, str(e)))
+            return None
+        return checkpoint if checkpoint.get("url") == self._url else None
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def start(self, response):
+        """ A transfer of the whole file starts, with the response headers saved as the
+        checkpoint if the server supports resuming it later, and identifies the version of the
+        file (ETag or Last-Modified), else it could be resumed from other file of the same length
+        """
+        self.checkpoint = None
+        if os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+        if response is None or response.headers.get("accept-ranges") != "bytes":
+            return
+        validators = _resume_validators(response)
+        if not any(validators.values()):
+            return
+        checkpoint = {"url": self._url, "length": int(response.headers["content-length"])}
+        checkpoint.update(validators)
+        mkdir(os.path.dirname(self.path))
+        save(self._checkpoint_path, json.dumps(checkpoint))
+        self.checkpoint = checkpoint
+
+    def matches(self, response, offset):
+        """ If the partial content response continues the checkpoint file """
+        first, total = _content_range(response)
+        return (first == offset and total == self.checkpoint["length"] and
+                _resume_validators(response) == {key: self.checkpoint.get(key)
+                                                 for key in ("etag", "last_modified")})
+
+    def discard(self):
+        self.checkpoint = None
+        for path in (self.path, self._checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def complete(self):
+        if os.path.exists(self.file_path) and platform.system() == "Windows":
+            os.remove(self.file_path)  # rename() doesn't replace files in Windows
+        os.rename(self.path, self.file_path)
+        if os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+
+
+class DownloadStream(object):
+    """ Read only file-like adapter of a streamed response. It prints the progress and computes
+    the md5 and sha1 of the contents as they are read. resume(offset) returns the response of a
+    Range request from offset, used to continue an interrupted transfer if the server supports
+    them and the remote file is the same
+    """
+    def __init__(self, response, url, output, chunk_size=1024 * 100, resume=None):
+        self._url = url
+        self._output = output
+        self._chunk_size = chunk_size
+        self._iterator = iter(response.iter_content(chunk_size=chunk_size))
+        self._buffer = b""
+        self._pos = 0
+        self._finished = False
+        self._md5 = hashlib.md5()
+        self._sha1 = hashlib.sha1()
+        self._t1 = time.time()
+        self._download_size = 0
+        self._last_progress = None
+        total_length = response.headers.get('content-length')
+        self._total_length = int(total_length) if total_length is not None else None
+        self._gzip = (response.headers.get('content-encoding') == "gzip")
+        self._resume = resume
+        self._resumes = 0
+        self._validators = _resume_validators(response)
+        self._resumable = (resume is not None and self._total_length is not None and
+                           not self._gzip and response.headers.get("accept-ranges") == "bytes")
+        self.resumed = False  # The contents are not from a single response
+
+    @property
+    def checksums(self):
+        """ (md5, sha1) of the contents read so far """
+        return self._md5.hexdigest(), self._sha1.hexdigest()
+
+    def read(self, size=-1):
+        while not self._finished and (size is None or size < 0 or
+                                      len(self._buffer) - self._pos < size):
+            data = self._next_chunk()
+            if data is None:
+                self._finish()
+            elif data:
+                self._update(data)
+                # Only the pending bytes are copied, once per received chunk
+                self._buffer = self._buffer[self._pos:] + data
+                self._pos = 0
+        if size is None or size < 0:
+            size = len(self._buffer) - self._pos
+        ret = self._buffer[self._pos:self._pos + size]
+        self._pos += len(ret)
+        return ret
+
+    def _next_chunk(self):
+        """ The next received chunk, or None at the end of the response, resuming the transfer
+        if it is interrupted
+        """
+        while True:
+            try:
+                data = next(self._iterator, None)
+            except Exception as e:
+                if not self._resume_transfer(e):
+                    raise ConanConnectionError("Download failed, check server, possibly try "
+                                               "again\n%s" % exception_message_safe(e))
+                continue
+            if (data is None and self._total_length is not None and
+                    self._download_size < self._total_length and
+                    self._resume_transfer("Transfer interrupted before complete")):
+                continue
+            return data
+
+    def _resume_transfer(self, reason):
+        if not self._resumable or self._resumes >= MAX_RESUMES:
+            return False
+        self._resumes += 1
+        if self._output:
+            self._output.writeln("")
+            self._output.warn("%s\nResuming the download from %s"
+                              % (reason, conans.tools.human_size(self._download_size)))
+        try:
+            response = self._resume(self._download_size)
+        except ConanException as e:
+            logger.debug("Cannot resume the download of %s: %s" % (self._url, str(e)))
+            return False
+        first, total = _content_range(response)
+        if (response.status_code != 206 or first != self._download_size or
+                total != self._total_length or _resume_validators(response) != self._validators):
+            response.close()
+            return False
+        self._iterator = iter(response.iter_content(chunk_size=self._chunk_size))
+        self.resumed = True
+        return True
+
+    def _update(self, data):
+        self._md5.update(data)
+        self._sha1.update(data)
+        self._download_size += len(data)
+        if self._output and self._total_length:
+            units = progress_units(self._download_size, self._total_length)
+            if self._last_progress != units:  # Avoid screen refresh if nothing has change
+                progress = human_readable_progress(self._download_size, self._total_length)
+                print_progress(self._output, units, progress)
+                self._last_progress = units
+
+    def _finish(self):
+        self._finished = True
+        if (self._total_length is not None and self._download_size != self._total_length
+                and not self._gzip):
+            raise ConanConnectionError("Download failed, check server, possibly try again\n"
+                                       "Transfer interrupted before complete: %s < %s"
+                                       % (self._download_size, self._total_length))
+        if self._output:
+            self._output.writeln("")
+        log_download(self._url, time.time() - self._t1)
+
+
 def progress_units(progress, total):
     return min(50, int(50 * progress / total))
 
@@ -236,3 +551,23 @@ def call_with_retry(out, retry, retry_wait, method, *args, **kwargs):
                 out.error(msg)
                 out.info("Waiting %d seconds to retry..." % retry_wait)
                 time.sleep(retry_wait)
+
+
+def run_transfers(transfer, tasks):
+    """ Calls transfer(*task) for every task, using up to CONAN_PARALLEL_TRANSFERS threads, so
+    the files of a recipe or package (conanmanifest.txt, conaninfo.txt, conan_package.tgz...)
+    overlap their network latency. Every transfer must apply its own retries. The first
+    failure, in tasks order, is raised once all the transfers are finished
+    """
+    jobs = min(get_env("CONAN_PARALLEL_TRANSFERS", 1), len(tasks))
+    if jobs <= 1:
+        for task in tasks:
+            transfer(*task)
+        return
+
+    pool = ThreadPool(jobs)
+    results = [pool.apply_async(transfer, task) for task in tasks]
+    pool.close()
+    pool.join()
+    for result in results:
+        result.get()
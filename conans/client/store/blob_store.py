@@ -0,0 +1,156 @@
+import errno
+import os
+import platform
+import shutil
+import stat
+
+from conans.model.manifest import FileTreeManifest
+from conans.paths import CONANINFO, CONAN_MANIFEST
+from conans.util.files import mkdir, md5sum
+from conans.util.log import logger
+
+# Rewritten in place by conan, they are never shared
+_NOT_SHARED = (CONANINFO, CONAN_MANIFEST)
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+class BlobStore(object):
+    """ Content addressed store of the files of the packages in the local cache. The files of
+    the package folders are hardlinks to the blobs, keyed by the md5 of the package manifest, so
+    identical files of different package ids, channels or versions are stored only once:
+
+        <folder>/<md5[:2]>/<md5>
+
+    The blob store has to be in the same filesystem as the storage. If hardlinks cannot be
+    created the package folders are kept as regular copies. The blobs, and so the package files
+    linked to them, are read-only: writing one of them in place would modify all the packages
+    sharing it.
+    """
+
+    def __init__(self, folder, output=None):
+        self._folder = folder
+        self._output = output
+
+    def _blob_path(self, md5):
+        return os.path.join(self._folder, md5[:2], md5)
+
+    @staticmethod
+    def _make_read_only(path, path_stat):
+        if path_stat.st_mode & _WRITE_BITS:
+            os.chmod(path, stat.S_IMODE(path_stat.st_mode) & ~_WRITE_BITS)
+
+    def _is_blob(self, path, md5):
+        """ the path is a hardlink to the blob of that md5 """
+        if not md5:
+            return False
+        try:
+            file_stat, blob_stat = os.stat(path), os.stat(self._blob_path(md5))
+        except OSError:
+            return False
+        return (file_stat.st_ino, file_stat.st_dev) == (blob_stat.st_ino, blob_stat.st_dev)
+
+    def deduplicate(self, package_folder):
+        """ Replaces the files of the package folder with hardlinks to the blobs with the same
+        md5 in its manifest, adding the new ones to the store. Returns the bytes saved
+        """
+        if not hasattr(os, "link"):
+            return 0
+        try:
+            manifest = FileTreeManifest.load(package_folder)
+        except IOError:
+            return 0
+        saved = 0
+        for relative_path, md5 in sorted(manifest.file_sums.items()):
+            if relative_path in _NOT_SHARED:
+                continue
+            path = os.path.join(package_folder, relative_path)
+            blob = self._blob_path(md5)
+            try:
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                if not os.path.exists(blob):
+                    # New blob, check first the file wasn't modified after the manifest
+                    if md5sum(path) == md5:
+                        mkdir(os.path.dirname(blob))
+                        self._make_read_only(path, os.stat(path))
+                        os.link(path, blob)
+                    continue
+                file_stat, blob_stat = os.stat(path), os.stat(blob)
+                if (file_stat.st_ino, file_stat.st_dev) == (blob_stat.st_ino, blob_stat.st_dev):
+                    continue
+                # Same contents and permissions, but the write ones
+                if (file_stat.st_size, file_stat.st_mode | _WRITE_BITS) != \
+                        (blob_stat.st_size, blob_stat.st_mode | _WRITE_BITS):
+                    continue
+                self._make_read_only(blob, blob_stat)  # Added by a previous conan version
+                self._link(blob, path)
+                saved += file_stat.st_size
+            except OSError as e:
+                if e.errno == errno.EEXIST:  # Added concurrently by other conan process
+                    continue
+                # Other filesystem, or hardlinks not supported, the copies are kept
+                logger.debug("Cannot deduplicate %s: %s" % (path, str(e)))
+                if self._output:
+                    self._output.warn("Blob store %s cannot be used: %s" % (self._folder, str(e)))
+                break
+        return saved
+
+    def copy_folder(self, src_folder, dst_folder):
+        """ Like shutil.copytree(symlinks=True) of a package folder, but the files linked to a
+        blob are hardlinked to the same blob instead of copied
+        """
+        self.deduplicate(src_folder)
+        try:
+            file_sums = FileTreeManifest.load(src_folder).file_sums
+        except IOError:
+            file_sums = {}
+        for root, dirs, files in os.walk(src_folder):
+            relative_root = os.path.relpath(root, src_folder)
+            dst_root = os.path.normpath(os.path.join(dst_folder, relative_root))
+            mkdir(dst_root)
+            for name in list(dirs):
+                src = os.path.join(root, name)
+                if os.path.islink(src):  # os.walk doesn't follow them
+                    os.symlink(os.readlink(src), os.path.join(dst_root, name))
+            for name in files:
+                src, dst = os.path.join(root, name), os.path.join(dst_root, name)
+                relative_path = os.path.relpath(src, src_folder).replace("\\", "/")
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                elif relative_path in _NOT_SHARED or \
+                        not self._is_blob(src, file_sums.get(relative_path)):
+                    shutil.copy2(src, dst)
+                else:
+                    try:
+                        os.link(src, dst)
+                    except OSError:
+                        shutil.copy2(src, dst)
+
+    def collect_garbage(self):
+        """ Removes the blobs not used by any package folder, returns the bytes freed """
+        freed = 0
+        if not os.path.isdir(self._folder):
+            return freed
+        for root, _, files in os.walk(self._folder):
+            for name in files:
+                blob = os.path.join(root, name)
+                try:
+                    blob_stat = os.stat(blob)
+                    if blob_stat.st_nlink == 1:
+                        if platform.system() == "Windows":
+                            os.chmod(blob, stat.S_IWRITE)  # Read-only files cannot be removed
+                        os.remove(blob)
+                        freed += blob_stat.st_size
+                except OSError as e:
+                    logger.debug("Cannot collect blob %s: %s" % (blob, str(e)))
+        return freed
+
+    @staticmethod
+    def _link(blob, path):
+        tmp_path = path + ".blob"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        os.link(blob, tmp_path)
+        if platform.system() == "Windows":
+            os.remove(path)  # rename() doesn't replace files in Windows
+        os.rename(tmp_path, path)
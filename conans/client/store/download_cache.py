@@ -0,0 +1,114 @@
+import hashlib
+import os
+import platform
+import shutil
+import threading
+import uuid
+
+from conans.errors import ConanException
+from conans.util.files import mkdir
+from conans.util.locks import SimpleLock
+from conans.util.log import logger
+
+_LOCK_SUFFIX = ".lock"
+_TMP_SUFFIX = ".tmp"
+# The file locks are per process, the threads of the same process (install_jobs) also need these
+# Striped, the downloads of the same file always get the same lock
+_THREAD_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+class DownloadCache(object):
+    """ Cache of the files downloaded with tools.get and tools.download, that can be shared by
+    several conan client caches (or CI agents) of the same machine. The files are keyed by their
+    checksum if known, by the url otherwise:
+
+        <folder>/<sha256|sha1|md5>/<checksum>
+        <folder>/url/<sha256 of the url>
+
+    If max_size (bytes) is defined, the least recently used files are removed when exceeded.
+    """
+
+    def __init__(self, folder, max_size=None, output=None):
+        self._folder = folder
+        self._max_size = max_size
+        self._output = output
+
+    def _entry(self, url, checksums):
+        for algorithm in ("sha256", "sha1", "md5"):
+            signature = checksums.get(algorithm)
+            if signature:
+                return os.path.join(self._folder, algorithm, signature.lower())
+        # The full url, the query might identify the file (i.e. archive.tar.gz?ref=v1.2)
+        return os.path.join(self._folder, "url", hashlib.sha256(url.encode()).hexdigest())
+
+    def download(self, url, filename, checksums, download, check):
+        """ Copies to filename the cached file of the url, calling download(path) to retrieve it
+        if not cached. check(path) raises ConanException if the file doesn't match the checksums,
+        such file is never cached
+        """
+        entry = self._entry(url, checksums)
+        mkdir(os.path.dirname(entry))
+        # Other conan processes downloading the same file wait for it
+        with _THREAD_LOCKS[hash(entry) % len(_THREAD_LOCKS)], SimpleLock(entry + _LOCK_SUFFIX):
+            if self._copy(entry, filename, check):
+                if self._output:
+                    self._output.info("Using cached download of %s" % url)
+                return
+            tmp_path = "%s.%s%s" % (entry, uuid.uuid4().hex, _TMP_SUFFIX)
+            try:
+                download(tmp_path)
+                check(tmp_path)
+                if platform.system() == "Windows" and os.path.exists(entry):
+                    os.remove(entry)  # rename() doesn't replace files in Windows
+                os.rename(tmp_path, entry)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            shutil.copyfile(entry, filename)
+        self.evict()
+
+    def _copy(self, entry, filename, check):
+        if not os.path.exists(entry):
+            return False
+        try:
+            shutil.copyfile(entry, filename)
+            check(filename)
+            os.utime(entry, None)  # Recently used
+            return True
+        except (IOError, OSError) as e:  # Removed by a concurrent eviction
+            logger.debug("Cannot use cached download %s: %s" % (entry, str(e)))
+        except ConanException as e:
+            if self._output:
+                self._output.warn("Corrupted cached download %s, removed: %s" % (entry, str(e)))
+            os.remove(entry)
+        if os.path.exists(filename):
+            os.remove(filename)
+        return False
+
+    def evict(self):
+        """ Removes the least recently used files while over max_size, returns the bytes freed """
+        freed = 0
+        if not self._max_size or not os.path.isdir(self._folder):
+            return freed
+        entries = []
+        for root, _, files in os.walk(self._folder):
+            for name in files:
+                if name.endswith(_LOCK_SUFFIX) or name.endswith(_TMP_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    entry_stat = os.stat(path)
+                except OSError:  # Removed by other process
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self._max_size:
+                break
+            try:
+                os.remove(path)
+                freed += entry_size
+            except OSError as e:  # In use (Windows) or removed by other process
+                logger.debug("Cannot evict cached download %s: %s" % (path, str(e)))
+            size -= entry_size
+        return freed
@@ -0,0 +1,43 @@
+import json
+import os
+import time
+
+from conans.util.files import save, load, rmdir, md5
+from conans.util.log import logger
+
+
+class MetadataCache(object):
+    """ On disk cache of the json responses of the remotes (search results, manifests,
+    download urls...), one file per remote, user and url, as the responses depend on the user
+    permissions. The entries younger than ttl seconds are used without asking the remote, the
+    older ones are revalidated with their ETag
+    """
+
+    def __init__(self, folder, ttl):
+        self._folder = folder
+        self.ttl = ttl
+
+    def _path(self, remote_url, url, user):
+        return os.path.join(self._folder, md5(remote_url), md5("%s@%s" % (user or "", url)))
+
+    def get(self, remote_url, url, user=None):
+        """ returns the cached entry, a dict with "content", "etag" and "time", or None """
+        path = self._path(remote_url, url, user)
+        if not os.path.exists(path):
+            return None
+        try:
+            return json.loads(load(path))
+        except Exception as e:  # Concurrently written or corrupted, it is just a cache
+            logger.debug("Invalid metadata cache entry %s: %s" % (path, str(e)))
+            return None
+
+    def is_fresh(self, entry):
+        return time.time() - entry["time"] < self.ttl
+
+    def store(self, remote_url, url, content, etag=None, user=None):
+        entry = {"content": content, "etag": etag, "time": time.time()}
+        save(self._path(remote_url, url, user), json.dumps(entry))
+
+    def invalidate(self, remote_url):
+        """ Removes all the entries of a remote, i.e. after uploading or removing """
+        rmdir(os.path.join(self._folder, md5(remote_url)))
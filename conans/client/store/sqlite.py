@@ -15,8 +15,10 @@ class SQLiteDB(object):
 
     def connect(self):
         try:
+            # The connection can be used from the threads of parallel installs
             self.connection = sqlite3.connect(self.dbfile,
-                                              detect_types=sqlite3.PARSE_DECLTYPES)
+                                              detect_types=sqlite3.PARSE_DECLTYPES,
+                                              check_same_thread=False)
             self.connection.text_factory = str
             statement = None
             try:
@@ -3,8 +3,10 @@ import sys
 import os
 from conans.client.output import ConanOutput
 from conans.client.rest.uploader_downloader import Downloader
+from conans.client.store.download_cache import DownloadCache
 from conans.client.tools.files import unzip, check_md5, check_sha1, check_sha256
 from conans.errors import ConanException
+from conans.util.env_reader import get_env
 
 _global_requester = None
 
@@ -13,15 +15,7 @@ def get(url, md5='', sha1='', sha256='', destination="."):
     """ high level downloader + unzipper + (optional hash checker) + delete temporary zip
     """
     filename = os.path.basename(url)
-    download(url, filename)
-
-    if md5:
-        check_md5(filename, md5)
-    if sha1:
-        check_sha1(filename, sha1)
-    if sha256:
-        check_sha256(filename, sha256)
-
+    download(url, filename, md5=md5, sha1=sha1, sha256=sha256)
     unzip(filename, destination=destination)
     os.unlink(filename)
 
@@ -45,10 +39,43 @@ def ftp_download(ip, filename, login='', password=''):
             pass
 
 
+def _download_cache(out):
+    """ The DownloadCache of the files of get() and download(), None if not enabled """
+    folder = get_env("CONAN_DOWNLOAD_CACHE", None)
+    if not folder:
+        return None
+    max_size = get_env("CONAN_DOWNLOAD_CACHE_MAX_SIZE", 0) * 1024 * 1024
+    return DownloadCache(os.path.abspath(os.path.expanduser(folder)), max_size, out)
+
+
 def download(url, filename, verify=True, out=None, retry=2, retry_wait=5, overwrite=False,
-             auth=None, headers=None):
+             auth=None, headers=None, md5='', sha1='', sha256=''):
     out = out or ConanOutput(sys.stdout, True)
     downloader = Downloader(_global_requester, out, verify=verify)
-    downloader.download(url, filename, retry=retry, retry_wait=retry_wait, overwrite=overwrite,
-                        auth=auth, headers=headers)
-    out.writeln("")
+
+    def _download(file_path):
+        downloader.download(url, file_path, retry=retry, retry_wait=retry_wait,
+                            overwrite=overwrite, auth=auth, headers=headers)
+        out.writeln("")
+
+    def _check(file_path):
+        if md5:
+            check_md5(file_path, md5)
+        if sha1:
+            check_sha1(file_path, sha1)
+        if sha256:
+            check_sha256(file_path, sha256)
+
+    download_cache = _download_cache(out)
+    if not download_cache:
+        _download(filename)
+        _check(filename)
+        return
+
+    file_path = os.path.abspath(filename)
+    if os.path.exists(file_path):
+        if not overwrite:
+            raise ConanException("Error, the file to download already exists: '%s'" % file_path)
+        out.warn("file '%s' already exists, overwriting" % file_path)
+    download_cache.download(url, file_path, {"md5": md5, "sha1": sha1, "sha256": sha256},
+                            _download, _check)
@@ -1,15 +1,89 @@
 import os
 import calendar
+import json
 import time
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from conans.util.env_reader import get_env
 from conans.util.files import md5sum, md5, save, load
-from conans.paths import PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME
+from conans.util.log import logger
+from conans.paths import PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, \
+    HASHES_FOLDER
 from conans.errors import ConanException
 import datetime
 
 
+# Below this number of files they are hashed sequentially, a pool is not worth it
+_PARALLEL_HASH_MIN_FILES = 32
+# Files modified in the last seconds are not remembered, their mtime could not change if they
+# are modified again (filesystems with coarse timestamps)
+_HASH_CACHE_MIN_AGE = 2
+
+
+def md5sums(files):
+    """ returns {name: md5} of the {name: abs_path} files. They are hashed in CONAN_HASH_THREADS
+    threads (hashlib releases the GIL)
+    """
+    names = sorted(files)
+    threads = min(get_env("CONAN_HASH_THREADS", cpu_count()), len(names))
+    if threads <= 1 or len(names) < _PARALLEL_HASH_MIN_FILES:
+        return {name: md5sum(files[name]) for name in names}
+    pool = ThreadPool(threads)
+    try:
+        result = pool.map(md5sum, [files[name] for name in names], chunksize=16)
+    finally:
+        pool.close()
+        pool.join()
+    return dict(zip(names, result))
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    mtime_ns = getattr(stat, "st_mtime_ns", None) or int(stat.st_mtime * 1e9)
+    return [stat.st_size, mtime_ns, stat.st_ino]
+
+
+def folder_md5sums(folder, files, cache_path):
+    """ Same as md5sums() for the {relative_path: abs_path} files of a folder, but only the new
+    or modified files (size, mtime or inode) since the previous call are hashed: the hashes are
+    persisted in the cache_path file, out of the folder, so it is never copied with its files.
+    An unmodified folder is verified with stat calls only
+    """
+    try:
+        cache = json.loads(load(cache_path)) if os.path.exists(cache_path) else {}
+    except Exception as e:  # Corrupted or concurrently written, it is just a cache
+        logger.debug("Invalid hashes cache %s: %s" % (cache_path, str(e)))
+        cache = {}
+
+    keys = {name: _stat_key(path) for name, path in files.items()}
+    result = {}
+    for name, key in keys.items():
+        entry = cache.get(name)
+        if entry and entry[:3] == key:
+            result[name] = entry[3]
+    result.update(md5sums({name: path for name, path in files.items() if name not in result}))
+
+    # Files modified in the last seconds are not stored, they could change with the same mtime
+    min_mtime_ns = (time.time() - _HASH_CACHE_MIN_AGE) * 1e9
+    new_cache = {name: key + [result[name]] for name, key in keys.items()
+                 if key[1] < min_mtime_ns}
+    if new_cache != cache and os.path.isdir(folder):
+        try:
+            # Not modified in place, it could be read concurrently
+            tmp_path = "%s.%s" % (cache_path, os.getpid())
+            save(tmp_path, json.dumps(new_cache))
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(tmp_path, cache_path)
+        except (IOError, OSError) as e:  # A read only cache
+            logger.debug("Cannot save hashes cache %s: %s" % (cache_path, str(e)))
+    return result
+
+
 def discarded_file(filename):
     return filename == ".DS_Store" or filename.endswith(".pyc") or \
-           filename.endswith(".pyo") or filename == "__pycache__"
+           filename.endswith(".pyo") or filename == "__pycache__" or \
+           filename == HASHES_FOLDER  # Saved in the folders by older versions
 
 
 def gather_files(folder):
@@ -87,22 +161,28 @@ class FileTreeManifest(object):
         save(path, content)
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, hashes_cache=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
-        from disk, and capturing current time
+        from disk, and capturing current time.
+        hashes_cache: Folder to reuse and update the persisted hashes of the files
+        (folder_md5sums), it cannot be inside the folders
         """
+        def folder_sums(files_folder, files):
+            if not hashes_cache:
+                return md5sums(files)
+            cache_name = "export_source" if files_folder == exports_sources_folder else "files"
+            return folder_md5sums(files_folder, files,
+                                  os.path.join(hashes_cache, cache_name + ".json"))
+
         files, _ = gather_files(folder)
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
-
-        file_dict = {}
-        for name, filepath in files.items():
-            file_dict[name] = md5sum(filepath)
+        file_dict = folder_sums(folder, files)
 
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
-            for name, filepath in export_files.items():
-                file_dict["export_source/%s" % name] = md5sum(filepath)
+            for name, file_md5 in folder_sums(exports_sources_folder, export_files).items():
+                file_dict["export_source/%s" % name] = file_md5
 
         date = calendar.timegm(time.gmtime())
 
@@ -21,6 +21,8 @@ SRC_FOLDER = "source"
 BUILD_FOLDER = "build"
 PACKAGES_FOLDER = "package"
 SYSTEM_REQS_FOLDER = "system_reqs"
+# Persisted hashes of the files of the export and package folders, out of them
+HASHES_FOLDER = ".conan_hashes"
 
 
 CONANFILE = 'conanfile.py'
@@ -143,6 +145,14 @@ class SimplePaths(object):
         return normpath(join(self.conan(package_reference.conan), SYSTEM_REQS_FOLDER,
                              package_reference.package_id, SYSTEM_REQS))
 
+    def hashes_cache(self, conan_reference, package_id=None):
+        """ the folder of the persisted hashes of the files of the export or a package """
+        assert isinstance(conan_reference, ConanFileReference)
+        if package_id is None:
+            return normpath(join(self.conan(conan_reference), HASHES_FOLDER, EXPORT_FOLDER))
+        return normpath(join(self.conan(conan_reference), HASHES_FOLDER, PACKAGES_FOLDER,
+                             package_id))
+
     def packages(self, conan_reference):
         assert isinstance(conan_reference, ConanFileReference)
         return normpath(join(self.conan(conan_reference), PACKAGES_FOLDER))
@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import threading
+from fnmatch import translate
+
+from conans.client.store.sqlite import SQLiteDB
+from conans.errors import ConanException
+from conans.model.info import ConanInfo
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANINFO
+from conans.search.query_parse import infix_to_postfix, is_operator
+from conans.search.search import DiskSearchManager, check_query, is_setting
+from conans.util.files import load
+from conans.util.log import logger
+
+RECIPES_TABLE = "recipes"
+PACKAGES_TABLE = "packages"
+PROPERTIES_TABLE = "properties"
+
+
+class CatalogSearchManager(DiskSearchManager):
+    """ Search of recipes and packages using a SQLite catalog of the store, instead of walking
+    the store and parsing every conaninfo.txt in each search. The package queries are compiled
+    to SQL.
+
+    The catalog is built from the store the first time, and then it has to be notified of the
+    changes with store_changed(path), i.e. after every upload or removal in the server.
+    """
+
+    def __init__(self, paths, dbfile):
+        super(CatalogSearchManager, self).__init__(paths)
+        self._lock = threading.Lock()
+        new_catalog = not os.path.exists(dbfile)
+        self._db = SQLiteDB(dbfile)
+        self._db.connect()
+        self._pid = os.getpid()
+        self._init_tables()
+        if new_catalog:
+            self.rebuild()
+
+    def _cursor(self):
+        # A SQLite connection cannot be used in a forked process (prefork server mode)
+        if os.getpid() != self._pid:
+            self._db.connect()
+            self._pid = os.getpid()
+        return self._db.connection.cursor()
+
+    def _init_tables(self):
+        try:
+            cursor = self._cursor()
+            cursor.execute("create table if not exists %s (reference TEXT PRIMARY KEY)"
+                           % RECIPES_TABLE)
+            cursor.execute("create table if not exists %s (id INTEGER PRIMARY KEY, "
+                           "reference TEXT, package_id TEXT, info TEXT, "
+                           "UNIQUE(reference, package_id))" % PACKAGES_TABLE)
+            cursor.execute("create table if not exists %s "
+                           "(package INTEGER, kind TEXT, name TEXT, value TEXT)"
+                           % PROPERTIES_TABLE)
+            cursor.execute("create index if not exists properties_index on %s "
+                           "(package, kind, name)" % PROPERTIES_TABLE)
+            self._db.connection.commit()
+        except Exception as e:
+            raise ConanException("Could not initialize the search catalog", e)
+
+    def rebuild(self):
+        """ Indexes again the whole store """
+        with self._lock:
+            cursor = self._cursor()
+            for table in (RECIPES_TABLE, PACKAGES_TABLE, PROPERTIES_TABLE):
+                cursor.execute("delete from %s" % table)
+            for reference in DiskSearchManager.search_recipes(self):
+                self._index_recipe(cursor, reference)
+                self._index_packages(cursor, reference)
+            self._db.connection.commit()
+
+    def store_changed(self, path):
+        """ Indexes again the recipe or packages affected by the upload or removal of path, a
+        file or folder inside the store
+        """
+        relative_path = os.path.relpath(path, self._paths.store)
+        tokens = relative_path.replace("\\", "/").split("/")
+        if len(tokens) < 4 or tokens[0] == "..":
+            return
+        reference = ConanFileReference(*tokens[:4])
+        with self._lock:
+            cursor = self._cursor()
+            if not os.path.isdir(self._paths.conan(reference)):
+                self._remove_packages(cursor, reference)
+                cursor.execute("delete from %s where reference=?" % RECIPES_TABLE,
+                               (str(reference), ))
+            else:
+                self._index_recipe(cursor, reference)
+                if len(tokens) == 4 or tokens[4] == "package":
+                    if len(tokens) <= 5:
+                        self._index_packages(cursor, reference)
+                    elif len(tokens) == 6 or tokens[6] == CONANINFO:
+                        package_reference = PackageReference(reference, tokens[5])
+                        self._index_package(cursor, package_reference)
+            self._db.connection.commit()
+
+    def _index_recipe(self, cursor, reference):
+        cursor.execute("insert or ignore into %s (reference) values (?)" % RECIPES_TABLE,
+                       (str(reference), ))
+
+    def _index_packages(self, cursor, reference):
+        self._remove_packages(cursor, reference)
+        infos = DiskSearchManager._get_local_infos_min(self, reference)
+        for package_id, info in infos.items():
+            self._insert_package(cursor, reference, package_id, info)
+
+    def _index_package(self, cursor, package_reference):
+        reference, package_id = package_reference.conan, package_reference.package_id
+        self._remove_packages(cursor, reference, package_id)
+        info_path = os.path.join(self._paths.package(package_reference, short_paths=None),
+                                 CONANINFO)
+        if not os.path.exists(info_path):
+            return
+        try:
+            info = ConanInfo.loads(load(info_path)).serialize_min()
+        except Exception as exc:
+            logger.error("Package %s has an invalid ConanInfo file: %s"
+                         % (str(package_reference), str(exc)))
+            return
+        self._insert_package(cursor, reference, package_id, info)
+
+    @staticmethod
+    def _insert_package(cursor, reference, package_id, info):
+        cursor.execute("insert into %s (reference, package_id, info) values (?, ?, ?)"
+                       % PACKAGES_TABLE, (str(reference), package_id, json.dumps(info)))
+        package = cursor.lastrowid
+        for kind in ("settings", "options"):
+            for name, value in info.get(kind, {}).items():
+                cursor.execute("insert into %s (package, kind, name, value) values (?, ?, ?, ?)"
+                               % PROPERTIES_TABLE, (package, kind, name, value))
+
+    @staticmethod
+    def _remove_packages(cursor, reference, package_id=None):
+        condition, params = "reference=?", (str(reference), )
+        if package_id is not None:
+            condition, params = "reference=? and package_id=?", (str(reference), package_id)
+        cursor.execute("delete from %s where package in (select id from %s where %s)"
+                       % (PROPERTIES_TABLE, PACKAGES_TABLE, condition), params)
+        cursor.execute("delete from %s where %s" % (PACKAGES_TABLE, condition), params)
+
+    def search_recipes(self, pattern=None, ignorecase=True):
+        with self._lock:
+            cursor = self._cursor()
+            cursor.execute("select reference from %s" % RECIPES_TABLE)
+            references = [ConanFileReference.loads(row[0]) for row in cursor.fetchall()]
+        if pattern:
+            if isinstance(pattern, ConanFileReference):
+                pattern = str(pattern)
+            pattern = translate(pattern)
+            pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
+            references = [ref for ref in references if pattern.match(str(ref))]
+        return sorted(references)
+
+    def search_packages(self, reference, query):
+        try:
+            check_query(query)
+            condition, params = _postfix_to_sql(infix_to_postfix(query) if query else [])
+        except Exception as exc:
+            raise ConanException("Invalid package query: %s. %s" % (query, exc))
+        with self._lock:
+            cursor = self._cursor()
+            cursor.execute("select package_id, info from %s where reference=? and (%s)"
+                           % (PACKAGES_TABLE, condition), (str(reference), ) + params)
+            return {package_id: json.loads(info) for package_id, info in cursor.fetchall()}
+
+
+def _postfix_to_sql(postfix):
+    """ Translates a postfix query to a SQL condition over the packages table and its params.
+    As in evaluate(), a setting or option not defined in the package satisfies the expression
+    """
+    def expression_sql(expression):
+        name, value = expression.split("=", 1)
+        value = value.replace("\"", "")
+        kind = "settings" if is_setting(name) else "options"
+        return ("not exists (select 1 from %s where package=%s.id and kind=? and name=? and "
+                "value!=?)" % (PROPERTIES_TABLE, PACKAGES_TABLE), (kind, name, value))
+
+    if not postfix:
+        return "1", ()
+
+    stack = []
+    for el in postfix:
+        if not is_operator(el):
+            stack.append(expression_sql(el))
+        else:
+            sql1, params1 = stack.pop()
+            sql2, params2 = stack.pop()
+            operator = "or" if el == "|" else "and"
+            stack.append(("(%s %s %s)" % (sql2, operator, sql1), params2 + params1))
+    if len(stack) != 1:
+        raise Exception("Bad stack: %s" % str(stack))
+    return stack[0]
@@ -24,14 +24,25 @@ def filter_outdated(packages_infos, recipe_hash):
     return result
 
 
+def check_query(query):
+    if query is None:
+        return
+    if "!" in query:
+        raise ConanException("'!' character is not allowed")
+    if " not " in query or query.startswith("not "):
+        raise ConanException("'not' operator is not allowed")
+
+
+def is_setting(prop_name):
+    """ The query properties are settings or options """
+    return prop_name in ["os", "compiler", "arch", "build_type"] or prop_name.startswith("compiler.")
+
+
 def filter_packages(query, package_infos):
     if query is None:
         return package_infos
     try:
-        if "!" in query:
-            raise ConanException("'!' character is not allowed")
-        if " not " in query or query.startswith("not "):
-            raise ConanException("'not' operator is not allowed")
+        check_query(query)
         postfix = infix_to_postfix(query) if query else []
         result = {}
         for package_id, info in package_infos.items():
@@ -67,7 +78,7 @@ def evaluate(prop_name, prop_value, conan_vars_info):
     info_settings = conan_vars_info.get("settings", [])
     info_options = conan_vars_info.get("options", [])
 
-    if prop_name in ["os", "compiler", "arch", "build_type"] or prop_name.startswith("compiler."):
+    if is_setting(prop_name):
         return compatible_prop(info_settings.get(prop_name, None), prop_value)
     else:
         return compatible_prop(info_options.get(prop_name, None), prop_value)
@@ -81,6 +92,12 @@ class DiskSearchManager(object):
     def __init__(self, paths):
         self._paths = paths
 
+    def store_changed(self, path):
+        """ Notification of a file or folder of the store uploaded or removed. Nothing to do,
+        the store is always searched
+        """
+        pass
+
     def search_recipes(self, pattern=None, ignorecase=True):
         # Conan references in main storage
         if pattern:
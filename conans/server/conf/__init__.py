@@ -15,6 +15,7 @@ from six.moves.configparser import ConfigParser, NoSectionError
 from conans.paths import SimplePaths, conan_expand_user
 from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.server.store.file_manager import FileManager
+from conans.server.store.proxy_file_manager import ProxyFileManager, Upstream
 from conans.util.log import logger
 from conans.server.conf.default_server_conf import default_server_conf
 
@@ -45,6 +46,14 @@ class ConanServerConfigParser(ConfigParser):
                            "public_port": get_env("CONAN_SERVER_PUBLIC_PORT", None, environment),
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
+                           "search_catalog": get_env("CONAN_SEARCH_CATALOG", None, environment),
+                           "server_mode": get_env("CONAN_SERVER_MODE", None, environment),
+                           "workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "xz_archives": get_env("CONAN_XZ_ARCHIVES", None, environment),
+                           "upstream_url": get_env("CONAN_UPSTREAM_URL", None, environment),
+                           "upstream_user": get_env("CONAN_UPSTREAM_USER", None, environment),
+                           "upstream_password": get_env("CONAN_UPSTREAM_PASSWORD", None,
+                                                        environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -149,6 +158,67 @@ class ConanServerConfigParser(ConfigParser):
         else:
             return self._get_file_conf("write_permissions")
 
+    @property
+    def server_mode(self):
+        """ wsgiref (default, one request at a time), threaded or prefork """
+        try:
+            return self._get_conf_server_string("server_mode").lower()
+        except ConanException:
+            return "wsgiref"
+
+    @property
+    def workers(self):
+        try:
+            return int(self._get_conf_server_string("workers"))
+        except ConanException:
+            return 10
+
+    @property
+    def search_catalog(self):
+        """ Search with a SQLite catalog of the store instead of walking it """
+        try:
+            search_catalog = self._get_conf_server_string("search_catalog").lower()
+            return search_catalog == "true" or search_catalog == "1"
+        except ConanException:
+            return False
+
+    @property
+    def xz_archives(self):
+        """ All the clients of this server can read xz compressed archives, it is declared to them
+        with the xz_archives capability
+        """
+        try:
+            xz_archives = self._get_conf_server_string("xz_archives").lower()
+            return xz_archives == "true" or xz_archives == "1"
+        except ConanException:
+            return False
+
+    @property
+    def search_catalog_path(self):
+        return os.path.join(self.conan_folder, "search_catalog.db")
+
+    @property
+    def upstream_url(self):
+        """ Remote of the recipes and packages not in the store, if it works as a cache """
+        try:
+            return self._get_conf_server_string("upstream_url")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_user(self):
+        try:
+            return self._get_conf_server_string("upstream_user")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_password(self):
+        try:
+            return self._get_conf_server_string("upstream_password")
+        except ConanException:
+            return None
+
     @property
     def custom_authenticator(self):
         try:
@@ -217,7 +287,8 @@ class ConanServerConfigParser(ConfigParser):
         return timedelta(minutes=float(self._get_conf_server_string("jwt_expire_minutes")))
 
 
-def get_file_manager(config, public_url=None, updown_auth_manager=None):
+def get_file_manager(config, public_url=None, updown_auth_manager=None, search_manager=None,
+                     upstream=None):
     store_adapter = config.store_adapter
     if store_adapter == "disk":
         public_url = public_url or config.public_url
@@ -226,6 +297,11 @@ def get_file_manager(config, public_url=None, updown_auth_manager=None):
             raise Exception("Updown auth manager needed for disk controller (not s3)")
         adapter = ServerDiskAdapter(disk_controller_url, config.disk_storage_path, updown_auth_manager)
         paths = SimplePaths(config.disk_storage_path)
+        if upstream is None and config.upstream_url:
+            upstream = Upstream(config.upstream_url, config.upstream_user,
+                                config.upstream_password)
+        if upstream:
+            return ProxyFileManager(paths, adapter, upstream, search_manager)
     else:
         # Want to develop new adapter? create a subclass of
         # conans.server.store.file_manager.ServerStorageAdapter and implement the abstract methods
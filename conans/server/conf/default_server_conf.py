@@ -22,6 +22,25 @@ disk_storage_path: ~/.conan_server/data
 disk_authorize_timeout: 1800
 updown_secret: {updown_secret}
 
+# Serve the requests one at a time (wsgiref), with a pool of threads (threaded) or with
+# forked worker processes (prefork, not in Windows). workers is the threads or processes number
+# server_mode: wsgiref
+# workers: 10
+
+# Use a SQLite catalog of the store for the searches (recommended for big stores)
+# search_catalog: False
+
+# Allow the clients to upload xz compressed packages (compression_format = xz in conan.conf).
+# Enable it only if all the clients can read them: conan >= 1.4 running in python 3
+# xz_archives: False
+
+# Work as a read-through cache of other remote: the recipes and packages not in the store are
+# retrieved from upstream_url the first time they are requested. The searches are only of
+# the store. Without upstream_user the upstream is accessed anonymously
+# upstream_url: https://conan.example.com
+# upstream_user:
+# upstream_password:
+
 # Check docs.conan.io to implement a different authenticator plugin for conan_server
 # if custom_authenticator is not specified, [users] section will be used to authenticate
 # the users.
@@ -7,6 +7,8 @@ from conans.server.rest.controllers.conan_controller import ConanController
 from conans.server.rest.controllers.users_controller import UsersController
 from conans.server.rest.controllers.file_upload_download_controller import FileUploadDownloadController
 from conans.server.rest.bottle_plugins.version_checker import VersionCheckerPlugin
+from conans.server.rest.bottle_plugins.etag import ETagPlugin
+from conans.server.rest.bottle_plugins.metrics import MetricsPlugin, ServerMetrics
 
 
 class ApiV1(Bottle):
@@ -20,6 +22,7 @@ class ApiV1(Bottle):
         self.server_version = server_version
         self.min_client_compatible_version = min_client_compatible_version
         self.server_capabilities = server_capabilities
+        self.metrics = ServerMetrics()
         Bottle.__init__(self, *argc, **argv)
 
     def setup(self):
@@ -33,6 +36,9 @@ class ApiV1(Bottle):
             FileUploadDownloadController("/files").attach_to(self)
 
     def install_plugins(self):
+        # Count all the requests, first to include the errors of the other plugins
+        self.install(MetricsPlugin(self.metrics))
+
         # Check client version
         self.install(VersionCheckerPlugin(self.server_version,
                                           self.min_client_compatible_version,
@@ -41,6 +47,9 @@ class ApiV1(Bottle):
         # Second, check Http Basic Auth
         self.install(HttpBasicAuthentication())
 
+        # Allow the clients to revalidate their cached json responses
+        self.install(ETagPlugin())
+
         # Map exceptions to http return codes
         self.install(ReturnHandlerPlugin(EXCEPTION_CODE_MAPPING))
 
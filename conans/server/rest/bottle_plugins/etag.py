@@ -0,0 +1,35 @@
+import hashlib
+import json
+
+from bottle import request, response, HTTPResponse
+
+
+class ETagPlugin(object):
+    ''' The ETagPlugin adds an ETag header to the json (dict) responses of GET requests,
+        and returns a 304 Not Modified if the client already has it (If-None-Match)'''
+
+    name = 'ETagPlugin'
+    api = 2
+
+    def setup(self, app):
+        ''' Make sure that other installed plugins don't affect the same
+            keyword argument.'''
+        for other in app.plugins:
+            if not isinstance(other, ETagPlugin):
+                continue
+
+    def apply(self, callback, _):
+        '''Apply plugin'''
+        def wrapper(*args, **kwargs):
+            ret = callback(*args, **kwargs)  # kwargs has :xxx variables from url
+            if request.method != "GET" or not isinstance(ret, dict):
+                return ret
+            contents = json.dumps(ret, sort_keys=True).encode("utf-8")
+            etag = '"%s"' % hashlib.md5(contents).hexdigest()
+            if request.headers.get("If-None-Match") == etag:
+                not_modified = HTTPResponse(status=304)
+                not_modified.set_header("ETag", etag)
+                return not_modified
+            response.set_header("ETag", etag)
+            return ret
+        return wrapper
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import defaultdict
+
+from bottle import response, HTTPResponse
+
+
+class ServerMetrics(object):
+    """ Counters of the requests served by this server process """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._requests = defaultdict(int)  # (method, status): count
+        self._duration = 0.0
+        self._in_progress = 0
+
+    def request_started(self):
+        with self._lock:
+            self._in_progress += 1
+
+    def request_finished(self, method, status, duration):
+        with self._lock:
+            self._in_progress -= 1
+            self._requests[(method, status)] += 1
+            self._duration += duration
+
+    def prometheus(self):
+        """ The metrics in the Prometheus text format """
+        with self._lock:
+            lines = ["# TYPE conan_server_requests_total counter"]
+            for (method, status), count in sorted(self._requests.items()):
+                lines.append('conan_server_requests_total{method="%s",status="%s"} %d'
+                             % (method, status, count))
+            lines.extend(["# TYPE conan_server_request_duration_seconds_sum counter",
+                          "conan_server_request_duration_seconds_sum %f" % self._duration,
+                          "# TYPE conan_server_requests_in_progress gauge",
+                          "conan_server_requests_in_progress %d" % self._in_progress,
+                          "# TYPE conan_server_uptime_seconds gauge",
+                          "conan_server_uptime_seconds %f" % (time.time() - self._start)])
+        return "\n".join(lines) + "\n"
+
+
+class MetricsPlugin(object):
+    ''' The MetricsPlugin counts the requests, their status and duration'''
+
+    name = 'MetricsPlugin'
+    api = 2
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def setup(self, app):
+        ''' Make sure that other installed plugins don't affect the same
+            keyword argument.'''
+        for other in app.plugins:
+            if not isinstance(other, MetricsPlugin):
+                continue
+
+    def apply(self, callback, route):
+        '''Apply plugin'''
+        def wrapper(*args, **kwargs):
+            t1 = time.time()
+            self.metrics.request_started()
+            status = 500
+            try:
+                ret = callback(*args, **kwargs)  # kwargs has :xxx variables from url
+                status = ret.status_code if isinstance(ret, HTTPResponse) else response.status_code
+                return ret
+            except HTTPResponse as resp:
+                status = resp.status_code
+                raise
+            finally:
+                self.metrics.request_finished(route.method, status, time.time() - t1)
+        return wrapper
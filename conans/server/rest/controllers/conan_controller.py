@@ -2,7 +2,7 @@ from conans.server.rest.controllers.controller import Controller
 from bottle import request
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.service.service import ConanService, SearchService
-from conans.errors import NotFoundException
+from conans.errors import NotFoundException, ConanException, RequestErrorException
 import json
 from conans.paths import CONAN_MANIFEST
 import os
@@ -127,6 +127,24 @@ class ConanController(Controller):
             urls_norm = {filename.replace("\\", "/"): url for filename, url in urls.items()}
             return urls_norm
 
+        @app.route('%s/batch_info' % self.route, method=["POST"])
+        def get_batch_info(auth_user):
+            """
+            Get the manifests of many recipes, and the manifests and conaninfo of many packages
+            """
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            reader = codecs.getreader("utf-8")
+            payload = json.load(reader(request.body))
+            try:
+                references = [ConanFileReference.loads(ref) for ref in payload.get("recipes", [])]
+                package_references = [PackageReference.loads(ref)
+                                      for ref in payload.get("packages", [])]
+            except ConanException as e:
+                raise RequestErrorException(str(e))
+            info = conan_service.get_batch_info(references, package_references)
+            return {kind: {str(ref): files for ref, files in contents.items()}
+                    for kind, contents in info.items()}
+
         @app.route('%s/search' % self.route, method=["GET"])
         def search(auth_user):
             pattern = request.params.get("q", None)
@@ -151,6 +169,7 @@ class ConanController(Controller):
             conan_reference = ConanFileReference(conanname, version, username, channel)
             conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
             conan_service.remove_conanfile(conan_reference)
+            app.search_manager.store_changed(app.file_manager.paths.conan(conan_reference))
 
         @app.route('%s/packages/delete' % conan_route, method="POST")
         def remove_packages(conanname, version, username, channel, auth_user):
@@ -160,6 +179,7 @@ class ConanController(Controller):
             reader = codecs.getreader("utf-8")
             payload = json.load(reader(request.body))
             conan_service.remove_packages(conan_reference, payload["package_ids"])
+            app.search_manager.store_changed(app.file_manager.paths.packages(conan_reference))
 
         @app.route('%s/remove_files' % conan_route, method="POST")
         def remove_conanfile_files(conanname, version, username, channel, auth_user):
@@ -170,6 +190,7 @@ class ConanController(Controller):
             payload = json.load(reader(request.body))
             files = [os.path.normpath(filename) for filename in payload["files"]]
             conan_service.remove_conanfile_files(conan_reference, files)
+            app.search_manager.store_changed(app.file_manager.paths.export(conan_reference))
 
         @app.route('%s/packages/:package_id/remove_files' % conan_route, method=["POST"])
         def remove_packages_files(conanname, version, username, channel, package_id, auth_user):
@@ -181,3 +202,4 @@ class ConanController(Controller):
             payload = json.load(reader(request.body))
             files = [os.path.normpath(filename) for filename in payload["files"]]
             conan_service.remove_package_files(package_reference, files)
+            app.search_manager.store_changed(app.file_manager.paths.package(package_reference))
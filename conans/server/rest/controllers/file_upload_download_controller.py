@@ -1,9 +1,10 @@
+from conans.errors import RequestErrorException
 from conans.server.rest.controllers.controller import Controller
-from bottle import request, static_file, FileUpload, cached_property
+from bottle import request, static_file
 from conans.server.service.service import FileUploadDownloadService
+from conans.util.files import mkdir
+import hashlib
 import os
-from unicodedata import normalize
-import six
 
 
 class FileUploadDownloadController(Controller):
@@ -21,6 +22,7 @@ class FileUploadDownloadController(Controller):
             file_path = service.get_file_path(filepath, token)
             # https://github.com/kennethreitz/requests/issues/1586
             mimetype = "x-gzip" if filepath.endswith(".tgz") else "auto"
+            # It also answers the Range requests of the clients resuming a download
             return static_file(os.path.basename(file_path),
                                root=os.path.dirname(file_path),
                                mimetype=mimetype)
@@ -28,33 +30,41 @@ class FileUploadDownloadController(Controller):
         @app.route(self.route + '/<filepath:path>', method=["PUT"])
         def put(filepath):
             token = request.query.get("signature", None)
-            file_saver = ConanFileUpload(request.body, None,
-                                         filename=os.path.basename(filepath),
-                                         headers=request.headers)
             abs_path = os.path.abspath(os.path.join(storage_path, os.path.normpath(filepath)))
-            # Body is a stringIO (generator)
-            service.put_file(file_saver, abs_path, token, request.content_length)
-
-
-class ConanFileUpload(FileUpload):
-    """Code copied from bottle but removing filename normalizing
-    FIXME: Review bottle.FileUpload and analyze possible security or general issues    """
-    @cached_property
-    def filename(self):
-        ''' Name of the file on the client file system, but normalized to ensure
-            file system compatibility. An empty filename is returned as 'empty'.
-
-            Only ASCII letters, digits, dashes, underscores and dots are
-            allowed in the final filename. Accents are removed, if possible.
-            Whitespace is replaced by a single dash. Leading or tailing dots
-            or dashes are removed. The filename is limited to 255 characters.
-        '''
-        fname = self.raw_filename
-        if six.PY2:
-            if not isinstance(fname, unicode):
-                fname = fname.decode('utf8', 'ignore')
-        fname = normalize('NFKD', fname).encode('ASCII', 'ignore').decode('ASCII')
-        fname = os.path.basename(fname.replace('\\', os.path.sep))
-#         fname = re.sub(r'[^a-zA-Z0-9-_.\s]', '', fname).strip()
-#         fname = re.sub(r'[-\s]+', '-', fname).strip('.-')
-        return fname[:255] or 'empty'
+            sha1 = request.headers.get("X-Checksum-Sha1", None)
+            if request.headers.get("X-Checksum-Deploy", None) == "true":
+                # Only the checksum is sent, 404 if the server doesn't have that file
+                service.deploy_checksum(abs_path, token, sha1)
+            else:
+                # Read directly from the input, not buffering the whole body as request.body
+                file_saver = StreamFileSaver(request.environ["wsgi.input"],
+                                             request.content_length, os.path.basename(filepath))
+                service.put_file(file_saver, abs_path, token, request.content_length, sha1)
+            app.search_manager.store_changed(abs_path)
+
+
+class StreamFileSaver(object):
+    """ Saves the body of an upload request reading it in big chunks, and computes its md5 and
+    sha1 while saving, so the uploaded file is not read again to index it
+    """
+    chunk_size = 1024 * 1024
+
+    def __init__(self, stream, size, filename):
+        self._stream = stream
+        self._size = size
+        self.filename = filename
+
+    def save(self, folder):
+        mkdir(folder)
+        md5, sha1 = hashlib.md5(), hashlib.sha1()
+        remaining = self._size
+        with open(os.path.join(folder, self.filename), "wb") as handle:
+            while remaining > 0:
+                data = self._stream.read(min(self.chunk_size, remaining))
+                if not data:
+                    raise RequestErrorException("Incomplete upload of %s" % self.filename)
+                handle.write(data)
+                md5.update(data)
+                sha1.update(data)
+                remaining -= len(data)
+        return {"md5": md5.hexdigest(), "sha1": sha1.hexdigest()}
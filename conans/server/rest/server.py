@@ -1,5 +1,6 @@
 import bottle
 from conans.server.rest.api_v1 import ApiV1
+from conans.server.rest.wsgi_servers import get_server_adapter
 from conans.model.version import Version
 
 
@@ -28,6 +29,8 @@ class ConanServer(object):
 
         self.root_app = bottle.Bottle()
         self.root_app.mount("/v1/", self.api_v1)
+        self.root_app.route("/health", "GET", self._health)
+        self.root_app.route("/metrics", "GET", self._metrics)
         self.run_port = run_port
         self.api_v1.search_manager = search_manager
         self.api_v1.authorizer = authorizer
@@ -36,9 +39,19 @@ class ConanServer(object):
 
         self.api_v1.setup()
 
+    def _health(self):
+        return {"status": "ok", "version": str(self.api_v1.server_version)}
+
+    def _metrics(self):
+        bottle.response.content_type = "text/plain; version=0.0.4"
+        return self.api_v1.metrics.prometheus()
+
     def run(self, **kwargs):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
+        server_mode = kwargs.pop("server_mode", None)
+        workers = kwargs.pop("workers", 1)
+        server = get_server_adapter(server_mode, host, port, workers) or "wsgiref"
+        bottle.Bottle.run(self.root_app, server=server, host=host,
                           port=port, debug=debug_set, reloader=False)
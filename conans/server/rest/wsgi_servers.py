@@ -0,0 +1,206 @@
+""" Production serving modes for conan_server, selected with 'server_mode' in server.conf:
+
+    wsgiref: the bottle default single threaded server, one request at a time
+    threaded: a pool of 'workers' threads serving the requests
+    prefork: 'workers' forked processes accepting from the same socket (not in Windows)
+
+Both threaded and prefork send the downloaded files with os.sendfile() when available,
+without copying them through python.
+"""
+import errno
+import os
+import signal
+import time
+from multiprocessing.pool import ThreadPool
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, ServerHandler, make_server
+
+import bottle
+
+from conans.errors import ConanException
+from conans.util.log import logger
+
+SERVER_MODES = ("wsgiref", "threaded", "prefork")
+
+
+class _SendfileHandler(ServerHandler):
+    """ Transmits the files (static_file() responses) with the sendfile system call """
+
+    def sendfile(self):
+        connection = getattr(self.request_handler, "connection", None)
+        try:
+            file_fd = self.result.filelike.fileno()
+            offset = self.result.filelike.tell()
+        except (AttributeError, IOError, OSError):
+            return False
+        if not hasattr(os, "sendfile") or connection is None:
+            return False
+
+        if not self.headers_sent:
+            self.send_headers()
+        self._flush()
+        socket_fd = connection.fileno()
+        remaining = os.fstat(file_fd).st_size - offset
+        while remaining > 0:
+            sent = os.sendfile(socket_fd, file_fd, offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+            self.bytes_sent += sent
+        self.result.filelike.close()
+        return True
+
+
+class _RequestHandler(WSGIRequestHandler):
+
+    def handle(self):
+        """ Same as WSGIRequestHandler.handle() with the _SendfileHandler """
+        self.raw_requestline = self.rfile.readline(65537)
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            return
+
+        if not self.parse_request():  # An error code has been sent, just exit
+            return
+
+        handler = _SendfileHandler(self.rfile, self.wfile, self.get_stderr(), self.get_environ())
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+
+class _ThreadPoolWSGIServer(WSGIServer):
+    """ Serves every request in a thread of a fixed size pool """
+    workers = 1
+    _pool = None
+
+    def process_request(self, request, client_address):
+        if self._pool is None:
+            self._pool = ThreadPool(self.workers)
+        self._pool.apply_async(self._process_request_thread, (request, client_address))
+
+    def server_close(self):
+        WSGIServer.server_close(self)
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class ThreadedServer(bottle.ServerAdapter):
+
+    def __init__(self, host='127.0.0.1', port=9300, workers=10, **options):
+        super(ThreadedServer, self).__init__(host=host, port=port, **options)
+        self.workers = workers
+
+    def _make_server(self, app, server_class):
+        server = make_server(self.host, self.port, app, server_class, _RequestHandler)
+        server.workers = self.workers
+        return server
+
+    def run(self, app):
+        server = self._make_server(app, _ThreadPoolWSGIServer)
+        server.serve_forever()
+
+
+class _StopServer(Exception):
+    pass
+
+
+class PreforkServer(ThreadedServer):
+    """ The parent process keeps 'workers' forked processes serving the requests, restarting the
+    ones that exit. SIGTERM and SIGINT are forwarded to the workers
+    """
+    restart_delay = 1  # seconds before restarting the workers that crashed on start
+
+    def run(self, app):
+        if not hasattr(os, "fork"):
+            raise ConanException("The 'prefork' server mode is not available in this platform")
+        server = self._make_server(app, WSGIServer)
+        try:
+            self._serve(server)
+        finally:
+            server.server_close()
+
+    def _fork_worker(self, server):
+        pid = os.fork()
+        if pid == 0:  # The worker process, until it is terminated
+            status = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                server.serve_forever()
+                status = 0
+            finally:
+                os._exit(status)
+        return pid
+
+    def _serve(self, server):
+        children = {}  # pid: start time
+        state = {"stop": False, "waiting": False}
+
+        def stop(signum, _):
+            state["stop"] = True
+            if state["waiting"]:  # Never interrupts a fork, the new worker would be lost
+                raise _StopServer(signum)
+
+        previous_handlers = {signum: signal.signal(signum, stop)
+                             for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            while not state["stop"]:
+                while len(children) < self.workers and not state["stop"]:
+                    children[self._fork_worker(server)] = time.time()
+                try:
+                    state["waiting"] = True
+                    if state["stop"]:
+                        break
+                    pid, status = os.wait()
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        raise
+                    continue
+                finally:
+                    state["waiting"] = False
+                started = children.pop(pid, None)
+                if started is None:
+                    continue
+                logger.error("conan_server worker %d exited with status %d, restarting it"
+                             % (pid, status))
+                if time.time() - started < self.restart_delay:  # Don't spin if it crashes
+                    time.sleep(self.restart_delay)
+        except _StopServer:
+            pass
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:  # Already finished
+                    pass
+            for pid in children:
+                try:
+                    os.waitpid(pid, 0)
+                except OSError:
+                    pass
+
+
+def get_server_adapter(server_mode, host, port, workers):
+    """ returns the bottle server adapter for the mode, None for the bottle default one """
+    if server_mode in (None, "wsgiref"):
+        return None
+    if server_mode not in SERVER_MODES:
+        raise ConanException("Invalid server_mode '%s', use one of: %s"
+                             % (server_mode, ", ".join(SERVER_MODES)))
+    logger.debug("Server mode: %s, %d workers" % (server_mode, workers))
+    adapter_class = ThreadedServer if server_mode == "threaded" else PreforkServer
+    return adapter_class(host=host, port=port, workers=workers)
@@ -12,7 +12,8 @@ from conans.server.migrate import migrate_and_get_server_config
 from conans import __version__ as SERVER_VERSION
 from conans.paths import conan_expand_user, SimplePaths
 from conans.search.search import DiskSearchManager
-from conans import SERVER_CAPABILITIES
+from conans.search.catalog import CatalogSearchManager
+from conans import SERVER_CAPABILITIES, XZ_ARCHIVES_CAPABILITY
 
 
 class ServerLauncher(object):
@@ -35,18 +36,28 @@ class ServerLauncher(object):
         updown_auth_manager = JWTUpDownAuthManager(server_config.updown_secret,
                                                    server_config.authorize_timeout)
 
-        file_manager = get_file_manager(server_config, updown_auth_manager=updown_auth_manager)
+        if server_config.search_catalog:
+            search_manager = CatalogSearchManager(SimplePaths(server_config.disk_storage_path),
+                                                  server_config.search_catalog_path)
+        else:
+            search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path))
+
+        file_manager = get_file_manager(server_config, updown_auth_manager=updown_auth_manager,
+                                        search_manager=search_manager)
 
-        search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path))
+        self.server_mode = server_config.server_mode
+        self.workers = server_config.workers
 
-        server_capabilities = SERVER_CAPABILITIES
+        server_capabilities = list(SERVER_CAPABILITIES)
+        if server_config.xz_archives:
+            server_capabilities.append(XZ_ARCHIVES_CAPABILITY)
         self.ra = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
                               authorizer, authenticator, file_manager, search_manager,
                               Version(SERVER_VERSION), Version(MIN_CLIENT_COMPATIBLE_VERSION),
                               server_capabilities)
 
     def launch(self):
-        self.ra.run(host="0.0.0.0")
+        self.ra.run(host="0.0.0.0", server_mode=self.server_mode, workers=self.workers)
 
 
 launcher = ServerLauncher()
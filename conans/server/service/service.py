@@ -1,11 +1,19 @@
-from conans.errors import RequestErrorException, NotFoundException, ForbiddenException
+from conans.errors import RequestErrorException, NotFoundException, ForbiddenException, \
+    AuthenticationException
+from conans.paths import CONAN_MANIFEST, CONANINFO
 from conans.server.store.file_manager import FileManager
+from conans.server.store.checksum_index import ChecksumIndex, file_checksums
 import os
+import platform
+import shutil
+import uuid
 import jwt
-from conans.util.files import mkdir
+from conans.util.files import mkdir, rmdir
 from conans.model.ref import PackageReference
 from conans.util.log import logger
 
+UPLOADS_FOLDER = ".uploads"
+
 
 class FileUploadDownloadService(object):
     """Handles authorization from token and upload and download files"""
@@ -13,6 +21,7 @@ class FileUploadDownloadService(object):
     def __init__(self, updown_auth_manager, base_store_folder):
         self.updown_auth_manager = updown_auth_manager
         self.base_store_folder = base_store_folder
+        self._checksum_index = ChecksumIndex(base_store_folder)
 
     def get_file_path(self, filepath, token):
         try:
@@ -26,28 +35,79 @@ class FileUploadDownloadService(object):
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
 
-    def put_file(self, file_saver, abs_filepath, token, upload_size):
+    def put_file(self, file_saver, abs_filepath, token, upload_size, sha1=None):
+        """
+        file_saver is an object with the save(folder) method, returning the md5 and sha1 of the
+        saved file, or None. sha1: the checksum declared by the client, if any.
+        The file is saved in a temporary folder and then moved into place, so an interrupted
+        upload never leaves a truncated file in the store
         """
-        file_saver is an object with the save() method without parameters
+        filesize = self._check_put(abs_filepath, token)
+        if upload_size != filesize:
+            logger.debug("Invalid size file!!: %s" % abs_filepath)
+            raise RequestErrorException("Bad file size")
+
+        tmp_folder = self._tmp_folder(abs_filepath)
+        try:
+            checksums = file_saver.save(tmp_folder)
+            tmp_filepath = os.path.join(tmp_folder, os.path.basename(abs_filepath))
+            checksums = checksums or file_checksums(tmp_filepath)
+            if sha1 and sha1 != checksums["sha1"]:
+                logger.debug("Invalid checksum file!!: %s" % abs_filepath)
+                raise RequestErrorException("Bad file checksum")
+            self._move(tmp_filepath, abs_filepath)
+        finally:
+            rmdir(tmp_folder)
+        # Indexed now with the checksums computed while saving, not in every snapshot request
+        self._checksum_index.update(abs_filepath, checksums)
+
+    def deploy_checksum(self, abs_filepath, token, sha1):
+        """ Puts in abs_filepath a file of the store with the same sha1 (X-Checksum-Deploy
+        requests), so the client doesn't upload it again. If there is none raises
+        NotFoundException, and the client uploads the file
         """
+        filesize = self._check_put(abs_filepath, token)
+        existing, checksums = self._checksum_index.find(abs_filepath, sha1)
+        if not existing or os.path.getsize(existing) != filesize:
+            raise NotFoundException("File with checksum %s not found" % sha1)
+        if existing != abs_filepath:
+            tmp_folder = self._tmp_folder(abs_filepath)
+            try:
+                tmp_filepath = os.path.join(tmp_folder, os.path.basename(abs_filepath))
+                mkdir(tmp_folder)
+                shutil.copyfile(existing, tmp_filepath)
+                self._move(tmp_filepath, abs_filepath)
+            finally:
+                rmdir(tmp_folder)
+        logger.debug("Deployed file by checksum: %s: %s" % (abs_filepath, sha1))
+        self._checksum_index.update(abs_filepath, checksums)
+
+    def _check_put(self, abs_filepath, token):
+        """ Checks the upload token and path, returns the declared size of the file """
         try:
             encoded_path, filesize, user = self.updown_auth_manager.get_resource_info(token)
-            # Check size
-            if upload_size != filesize:
-                logger.debug("Invalid size file!!: %s: %s" % (user, abs_filepath))
-                raise RequestErrorException("Bad file size")
-
-            abs_encoded_path = os.path.abspath(os.path.join(self.base_store_folder, encoded_path))
-            if not self._valid_path(abs_filepath, abs_encoded_path):
-                raise NotFoundException("File not found")
-            logger.debug("Put file: %s: %s" % (user, abs_filepath))
-            mkdir(os.path.dirname(abs_filepath))
-            if os.path.exists(abs_filepath):
-                os.remove(abs_filepath)
-            file_saver.save(os.path.dirname(abs_filepath))
-
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
+        abs_encoded_path = os.path.abspath(os.path.join(self.base_store_folder, encoded_path))
+        if not self._valid_path(abs_filepath, abs_encoded_path):
+            raise NotFoundException("File not found")
+        logger.debug("Put file: %s: %s" % (user, abs_filepath))
+        return filesize
+
+    def _tmp_folder(self, abs_filepath):
+        """ In the folder of the reference (name/version/user/channel), out of the export and
+        package folders, and moved into place with a rename in the same filesystem
+        """
+        tokens = os.path.relpath(abs_filepath, self.base_store_folder).split(os.sep)
+        folder = os.path.join(self.base_store_folder, *tokens[:min(4, len(tokens) - 1)])
+        return os.path.join(folder, UPLOADS_FOLDER, uuid.uuid4().hex)
+
+    @staticmethod
+    def _move(tmp_filepath, abs_filepath):
+        mkdir(os.path.dirname(abs_filepath))
+        if platform.system() == "Windows" and os.path.exists(abs_filepath):
+            os.remove(abs_filepath)  # rename() doesn't replace files in Windows
+        os.rename(tmp_filepath, abs_filepath)
 
     def _valid_path(self, filepath, encoded_path):
         if encoded_path == filepath:
@@ -169,6 +229,33 @@ class ConanService(object):
                                                             files_subset=files_subset)
         return urls
 
+    def get_batch_info(self, references, package_references):
+        """Gets at once the manifest of the recipes and the manifest and conaninfo of the
+        packages:
+            {"recipes": {reference: {filename: contents}},
+             "packages": {package_reference: {filename: contents}}}
+        The not found ones are None and the ones the user can't read are not returned
+        """
+        recipes = {}
+        for reference in references:
+            try:
+                self._authorizer.check_read_conan(self._auth_user, reference)
+            except (ForbiddenException, AuthenticationException):
+                continue
+            files = self._file_manager.get_conanfile_files(reference, [CONAN_MANIFEST])
+            recipes[reference] = files or None
+
+        packages = {}
+        for package_reference in package_references:
+            try:
+                self._authorizer.check_read_package(self._auth_user, package_reference)
+            except (ForbiddenException, AuthenticationException):
+                continue
+            files = self._file_manager.get_package_files(package_reference,
+                                                         [CONANINFO, CONAN_MANIFEST])
+            packages[package_reference] = files or None
+        return {"recipes": recipes, "packages": packages}
+
     def get_package_upload_urls(self, package_reference, filesizes):
         """
         :param package_reference: PackageReference
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import platform
+import threading
+import uuid
+from contextlib import contextmanager
+
+from conans.util.files import load, save, rmdir
+from conans.util.locks import SimpleLock
+from conans.util.log import logger
+
+CHECKSUMS_FOLDER = ".checksums"
+_INDEX_EXTENSION = ".json"
+# The file locks are per process, the threads of the same process also need these
+# Striped, the same index always gets the same lock
+_THREAD_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def file_checksums(file_path):
+    """ md5 and sha1 of a file, reading it only once """
+    md5, sha1 = hashlib.md5(), hashlib.sha1()
+    with open(file_path, 'rb') as handle:
+        while True:
+            data = handle.read(65536)
+            if not data:
+                break
+            md5.update(data)
+            sha1.update(data)
+    return {"md5": md5.hexdigest(), "sha1": sha1.hexdigest()}
+
+
+class ChecksumIndex(object):
+    """ Persistent md5 and sha1 of the files of the exports and packages of the store, so they
+    are not hashed on every snapshot request. There is a sidecar json file for every export and
+    package folder, in the .checksums folder of its reference:
+
+        <store>/name/version/user/channel/.checksums/export.json
+        <store>/name/version/user/channel/.checksums/package/<package_id>.json
+
+    The entries also keep the size and mtime of the files, a file modified without updating the
+    index is hashed again. The files of a package are uploaded concurrently, the modifications
+    of an index are done holding its lock, and written to a temporary file renamed when complete,
+    so the readers never see a partial index.
+    """
+
+    def __init__(self, store_folder):
+        self._store_folder = store_folder
+
+    def _index_path(self, path):
+        """ returns the index file of the export or package folder containing path and the path
+        relative to that folder, or (None, None) if the path is not inside one of them
+        """
+        tokens = os.path.relpath(path, self._store_folder).replace("\\", "/").split("/")
+        if len(tokens) > 5 and tokens[4] == "package":  # name/version/user/channel/package/id
+            folder_tokens = tokens[:6]
+        elif len(tokens) > 4 and tokens[4] == "export":
+            folder_tokens = tokens[:5]
+        else:
+            return None, None
+        index_path = os.path.join(self._store_folder, *(folder_tokens[:4] + [CHECKSUMS_FOLDER] +
+                                                        folder_tokens[4:]))
+        return index_path + _INDEX_EXTENSION, "/".join(tokens[len(folder_tokens):])
+
+    @staticmethod
+    def _load(index_path):
+        if not os.path.exists(index_path):
+            return {}
+        try:
+            return json.loads(load(index_path))
+        except Exception as e:  # Corrupted or concurrently written, it will be computed again
+            logger.error("Invalid checksums index %s: %s" % (index_path, str(e)))
+            return {}
+
+    @staticmethod
+    @contextmanager
+    def _locked(index_path):
+        with _THREAD_LOCKS[hash(index_path) % len(_THREAD_LOCKS)]:
+            with SimpleLock(index_path + ".lock"):
+                yield
+
+    @staticmethod
+    def _save(index_path, index):
+        tmp_path = "%s.%s.tmp" % (index_path, uuid.uuid4().hex)
+        save(tmp_path, json.dumps(index))
+        if platform.system() == "Windows" and os.path.exists(index_path):
+            os.remove(index_path)  # rename() doesn't replace files in Windows
+        os.rename(tmp_path, index_path)
+
+    def get(self, folder, relative_paths):
+        """ returns {relative_path: {"md5": md5, "sha1": sha1}} of the files of the folder,
+        hashing (and indexing) only the new or modified ones
+        """
+        index_path, _ = self._index_path(folder)
+        index = self._load(index_path) if index_path else {}
+        result = {}
+        new_entries = {}
+        for relative_path in relative_paths:
+            key = relative_path.replace("\\", "/")
+            stat = os.stat(os.path.join(folder, relative_path))
+            entry = index.get(key)
+            if not entry or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+                entry = file_checksums(os.path.join(folder, relative_path))
+                entry.update({"size": stat.st_size, "mtime": stat.st_mtime})
+                new_entries[key] = entry
+            result[relative_path] = {"md5": entry["md5"], "sha1": entry["sha1"]}
+        if new_entries and index_path:
+            with self._locked(index_path):  # Loaded again, it might have changed meanwhile
+                index = self._load(index_path)
+                index.update(new_entries)
+                self._save(index_path, index)
+        return result
+
+    def update(self, file_path, checksums=None):
+        """ indexes a just uploaded file. checksums: already computed {"md5":.., "sha1":..} """
+        index_path, key = self._index_path(file_path)
+        if not index_path:
+            return
+        entry = dict(checksums or file_checksums(file_path))
+        stat = os.stat(file_path)
+        entry.update({"size": stat.st_size, "mtime": stat.st_mtime})
+        with self._locked(index_path):
+            index = self._load(index_path)
+            index[key] = entry
+            self._save(index_path, index)
+
+    def find(self, file_path, sha1):
+        """ returns (path, {"md5":.., "sha1":..}) of an indexed file of the same reference as
+        file_path with that sha1, not modified since indexed, or (None, None)
+        """
+        index_path, _ = self._index_path(file_path)
+        if not sha1 or not index_path:
+            return None, None
+        tokens = os.path.relpath(file_path, self._store_folder).replace("\\", "/").split("/")
+        reference_folder = os.path.join(self._store_folder, *tokens[:4])
+        checksums_folder = os.path.join(reference_folder, CHECKSUMS_FOLDER)
+        # The index of the file folder first, the most likely to have it
+        candidates = [index_path, os.path.join(checksums_folder, "export.json")]
+        packages_folder = os.path.join(checksums_folder, "package")
+        if os.path.isdir(packages_folder):
+            candidates.extend(os.path.join(packages_folder, name)
+                              for name in sorted(os.listdir(packages_folder))
+                              if name.endswith(_INDEX_EXTENSION))
+        for candidate in candidates:
+            folder = os.path.join(reference_folder,
+                                  os.path.relpath(candidate,
+                                                  checksums_folder)[:-len(_INDEX_EXTENSION)])
+            for key, entry in self._load(candidate).items():
+                if entry.get("sha1") != sha1:
+                    continue
+                path = os.path.join(folder, key)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                    return path, {"md5": entry["md5"], "sha1": entry["sha1"]}
+        return None, None
+
+    def invalidate(self, path):
+        """ removes the entries of a deleted file or folder """
+        index_path, key = self._index_path(path)
+        if not index_path:
+            # A whole reference or its packages folder
+            tokens = os.path.relpath(path, self._store_folder).replace("\\", "/").split("/")
+            if len(tokens) == 5 and tokens[4] == "package":
+                rmdir(os.path.join(self._store_folder, *(tokens[:4] + [CHECKSUMS_FOLDER,
+                                                                       "package"])))
+            return
+        with self._locked(index_path):
+            if not key:  # The export or package folder
+                if os.path.exists(index_path):
+                    os.remove(index_path)
+                return
+            index = self._load(index_path)
+            if index.pop(key, None) is not None:
+                self._save(index_path, index)
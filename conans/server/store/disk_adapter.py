@@ -2,9 +2,10 @@
 import os
 from abc import ABCMeta, abstractmethod
 from conans.errors import NotFoundException
-from conans.util.files import relative_dirs, rmdir, md5sum, decode_text
-from conans.util.files import path_exists
+from conans.util.files import relative_dirs, rmdir, decode_text
+from conans.util.files import path_exists, load
 from conans.paths import SimplePaths
+from conans.server.store.checksum_index import ChecksumIndex
 
 
 class ServerStorageAdapter(object):
@@ -22,6 +23,10 @@ class ServerStorageAdapter(object):
     def get_snapshot(self, absolute_path="", files_subset=None):
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_file(self, path):
+        raise NotImplementedError()
+
     @abstractmethod
     def delete_folder(self, path):
         raise NotImplementedError()
@@ -42,6 +47,7 @@ class ServerDiskAdapter(ServerStorageAdapter):
         # URLs are generated removing this base path
         self.updown_auth_manager = updown_auth_manager
         self._store_folder = base_storage_path
+        self._checksum_index = ChecksumIndex(base_storage_path)
 
     def get_download_urls(self, paths, user=None):
         '''Get the urls for download the specified files using s3 signed request.
@@ -85,20 +91,29 @@ class ServerDiskAdapter(ServerStorageAdapter):
         paths = relative_dirs(absolute_path)
         if files_subset is not None:
             paths = set(paths).intersection(set(files_subset))
-        abs_paths = [os.path.join(absolute_path, relpath) for relpath in paths]
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        checksums = self._checksum_index.get(absolute_path, paths)
+        return {os.path.join(absolute_path, relpath): file_checksums["md5"]
+                for relpath, file_checksums in checksums.items()}
+
+    def get_file(self, path):
+        """returns the contents of a (text) file. Path already contains base dir"""
+        if not path_exists(path, self._store_folder) or not os.path.isfile(path):
+            raise NotFoundException("")
+        return load(path)
 
     def delete_folder(self, path):
         '''Delete folder from disk. Path already contains base dir'''
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         rmdir(path)
+        self._checksum_index.invalidate(path)
 
     def delete_file(self, path):
         '''Delete files from bucket. Path already contains base dir'''
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         os.remove(path)
+        self._checksum_index.invalidate(path)
 
     def delete_empty_dirs(self, deleted_refs):
         paths = SimplePaths(self._store_folder)
@@ -1,4 +1,5 @@
 import os
+from conans.errors import NotFoundException
 from conans.paths import SimplePaths
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.store.disk_adapter import ServerStorageAdapter
@@ -32,6 +33,17 @@ class FileManager(object):
         path = self.paths.package(package_reference)
         return self._get_snapshot_of_files(path)
 
+    # ############ CONTENTS
+    def get_conanfile_files(self, reference, files):
+        """Returns a {filepath: contents} of the existing ones of the given files"""
+        assert isinstance(reference, ConanFileReference)
+        return self._get_files(self.paths.export(reference), files)
+
+    def get_package_files(self, package_reference, files):
+        """Returns a {filepath: contents} of the existing ones of the given files"""
+        assert isinstance(package_reference, PackageReference)
+        return self._get_files(self.paths.package(package_reference), files)
+
     # ############ DOWNLOAD URLS
     def get_download_conanfile_urls(self, reference, files_subset=None, user=None):
         """Returns a {filepath: url} """
@@ -102,6 +114,16 @@ class FileManager(object):
         snapshot = self._relativize_keys(snapshot, relative_path)
         return snapshot
 
+    def _get_files(self, relative_path, files):
+        ret = {}
+        for filepath in files:
+            try:
+                ret[filepath] = self._storage_adapter.get_file(os.path.join(relative_path,
+                                                                            filepath))
+            except NotFoundException:
+                pass
+        return ret
+
     def _get_download_urls(self, relative_path, files_subset=None, user=None):
         """Get the download urls for the whole relative_path or just
         for a subset of files. files_subset has to be a list with paths
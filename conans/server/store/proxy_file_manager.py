@@ -0,0 +1,167 @@
+import os
+import threading
+import uuid
+
+import requests
+
+from conans.client.rest.rest_client import RestApiClient
+from conans.errors import (AuthenticationException, InternalErrorException,
+                           NotFoundException)
+from conans.paths import CONAN_MANIFEST
+from conans.server.store.file_manager import FileManager
+from conans.util.files import mkdir, rmdir
+from conans.util.log import logger
+
+# Temporary folder, in the store, of the files being retrieved from the upstream
+FETCH_FOLDER = ".fetch"
+
+
+class Upstream(object):
+    """ The remote where a caching conan_server retrieves the recipes and packages that are not
+    in its store. The calls are anonymous if no user is configured
+    """
+
+    def __init__(self, url, user=None, password=None, requester=None, verify_ssl=True):
+        self.url = url
+        self._user = user
+        self._password = password
+        self._requester = requester or requests.Session()
+        self._verify_ssl = verify_ssl
+        self._token = None
+        self._lock = threading.Lock()
+
+    def _rest_client(self, authenticate=False):
+        # The state of a RestApiClient is per thread, a new one for every retrieval
+        rest_client = RestApiClient(None, self._requester)
+        rest_client.remote_url = self.url
+        rest_client.verify_ssl = self._verify_ssl
+        if self._user:
+            with self._lock:
+                if authenticate or self._token is None:
+                    self._token = rest_client.authenticate(self._user, self._password)
+                rest_client.token = self._token
+        return rest_client
+
+    def retrieve(self, get_urls, folder):
+        """ downloads to folder the files of the recipe or package, get_urls(rest_client)
+        returns their {filename: url}. Raises NotFoundException before creating the folder
+        if they are not in the upstream. Any other upstream error, authentication ones included,
+        is an InternalErrorException, they are not errors of the client of this server
+        """
+        try:
+            self._retrieve(get_urls, folder)
+        except NotFoundException:
+            raise
+        except Exception as e:
+            logger.error("Error retrieving from upstream %s: %s" % (self.url, str(e)))
+            raise InternalErrorException("Error retrieving from upstream %s: %s"
+                                         % (self.url, str(e)))
+
+    def _retrieve(self, get_urls, folder):
+        rest_client = self._rest_client()
+        try:
+            urls = get_urls(rest_client)
+        except AuthenticationException:
+            if not self._user:
+                raise
+            # Expired token
+            rest_client = self._rest_client(authenticate=True)
+            urls = get_urls(rest_client)
+        if not urls:
+            raise NotFoundException("Not found in upstream %s" % self.url)
+        rest_client.download_files_to_folder(urls, folder)
+
+
+class ProxyFileManager(FileManager):
+    """ FileManager of a conan_server working as a read-through cache of an upstream remote.
+    The recipes and packages not in the store are retrieved from the upstream the first time
+    they are requested, and then served from the store, they are not checked again for changes
+    in the upstream. The concurrent requests of the same recipe or package wait for a single
+    retrieval.
+    """
+
+    def __init__(self, paths, storage_adapter, upstream, search_manager=None):
+        super(ProxyFileManager, self).__init__(paths, storage_adapter)
+        self._upstream = upstream
+        self._search_manager = search_manager
+        # Striped, the requests of the same folder always get the same lock
+        self._locks = [threading.Lock() for _ in range(64)]
+
+    # ############ SNAPSHOTS
+    def get_recipe(self, conan_reference):
+        self._fetch_recipe(conan_reference)
+        return super(ProxyFileManager, self).get_recipe(conan_reference)
+
+    def get_conanfile_snapshot(self, reference):
+        self._fetch_recipe(reference)
+        return super(ProxyFileManager, self).get_conanfile_snapshot(reference)
+
+    def get_package_snapshot(self, package_reference):
+        self._fetch_package(package_reference)
+        return super(ProxyFileManager, self).get_package_snapshot(package_reference)
+
+    # ############ CONTENTS
+    def get_conanfile_files(self, reference, files):
+        self._fetch_recipe(reference)
+        return super(ProxyFileManager, self).get_conanfile_files(reference, files)
+
+    def get_package_files(self, package_reference, files):
+        self._fetch_package(package_reference)
+        return super(ProxyFileManager, self).get_package_files(package_reference, files)
+
+    # ############ DOWNLOAD URLS
+    def get_download_conanfile_urls(self, reference, files_subset=None, user=None):
+        self._fetch_recipe(reference)
+        return super(ProxyFileManager, self).get_download_conanfile_urls(reference,
+                                                                         files_subset, user)
+
+    def get_download_package_urls(self, package_reference, files_subset=None, user=None):
+        self._fetch_package(package_reference)
+        return super(ProxyFileManager, self).get_download_package_urls(package_reference,
+                                                                       files_subset, user)
+
+    # ############ INTERNAL METHODS
+    def _fetch_recipe(self, reference):
+        self._fetch(reference, self.paths.export(reference),
+                    lambda rest_client: rest_client.get_recipe_urls(reference))
+
+    def _fetch_package(self, package_reference):
+        self._fetch_recipe(package_reference.conan)
+        self._fetch(package_reference.conan, self.paths.package(package_reference),
+                    lambda rest_client: rest_client.get_package_urls(package_reference))
+
+    def _fetch(self, reference, folder, get_urls):
+        """ Retrieves the folder from the upstream if it is not in the store. The files are
+        downloaded to a temporary folder out of the reference, renamed when finished, so the
+        partial downloads are never served. An existing folder is never replaced, it might be
+        being filled by an upload to this server
+        """
+        if os.path.exists(folder):
+            return
+        with self._locks[hash(folder) % len(self._locks)]:
+            if os.path.exists(folder):  # By a concurrent request
+                return
+            fetch_folder = os.path.join(self.paths.store, FETCH_FOLDER)
+            tmp_folder = os.path.join(fetch_folder, str(uuid.uuid4()))
+            try:
+                self._upstream.retrieve(get_urls, tmp_folder)
+                if not os.path.exists(os.path.join(tmp_folder, CONAN_MANIFEST)):
+                    raise NotFoundException("%s is not complete in upstream %s"
+                                            % (str(reference), self._upstream.url))
+                mkdir(os.path.dirname(folder))
+                try:
+                    os.rename(tmp_folder, folder)
+                except OSError:
+                    # Other conan_server process (prefork mode) retrieved it, or it was uploaded,
+                    # at the same time
+                    if not os.path.exists(folder):
+                        raise
+                logger.debug("Retrieved %s from upstream %s" % (folder, self._upstream.url))
+            finally:
+                rmdir(tmp_folder)
+                try:
+                    os.rmdir(fetch_folder)  # Only if empty, other retrievals might use it
+                except OSError:
+                    pass
+        if self._search_manager:
+            self._search_manager.store_changed(folder)
@@ -1,9 +1,10 @@
+import json
 import unittest
 from conans.tools import environment_append
 from conans.test.utils.tools import TestClient, TestServer
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
-from conans.model.ref import ConanFileReference
-from conans.util.files import save
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.util.files import save, load
 import os
 
 
@@ -436,3 +437,52 @@ class Pkg(ConanFile):
         self.assertIn("Uploading conanmanifest.txt", client.out)
         self.assertIn("Uploading conanfile.py", client.out)
         self.assertIn("Uploading conan_export.tgz", client.out)
+
+    def upload_parallel_test(self):
+        client = self._client()
+        conanfile_options = conanfile + """
+    options = {"opt": [1, 2, 3]}
+    default_options = "opt=1"
+"""
+        for name in ("Hello0", "Hello1"):
+            client.save({"conanfile.py": conanfile_options.replace("Hello0", name),
+                         "header.h": "// header"}, clean_first=True)
+            for opt in (1, 2, 3):
+                client.run("create . user/testing -o opt=%s" % opt)
+
+        client.run("upload Hello*@user/testing --all --confirm --parallel 4 --json upload.json")
+        info = json.loads(load(os.path.join(client.current_folder, "upload.json")))
+        self.assertFalse(info["error"])
+        self.assertEqual(["Hello0/1.2.1@user/testing", "Hello1/1.2.1@user/testing"],
+                         [uploaded["recipe"]["id"] for uploaded in info["uploaded"]])
+        for name, uploaded in zip(("Hello0", "Hello1"), info["uploaded"]):
+            ref = ConanFileReference.loads("%s/1.2.1@user/testing" % name)
+            packages_ids = client.client_cache.conan_packages(ref)
+            self.assertEqual(packages_ids, [package["id"] for package in uploaded["packages"]])
+            for index, package_id in enumerate(packages_ids):
+                self.assertIn("%s: Uploading package %d/3: %s" % (str(ref), index + 1, package_id),
+                              client.out)
+
+        client.run("remote list_ref")
+        self.assertIn("Hello0/1.2.1@user/testing: default", client.out)
+        self.assertIn("Hello1/1.2.1@user/testing: default", client.out)
+        client.run("search Hello1/1.2.1@user/testing -r=default")
+        self.assertEqual(3, str(client.out).count("Package_ID:"))
+
+    def upload_parallel_error_test(self):
+        client = self._client()
+        client.save({"conanfile.py": conanfile,
+                     "include/hello.h": ""})
+        client.run("create . frodo/stable")
+        ref = ConanFileReference.loads("Hello0/1.2.1@frodo/stable")
+        pkg_id = client.client_cache.conan_packages(ref)[0]
+        os.remove(os.path.join(client.client_cache.package(PackageReference(ref, pkg_id)),
+                               "include/hello.h"))
+        error = client.run("upload Hello0/1.2.1@frodo/stable --all --check --parallel 2",
+                           ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Hello0/1.2.1@frodo/stable: WARN: Mismatched checksum 'include/hello.h'",
+                      client.out)
+        self.assertIn("ERROR: Cannot upload corrupted package", client.out)
+        client.run("remote list_ref")
+        self.assertNotIn("Hello0/1.2.1@frodo/stable", client.out)
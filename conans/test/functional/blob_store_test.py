@@ -0,0 +1,87 @@
+import os
+import platform
+import stat
+import unittest
+
+from conans.client.store.blob_store import BlobStore
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANINFO
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+
+
+conanfile = """from conans import ConanFile
+
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = "0.1"
+    options = {"opt": [1, 2]}
+    default_options = "opt=1"
+    exports = "*.h"
+
+    def package(self):
+        self.copy("*.h", dst="include")
+"""
+
+
+@unittest.skipIf(platform.system() == "Windows", "Uses hardlinks")
+class BlobStoreTest(unittest.TestCase):
+
+    def _inode(self, path):
+        return os.stat(path).st_ino
+
+    def test_deduplicated_packages(self):
+        client = TestClient()
+        blob_folder = os.path.join(client.base_folder, "blobs")
+        client.save({"conanfile.py": conanfile, "hello.h": "the header"})
+        with environment_append({"CONAN_BLOB_STORE": blob_folder}):
+            client.run("create . lasote/stable -o Hello:opt=1")
+            client.run("create . lasote/stable -o Hello:opt=2")
+            ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+            package_ids = sorted(os.listdir(client.paths.packages(ref)))
+            headers = [os.path.join(client.paths.package(PackageReference(ref, package_id)),
+                                    "include", "hello.h") for package_id in package_ids]
+            self.assertEqual(self._inode(headers[0]), self._inode(headers[1]))
+            self.assertEqual(os.stat(headers[0]).st_nlink, 3)  # And the blob
+            # Shared, it cannot be modified in place
+            self.assertFalse(os.stat(headers[0]).st_mode & stat.S_IWUSR)
+            infos = [os.path.join(os.path.dirname(os.path.dirname(header)), CONANINFO)
+                     for header in headers]
+            self.assertEqual(os.stat(infos[0]).st_nlink, 1)
+
+            client.run("copy Hello/0.1@lasote/stable other/testing --all")
+            other_ref = ConanFileReference.loads("Hello/0.1@other/testing")
+            copied = os.path.join(client.paths.package(PackageReference(other_ref,
+                                                                        package_ids[0])),
+                                  "include", "hello.h")
+            self.assertEqual(self._inode(copied), self._inode(headers[0]))
+
+            client.run("remove Hello* -f")
+            self.assertEqual(os.listdir(os.path.join(blob_folder,
+                                                     os.listdir(blob_folder)[0])), [])
+
+    def test_modified_file_not_shared(self):
+        client = TestClient()
+        blob_folder = temp_folder()
+        client.save({"conanfile.py": conanfile, "hello.h": "the header"})
+        client.run("create . lasote/stable -o Hello:opt=1")
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        package_id = os.listdir(client.paths.packages(ref))[0]
+        header = os.path.join(client.paths.package(PackageReference(ref, package_id)),
+                              "include", "hello.h")
+        # Different content than in the manifest
+        with open(header, "a") as handle:
+            handle.write("modified")
+        with environment_append({"CONAN_BLOB_STORE": blob_folder}):
+            client.client_cache.deduplicate_package(os.path.dirname(os.path.dirname(header)))
+        self.assertEqual(os.stat(header).st_nlink, 1)
+        self.assertEqual(os.listdir(blob_folder), [])
+
+        # Not a blob, it is copied, not hardlinked
+        package_folder = os.path.dirname(os.path.dirname(header))
+        copy_folder = os.path.join(temp_folder(), "copy")
+        BlobStore(blob_folder).copy_folder(package_folder, copy_folder)
+        copied = os.path.join(copy_folder, "include", "hello.h")
+        self.assertEqual(os.stat(copied).st_nlink, 1)
+        self.assertEqual(os.stat(header).st_nlink, 1)
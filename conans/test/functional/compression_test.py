@@ -0,0 +1,84 @@
+import gzip
+import os
+import unittest
+
+from conans import SERVER_CAPABILITIES, XZ_ARCHIVES_CAPABILITY
+from conans.client.remote_manager import compress_files
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import save, load, md5sum, tar_extract, ParallelGzipFile
+
+
+class ParallelGzipTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.files = {}
+        for i in range(20):
+            name = "file%d.txt" % i
+            self.files[name] = os.path.join(self.folder, name)
+            save(self.files[name], "".join("Line %d of file %d\n" % (j, i) for j in range(5000)))
+
+    def _compress(self):
+        dest_dir = temp_folder()
+        compress_files(self.files, {}, PACKAGE_TGZ_NAME, dest_dir)
+        return os.path.join(dest_dir, PACKAGE_TGZ_NAME)
+
+    def test_compress_threads(self):
+        block_size = ParallelGzipFile.block_size
+        ParallelGzipFile.block_size = 64 * 1024  # So there are several blocks to deflate
+        try:
+            with environment_append({"CONAN_COMPRESSION_THREADS": "4"}):
+                tgz_path = self._compress()
+                self.assertEqual(md5sum(tgz_path), md5sum(self._compress()))
+        finally:
+            ParallelGzipFile.block_size = block_size
+
+        # A regular gzip file, same contents than the one compressed by a single thread
+        with gzip.open(tgz_path, "rb") as parallel_tgz:
+            with gzip.open(self._compress(), "rb") as tgz:
+                self.assertEqual(parallel_tgz.read(), tgz.read())
+
+        dest_folder = temp_folder()
+        with open(tgz_path, "rb") as file_handler:
+            tar_extract(file_handler, dest_folder)
+        for name, path in self.files.items():
+            self.assertEqual(load(os.path.join(dest_folder, name)), load(path))
+
+
+class CompressionFormatTest(unittest.TestCase):
+
+    def _upload(self, server):
+        client = TestClient(servers={"default": server}, users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("create . lasote/stable")
+        with environment_append({"CONAN_COMPRESSION_FORMAT": "xz"}):
+            client.run("upload Hello0/0.1@lasote/stable --all")
+        ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        package_id = os.listdir(client.paths.packages(ref))[0]
+        package_ref = PackageReference(ref, package_id)
+        tgz_path = os.path.join(server.paths.package(package_ref), PACKAGE_TGZ_NAME)
+        with open(tgz_path, "rb") as tgz:
+            magic = tgz.read(6)
+        return client, package_ref, magic
+
+    def test_xz(self):
+        server = TestServer(server_capabilities=SERVER_CAPABILITIES + [XZ_ARCHIVES_CAPABILITY])
+        _, package_ref, magic = self._upload(server)
+        self.assertEqual(magic, b"\xfd7zXZ\x00")
+
+        client = TestClient(servers={"default": server}, users={"default": [("lasote", "mypass")]})
+        client.run("install Hello0/0.1@lasote/stable")
+        self.assertIn("Package installed %s" % package_ref.package_id, client.out)
+        self.assertTrue(os.path.exists(os.path.join(client.paths.package(package_ref),
+                                                    "include", "helloHello0.h")))
+
+    def test_xz_not_supported(self):
+        # Not a default capability, it is enabled in the server.conf
+        client, _, magic = self._upload(TestServer())
+        self.assertIn("Remote 'default' doesn't support xz archives, using gzip", client.out)
+        self.assertEqual(magic[:2], b"\x1f\x8b")
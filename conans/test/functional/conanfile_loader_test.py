@@ -12,6 +12,7 @@ from conans.model.profile import Profile
 from collections import OrderedDict
 from mock.mock import call
 from conans.client.loader_parse import load_conanfile_class
+from conans.client.tools import environment_append
 
 
 class ConanLoaderTest(unittest.TestCase):
@@ -219,3 +220,28 @@ class MyTest(ConanFile):
 
         recipe = loader.load_conan(conanfile_path, None)
         self.assertIsNone(recipe.settings.os.value)
+
+    def recipe_code_cache_test(self):
+        tmp_dir = temp_folder()
+        conanfile_path = os.path.join(tmp_dir, "conanfile.py")
+        conanfile = """from conans import ConanFile
+class Pkg(ConanFile):
+    name = "Pkg"
+    version = "%s"
+"""
+        bytecode_folder = temp_folder()
+        with environment_append({"CONAN_RECIPE_BYTECODE_CACHE": bytecode_folder}):
+            save(conanfile_path, conanfile % "0.1")
+            first = load_conanfile_class(conanfile_path)
+            second = load_conanfile_class(conanfile_path)
+            # Different classes, they are modified by the callers
+            self.assertIsNot(first, second)
+            first.version = "changed"
+            self.assertEqual(second.version, "0.1")
+            self.assertEqual(len(os.listdir(bytecode_folder)), 1)
+
+            # Same size, only the contents changed
+            save(conanfile_path, conanfile % "0.2")
+            self.assertEqual(load_conanfile_class(conanfile_path).version, "0.2")
+            self.assertEqual(len(os.listdir(bytecode_folder)), 2)
+        self.assertEqual(os.listdir(tmp_dir), ["conanfile.py"])
@@ -3,6 +3,7 @@ from conans.client.graph.graph_builder import DepsGraph, Node
 from conans.model.ref import ConanFileReference
 from conans.model.conan_file import ConanFile
 from conans.model.settings import Settings
+from conans.errors import ConanException
 
 
 class DepsGraphTest(unittest.TestCase):
@@ -85,3 +86,53 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32)
         deps.add_edge(n32, n5)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+    def levels_cache_test(self):
+        deps = DepsGraph()
+        n1 = Node(1, 1)
+        n2 = Node(2, 2)
+        n3 = Node(3, 3)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2)
+        levels = deps.by_levels()
+        self.assertEqual([[n2], [n1]], levels)
+        levels.pop()  # The returned levels can be modified
+        self.assertEqual([[n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2]], deps.inverse_levels())
+
+        # Modifying the graph computes them again
+        deps.add_node(n3)
+        deps.add_edge(n2, n3)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2], [n3]], deps.inverse_levels())
+        self.assertEqual([n3, n2], deps.ordered_closure(n1, [n3, n2, n1]))
+
+    def closures_test(self):
+        deps = DepsGraph()
+        n1 = Node(1, 1)
+        n2 = Node(2, 2)
+        n3 = Node(3, 3)
+        n4 = Node(4, 4)
+        for n in (n1, n2, n3, n4):
+            deps.add_node(n)
+        deps.add_edge(n1, n2)
+        deps.add_edge(n1, n3)
+        deps.add_edge(n2, n4)
+        deps.add_edge(n3, n4, private=True)
+        flat = [n4, n3, n2, n1]
+        self.assertEqual([n4, n3, n2], deps.ordered_closure(n1, flat))
+        self.assertEqual([n3, n2], deps.ordered_closure(n1, [n3, n2]))
+        self.assertEqual([n4], deps.ordered_closure(n3, flat))
+        self.assertEqual({n1, n2, n3, n4}, deps._inverse_closure(["4"]))
+
+    def loop_levels_test(self):
+        deps = DepsGraph()
+        n1 = Node(1, 1)
+        n2 = Node(2, 2)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2)
+        deps.add_edge(n2, n1)
+        with self.assertRaisesRegexp(ConanException, "Loop detected"):
+            deps.by_levels()
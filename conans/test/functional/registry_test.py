@@ -5,7 +5,7 @@ from conans.client.remote_registry import RemoteRegistry
 from conans.model.ref import ConanFileReference
 from conans.errors import ConanException
 from conans.test.utils.tools import TestBufferConanOutput
-from conans.util.files import save
+from conans.util.files import load, save
 
 
 class RegistryTest(unittest.TestCase):
@@ -82,3 +82,53 @@ class RegistryTest(unittest.TestCase):
                                             ("repo2", "url2", True),
                                             ("conan.io", "https://server.conan.io", True),
                                             ("repo3", "url3", True)])
+
+    def cached_refs_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        ref = ConanFileReference.loads("MyLib/0.1@lasote/stable")
+        remote = registry.remotes[0]
+        registry.set_ref(ref, remote)
+        self.assertEqual(registry.get_ref(ref), remote)
+        registry.flush()
+
+        # Not written again if not changed
+        mtime = os.stat(f).st_mtime
+        os.utime(f, (mtime - 10, mtime - 10))
+        registry.set_ref(ref, remote)
+        registry.flush()
+        self.assertEqual(os.stat(f).st_mtime, mtime - 10)
+
+        # Modified by other process, it is parsed again
+        other = RemoteRegistry(f, TestBufferConanOutput())
+        other.add("local", "http://localhost:9300")
+        other.set_ref(ref, other.remote("local"))
+        other.flush()
+        self.assertEqual(registry.get_ref(ref).name, "local")
+        self.assertEqual(registry.refs, {str(ref): "local"})
+        # The file is replaced, no temporary files left
+        self.assertEqual([name for name in os.listdir(os.path.dirname(f))
+                          if name.endswith(".tmp")], [])
+
+    def pending_refs_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        registry.add("local", "http://localhost:9300")
+        contents = load(f)
+        remote = registry.remote("local")
+        refs = [ConanFileReference.loads("MyLib%d/0.1@lasote/stable" % i) for i in range(3)]
+        for ref in refs:
+            registry.set_ref(ref, remote)
+        # Not written until flushed, but already registered
+        self.assertEqual(load(f), contents)
+        self.assertEqual(registry.get_ref(refs[0]), remote)
+        self.assertEqual(sorted(registry.refs), sorted(str(ref) for ref in refs))
+
+        # Other modifications write the pending ones too
+        registry.remove_ref(refs[1])
+        self.assertEqual(RemoteRegistry(f, TestBufferConanOutput()).refs,
+                         {str(refs[0]): "local", str(refs[2]): "local"})
+
+        registry.set_ref(refs[1], remote)
+        registry.flush()
+        self.assertEqual(len(RemoteRegistry(f, TestBufferConanOutput()).refs), 3)
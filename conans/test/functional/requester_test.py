@@ -1,6 +1,9 @@
 import unittest
 
+import requests
+
 from conans import tools
+from conans.client.rest.conan_requester import ConanRequester
 from conans.test.utils.tools import TestClient
 from conans.util.files import save
 
@@ -53,5 +56,24 @@ request_timeout=any_string
         client.init_dynamic_vars()
         self.assertEquals(client.requester.get("MyUrl"), "NOT SPECIFIED")
 
+    def http_pool_size_test(self):
+        client = TestClient()
+        save(client.client_cache.conan_conf_path, "[general]\nhttp_pool_size=32")
+        client.client_cache.invalidate()
+
+        def pool_size(requester):
+            adapter = requester._requester.get_adapter("https://myremote.com")
+            self.assertIs(adapter, requester._requester.get_adapter("http://myremote.com"))
+            return adapter._pool_maxsize
+
+        with tools.environment_append(client.client_cache.conan_config.env_vars):
+            requester = ConanRequester(requests.Session(), client.client_cache, None)
+        self.assertEqual(pool_size(requester), 32)
 
+        with tools.environment_append({"CONAN_INSTALL_JOBS": "4",
+                                       "CONAN_PARALLEL_TRANSFERS": "3"}):
+            requester = ConanRequester(requests.Session(), client.client_cache, None)
+        self.assertEqual(pool_size(requester), 12)
 
+        requester = ConanRequester(requests.Session(), client.client_cache, None)
+        self.assertEqual(pool_size(requester), 10)
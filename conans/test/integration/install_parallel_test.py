@@ -0,0 +1,119 @@
+import os
+import time
+import unittest
+
+from conans.client.tools import environment_append
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+from conans.util.files import load
+
+
+conanfile = """from conans import ConanFile
+
+class {name}Conan(ConanFile):
+    name = "{name}"
+    version = "0.1"
+    requires = {requires}
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h", dst="include")
+
+    def package_info(self):
+        self.cpp_info.libs = ["{name}"]
+        # package_info() is always called after the dependencies ones
+        for dep in self.requires:
+            assert dep in self.deps_cpp_info.deps
+"""
+
+
+class SlowPackageRequester(TestRequester):
+    """ The package downloads take a while, so they are running at the same time """
+    def get(self, url, **kwargs):
+        if PACKAGE_TGZ_NAME in url:
+            time.sleep(0.2)
+        return super(SlowPackageRequester, self).get(url, **kwargs)
+
+
+class InstallParallelTest(unittest.TestCase):
+
+    def _export_upload(self, client, name, requires=None):
+        requires = ", ".join('"%s/0.1@lasote/stable"' % r for r in requires or [])
+        client.save({"conanfile.py": conanfile.format(name=name, requires="(%s,)" % requires
+                                                      if requires else "None"),
+                     "%s.h" % name: "// header %s" % name}, clean_first=True)
+        client.run("create . lasote/stable")
+        client.run("upload %s/0.1@lasote/stable --all" % name)
+
+    def test_parallel_install(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self._export_upload(client, "LibA")
+        self._export_upload(client, "LibB", ["LibA"])
+        self._export_upload(client, "LibC", ["LibA"])
+        self._export_upload(client, "LibD", ["LibB", "LibC"])
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.txt": "[requires]\nLibD/0.1@lasote/stable"})
+        with environment_append({"CONAN_INSTALL_JOBS": "3"}):
+            client.run("install .")
+
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            self.assertIn("%s/0.1@lasote/stable: Package installed" % name, client.out)
+        conanbuildinfo = load(os.path.join(client.current_folder, "conanbuildinfo.txt"))
+        self.assertIn("[libs]\nLibD\nLibB\nLibC\nLibA\n", conanbuildinfo)
+
+        # Already in the local cache, nothing to download
+        with environment_append({"CONAN_INSTALL_JOBS": "3"}):
+            client.run("install .")
+        self.assertNotIn("Package installed", client.out)
+        self.assertIn("LibA/0.1@lasote/stable: Already installed!", client.out)
+
+    def test_parallel_install_missing_binary(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self._export_upload(client, "LibA")
+        self._export_upload(client, "LibB", ["LibA"])
+        client.run("remove LibB* -p -f -r=default")
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        with environment_append({"CONAN_INSTALL_JOBS": "2"}):
+            error = client.run("install LibB/0.1@lasote/stable", ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("LibA/0.1@lasote/stable: Package installed", client.out)
+        self.assertIn("Missing prebuilt package for 'LibB/0.1@lasote/stable'", client.out)
+
+        with environment_append({"CONAN_INSTALL_JOBS": "2"}):
+            client.run("install LibB/0.1@lasote/stable --build=missing")
+        self.assertIn("LibA/0.1@lasote/stable: Already installed!", client.out)
+        self.assertIn("LibB/0.1@lasote/stable: Package '", client.out)
+
+    def test_parallel_install_output(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self._export_upload(client, "LibA")
+        self._export_upload(client, "LibB", ["LibA"])
+        self._export_upload(client, "LibC", ["LibA"])
+        self._export_upload(client, "LibD", ["LibB", "LibC"])
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=SlowPackageRequester)
+        client.save({"conanfile.txt": "[requires]\nLibD/0.1@lasote/stable"})
+        with environment_append({"CONAN_INSTALL_JOBS": "4"}):
+            client.run("install .")
+
+        # The output of every package retrieval is contiguous, in dependencies order
+        lines = str(client.out).splitlines()
+        starts = []
+        for name in ("LibA", "LibB", "LibC", "LibD"):
+            prefix = "%s/0.1@lasote/stable: " % name
+            start = next(index for index, line in enumerate(lines)
+                         if line.startswith(prefix + "Retrieving package"))
+            end = next(index for index, line in enumerate(lines)
+                       if line.startswith(prefix + "Package installed"))
+            block = lines[start:end + 1]
+            self.assertIn("Downloading conan_package.tgz", block)
+            self.assertFalse([line for line in block if line.startswith("Lib") and
+                              not line.startswith(name)])
+            starts.append(start)
+        self.assertEqual(starts, sorted(starts))
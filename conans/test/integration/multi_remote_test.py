@@ -1,8 +1,12 @@
+import threading
+import time
 import unittest
 from conans.test.utils.tools import TestServer, TestClient
 from conans.model.ref import ConanFileReference
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from collections import OrderedDict
+from conans import tools
+from conans.client.proxy import _query_remotes
 
 
 class MultiRemoteTest(unittest.TestCase):
@@ -114,3 +118,48 @@ class MultiRemoteTest(unittest.TestCase):
         self.assertIn("Remote: remote0=http://", client2.user_io.out)
         self.assertIn("Remote: remote1=http://", client2.user_io.out)
         self.assertIn("Remote: remote2=http://", client2.user_io.out)
+
+    def parallel_remotes_threads_test(self):
+        queried = []
+
+        def query(remote):
+            queried.append(remote)
+            if remote != "fast":
+                time.sleep(0.2)
+            return remote
+
+        remotes = ["fast", "slow1", "slow2"]
+        threads = threading.active_count()
+        for _ in range(10):
+            self.assertEqual(next(_query_remotes(remotes, query)), ("fast", "fast"))
+        # The pool is reused, the queries of the previous lookups not started are skipped
+        self.assertLessEqual(threading.active_count(), threads + len(remotes) + 3)
+        self.assertLess(len(queried), 10 * len(remotes))
+
+    def parallel_remotes_test(self):
+        conan_reference = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        files = cpp_hello_conan_files("Hello0", "0.1", build=False)
+        self.client.save(files)
+        self.client.run("export . lasote/stable")
+        self.client.run("upload %s -r=remote2" % str(conan_reference))
+        self.client.run("upload %s -r=remote1" % str(conan_reference))
+
+        client2 = TestClient(servers=self.servers, users=self.users)
+        with tools.environment_append({"CONAN_PARALLEL_REMOTES": "1"}):
+            client2.run("install %s --build=missing" % str(conan_reference))
+            # The first remote in order with the recipe, the misses are not tried
+            self.assertNotIn("Trying with 'remote0'", client2.out)
+            self.assertIn("Hello0/0.1@lasote/stable: Trying with 'remote1'...", client2.out)
+            self.assertNotIn("Trying with 'remote2'", client2.out)
+            client2.run("remote list_ref")
+            self.assertIn("Hello0/0.1@lasote/stable: remote1", client2.out)
+
+            # Version ranges search the remotes at once too
+            client3 = TestClient(servers=self.servers, users=self.users)
+            client3.save({"conanfile.txt": "[requires]\nHello0/[~0.1]@lasote/stable"})
+            client3.run("install . --build=missing")
+            self.assertIn("Hello0/0.1@lasote/stable from 'remote1'", client3.out)
+
+            error = client3.run("install Bye/0.1@lasote/stable", ignore_error=True)
+            self.assertTrue(error)
+            self.assertIn("Unable to find 'Bye/0.1@lasote/stable' in remotes", client3.out)
@@ -1,8 +1,14 @@
+import json
+import time
 import unittest
+
+from conans.client.tools import environment_append
 from conans.util.files import save, load, md5
 import os
 from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
 
 
 class ManifestTest(unittest.TestCase):
@@ -44,3 +50,80 @@ class ManifestTest(unittest.TestCase):
         # Not included the pycs or pyo
         self.assertEquals(set(read_manifest.file_sums.keys()),
                           set(["conanfile.py"]))
+
+    def test_parallel_hashing(self):
+        tmp_dir = temp_folder()
+        files = {"file%d.txt" % i: "contents %d" % i for i in range(100)}
+        for filename, content in files.items():
+            save(os.path.join(tmp_dir, filename), content)
+
+        with environment_append({"CONAN_HASH_THREADS": "4"}):
+            manifest = FileTreeManifest.create(tmp_dir)
+        self.assertEqual(manifest.file_sums, {f: md5(c) for f, c in files.items()})
+
+        # Sequentially
+        save(os.path.join(tmp_dir, "file1.txt"), "modified contents")
+        with environment_append({"CONAN_HASH_THREADS": "1"}):
+            manifest = FileTreeManifest.create(tmp_dir)
+        self.assertEqual(manifest.file_sums["file1.txt"], md5("modified contents"))
+        self.assertEqual(manifest.file_sums["file2.txt"], md5("contents 2"))
+
+    def test_hashes_cache(self):
+        tmp_dir = temp_folder()
+        save(os.path.join(tmp_dir, "one.txt"), "one")
+        save(os.path.join(tmp_dir, "two.txt"), "two")
+        old = time.time() - 100
+        for filename in ("one.txt", "two.txt"):
+            os.utime(os.path.join(tmp_dir, filename), (old, old))
+
+        hashes_folder = temp_folder()
+        manifest = FileTreeManifest.create(tmp_dir, hashes_cache=hashes_folder)
+        cache_path = os.path.join(hashes_folder, "files.json")
+        self.assertTrue(os.path.exists(cache_path))
+        # Out of the folder, it is never copied with its files
+        self.assertEqual(sorted(os.listdir(tmp_dir)), ["one.txt", "two.txt"])
+        # The cache is not part of the manifest
+        self.assertEqual(sorted(manifest.file_sums), ["one.txt", "two.txt"])
+
+        # The unmodified files are not hashed again
+        cache = json.loads(load(cache_path))
+        cache["one.txt"][3] = "cached_md5"
+        save(cache_path, json.dumps(cache))
+        manifest = FileTreeManifest.create(tmp_dir, hashes_cache=hashes_folder)
+        self.assertEqual(manifest.file_sums["one.txt"], "cached_md5")
+        self.assertEqual(manifest.file_sums["two.txt"], md5("two"))
+
+        # But the modified ones are, and the recent ones are not stored
+        save(os.path.join(tmp_dir, "one.txt"), "modified")
+        manifest = FileTreeManifest.create(tmp_dir, hashes_cache=hashes_folder)
+        self.assertEqual(manifest.file_sums["one.txt"], md5("modified"))
+        self.assertNotIn("one.txt", json.loads(load(cache_path)))
+
+    def test_hashes_cache_out_of_package(self):
+        client = TestClient()
+        client.save({"conanfile.py": """from conans import ConanFile
+class HelloConan(ConanFile):
+    exports_sources = "*.h"
+    def package(self):
+        self.copy("*.h")
+""", "hello.h": "header"})
+        client.run("create . Hello/0.1@lasote/stable")
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        package_id = os.listdir(client.client_cache.packages(ref))[0]
+        package_ref = PackageReference(ref, package_id)
+        old = time.time() - 100  # The recent files are not stored
+        for folder in (client.client_cache.conan(ref), client.client_cache.package(package_ref)):
+            for root, _, files in os.walk(folder):
+                for filename in files:
+                    os.utime(os.path.join(root, filename), (old, old))
+        client.client_cache.package_manifests(package_ref)
+        client.client_cache.conan_manifests(ref)
+        hashes_folder = client.client_cache.hashes_cache(ref, package_id)
+        self.assertEqual(os.listdir(hashes_folder), ["files.json"])
+        self.assertEqual(sorted(os.listdir(client.client_cache.hashes_cache(ref))),
+                         ["export_source.json", "files.json"])
+        self.assertEqual(sorted(os.listdir(client.client_cache.package(package_ref))),
+                         ["conaninfo.txt", "conanmanifest.txt", "hello.h"])
+
+        client.run("remove Hello/0.1@lasote/stable -p -f")
+        self.assertFalse(os.path.exists(hashes_folder))
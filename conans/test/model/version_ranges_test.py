@@ -160,8 +160,10 @@ def _get_edges(graph):
 class MockSearchRemote(object):
     def __init__(self, packages=None):
         self.packages = packages or []
+        self.count = 0
 
     def search_remotes(self, pattern, ignorecase):  # @UnusedVariable
+        self.count += 1
         return self.packages
 
 
@@ -225,6 +227,17 @@ class SayConan(ConanFile):
         self.remote_search.packages = remote_packages
         self.test_local_basic()
 
+    def test_remote_search_cached(self):
+        self.resolver._local_search = None
+        self.remote_search.packages = [ConanFileReference.loads("Say/%s@memsharded/testing" % v)
+                                       for v in ["0.1", "1.1", "not_semver"]]
+        for _ in range(3):
+            deps_graph = self.root(hello_content % ">0.0")
+            say = _get_nodes(deps_graph, "Say")[0]
+            self.assertEqual(say.conan_ref, ConanFileReference.loads("Say/1.1@memsharded/testing"))
+        self.assertEqual(self.remote_search.count, 1)
+        self.assertEqual(str(self.output).count("Version 'not_semver' is not semver"), 1)
+
     @parameterized.expand([("", "0.3", None, None),
                            ('"Say/1.1@memsharded/testing"', "1.1", False, False),
                            ('"Say/0.2@memsharded/testing"', "0.2", False, True),
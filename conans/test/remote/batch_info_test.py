@@ -0,0 +1,73 @@
+import unittest
+from collections import Counter
+
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+
+
+class CountingRequester(TestRequester):
+    calls = Counter()
+
+    def get(self, url, **kwargs):
+        if url.endswith("/download_urls"):
+            CountingRequester.calls["download_urls"] += 1
+        elif url.endswith("/digest"):
+            CountingRequester.calls["digest"] += 1
+        return super(CountingRequester, self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        if url.endswith("/batch_info"):
+            CountingRequester.calls["batch_info"] += 1
+        return super(CountingRequester, self).post(url, **kwargs)
+
+
+class BatchInfoTest(unittest.TestCase):
+
+    def _upload(self, server):
+        client = TestClient(servers={"default": server}, users={"default": [("lasote", "mypass")]})
+        for index in range(3):
+            deps = ["Hello%d/0.1@lasote/stable" % index] if index > 0 else None
+            files = cpp_hello_conan_files("Hello%d" % (index + 1), "0.1", deps, build=False)
+            client.save(files, clean_first=True)
+            client.run("create . lasote/stable")
+            client.run("upload Hello%d/0.1@lasote/stable --all" % (index + 1))
+        return client
+
+    def _install(self, server, ignore_error=False):
+        client = TestClient(servers={"default": server}, users={"default": [("lasote", "mypass")]},
+                            requester_class=CountingRequester)
+        CountingRequester.calls.clear()
+        client.run("install Hello3/0.1@lasote/stable", ignore_error=ignore_error)
+        return client
+
+    def test_batch_info(self):
+        server = TestServer()
+        self._upload(server)
+        client = self._install(server)
+        for index in range(3):
+            self.assertIn("Hello%d/0.1@lasote/stable: Package installed" % (index + 1), client.out)
+        # Only the urls to download the packages, the conaninfo came all in one request
+        self.assertEqual(CountingRequester.calls["batch_info"], 1)
+        self.assertEqual(CountingRequester.calls["download_urls"], 3 + 3)  # recipes + packages
+
+        CountingRequester.calls.clear()
+        client.run("info Hello3/0.1@lasote/stable --update")
+        self.assertEqual(CountingRequester.calls["batch_info"], 1)
+        # Only the ones of the graph construction, not again for the updates information
+        self.assertEqual(CountingRequester.calls["digest"], 3)
+        self.assertIn("Updates: You have the latest version (default)", client.out)
+
+    def test_missing_binary(self):
+        server = TestServer()
+        client = self._upload(server)
+        client.run("remove Hello2* -p -f -r=default")
+        client = self._install(server, ignore_error=True)
+        self.assertIn("Missing prebuilt package for 'Hello2/0.1@lasote/stable'", client.out)
+        self.assertEqual(CountingRequester.calls["batch_info"], 1)
+
+    def test_not_supported(self):
+        server = TestServer(server_capabilities=[])
+        self._upload(server)
+        self._install(server)
+        self.assertEqual(CountingRequester.calls["batch_info"], 0)
+        self.assertEqual(CountingRequester.calls["download_urls"], 3 + 3 + 3)
@@ -0,0 +1,71 @@
+import os
+import unittest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+from conans.util.files import md5sum
+
+
+class PutRecorderRequester(TestRequester):
+    """ Records the file uploads, (url, is_checksum_deploy) """
+    puts = []
+
+    def put(self, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        PutRecorderRequester.puts.append((url, headers.get("X-Checksum-Deploy") == "true"))
+        return super(PutRecorderRequester, self).put(url, **kwargs)
+
+
+conanfile = """from conans import ConanFile
+
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = "0.1"
+    options = {"opt": [1, 2]}
+    default_options = "opt=1"
+    exports = "data.bin"
+
+    def package(self):
+        self.copy("data.bin")
+"""
+
+
+class ChecksumDeployTest(unittest.TestCase):
+
+    def test_package_deduplicated(self):
+        PutRecorderRequester.puts = []
+        server = TestServer()
+        client = TestClient(servers={"default": server},
+                            users={"default": [("lasote", "mypass")]},
+                            requester_class=PutRecorderRequester)
+        # Random, not compressible, to be over the deduplication size
+        client.save({"conanfile.py": conanfile, "data.bin": os.urandom(2 * 1024 * 1024)})
+        client.run("export . lasote/stable")
+        client.run("install Hello/0.1@lasote/stable -o opt=1 --build")
+        client.run("install Hello/0.1@lasote/stable -o opt=2 --build")
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        package_ids = sorted(os.listdir(client.paths.packages(ref)))
+
+        client.run("upload Hello/0.1@lasote/stable -p %s" % package_ids[0])
+        tgz_puts = [deploy for url, deploy in PutRecorderRequester.puts
+                    if PACKAGE_TGZ_NAME in url]
+        # Only the big files are deduplicated, this one is not in the server and is uploaded
+        self.assertEqual(tgz_puts, [True, False])
+        self.assertNotIn(True, [deploy for url, deploy in PutRecorderRequester.puts
+                                if not url.split("?")[0].endswith(".tgz")])
+
+        PutRecorderRequester.puts = []
+        client.run("upload Hello/0.1@lasote/stable -p %s" % package_ids[1])
+        tgz_puts = [deploy for url, deploy in PutRecorderRequester.puts
+                    if PACKAGE_TGZ_NAME in url]
+        # The same tgz of the other package, it is not uploaded again
+        self.assertEqual(tgz_puts, [True])
+        tgz_paths = [os.path.join(server.paths.package(PackageReference(ref, package_id)),
+                                  PACKAGE_TGZ_NAME) for package_id in package_ids]
+        self.assertEqual(md5sum(tgz_paths[0]), md5sum(tgz_paths[1]))
+
+        client.run("remove * -f")
+        client.run("install Hello/0.1@lasote/stable -o opt=2")
+        self.assertIn("Hello/0.1@lasote/stable: Package installed %s" % package_ids[1],
+                      client.out)
@@ -0,0 +1,64 @@
+import os
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from conans.client.rest.uploader_downloader import FileUploadAdapter, Uploader
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import save
+
+
+class _Response(object):
+    ok = True
+    status_code = 200
+
+
+class ReadingRequester(object):
+    """ Reads the uploaded data like the http client, in 8KB reads, failing the first put
+    in the middle of the transfer
+    """
+    def __init__(self):
+        self.uploads = []
+        self.reads = 0
+
+    def put(self, url, data, **kwargs):  # @UnusedVariable
+        content = b""
+        while True:
+            block = data.read(8192)
+            self.reads += 1
+            if not block:
+                break
+            content += block
+            if not self.uploads:
+                self.uploads.append(None)
+                raise ConnectionError("Connection broken")
+        self.uploads.append(content)
+        return _Response()
+
+
+class FileUploadAdapterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(temp_folder(), "conan_package.tgz")
+        self.content = os.urandom(300 * 1024)
+        save(self.path, self.content)
+
+    def test_big_blocks(self):
+        output = TestBufferConanOutput()
+        with FileUploadAdapter(self.path, output, chunk_size=100 * 1024) as data:
+            self.assertEqual(len(data), 300 * 1024)
+            blocks = list(data)
+        self.assertEqual([len(block) for block in blocks], [100 * 1024] * 3)
+        self.assertEqual(b"".join(blocks), self.content)
+
+    def test_retry_from_start(self):
+        output = TestBufferConanOutput()
+        requester = ReadingRequester()
+        uploader = Uploader(requester, output, verify=False)
+        response = uploader.upload("http://fake/upload", self.path, retry=2, retry_wait=0)
+        self.assertTrue(response.ok)
+        self.assertIn("Connection broken", str(output))
+        self.assertEqual(requester.uploads[-1], self.content)
+        # 1 read before failing, 1 block and the end of file
+        self.assertEqual(requester.reads, 3)
@@ -0,0 +1,122 @@
+import json
+import os
+import unittest
+
+from conans.client.tools import environment_append
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+from conans.util.files import load, save
+
+
+class RecordingRequester(TestRequester):
+    calls = []
+
+    def get(self, url, **kwargs):
+        response = super(RecordingRequester, self).get(url, **kwargs)
+        if "/v1/conans/" in url:
+            RecordingRequester.calls.append((url.split("/v1/conans/")[1], response.status_code))
+        return response
+
+
+class MetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        self.client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                                 requester_class=RecordingRequester)
+        self._upload("Hello0")
+        RecordingRequester.calls = []
+
+    def _upload(self, name):
+        self.client.save(cpp_hello_conan_files(name, "0.1", build=False), clean_first=True)
+        self.client.run("create . lasote/stable")
+        with environment_append({"CONAN_METADATA_CACHE_TTL": "1000"}):
+            self.client.run("upload %s/0.1@lasote/stable --all" % name)
+
+    def _search(self):
+        with environment_append({"CONAN_METADATA_CACHE_TTL": "1000"}):
+            self.client.run("search Hello* -r=default")
+
+    def _expire_entries(self):
+        cache_folder = os.path.join(self.client.client_cache.conan_folder, "metadata_cache")
+        for root, _, files in os.walk(cache_folder):
+            for filename in files:
+                path = os.path.join(root, filename)
+                entry = json.loads(load(path))
+                entry["time"] = 0
+                save(path, json.dumps(entry))
+
+    def test_search_ttl_revalidation(self):
+        self._search()
+        self.assertIn("Hello0/0.1@lasote/stable", self.client.out)
+        self.assertEqual(RecordingRequester.calls, [("search?q=Hello%2A", 200)])
+
+        # Fresh entry, the remote is not asked
+        self._search()
+        self.assertIn("Hello0/0.1@lasote/stable", self.client.out)
+        self.assertEqual(len(RecordingRequester.calls), 1)
+
+        # Stale entry, revalidated with the ETag
+        self._expire_entries()
+        self._search()
+        self.assertIn("Hello0/0.1@lasote/stable", self.client.out)
+        self.assertEqual(RecordingRequester.calls[1], ("search?q=Hello%2A", 304))
+
+        # Uploading invalidates the cache of the remote
+        self._upload("Hello1")
+        RecordingRequester.calls = []
+        self._search()
+        self.assertIn("Hello1/0.1@lasote/stable", self.client.out)
+        self.assertEqual(RecordingRequester.calls, [("search?q=Hello%2A", 200)])
+
+    def test_disabled(self):
+        self.client.run("search Hello* -r=default")
+        self.client.run("search Hello* -r=default")
+        self.assertEqual(len(RecordingRequester.calls), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.client.client_cache.conan_folder,
+                                                     "metadata_cache")))
+
+    def test_install_manifests(self):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=RecordingRequester)
+        client.save({"conanfile.txt": "[requires]\nHello0/0.1@lasote/stable"})
+        with environment_append({"CONAN_METADATA_CACHE_TTL": "1000"}):
+            client.run("install .")
+            client.run("install . --update")
+            calls = len(RecordingRequester.calls)
+            client.run("install . --update")
+        self.assertIn("Hello0/0.1@lasote/stable: Already installed!", client.out)
+        # Neither the recipe nor the package manifest are requested again
+        self.assertEqual(len(RecordingRequester.calls), calls, RecordingRequester.calls)
+
+    def test_download_urls_not_cached(self):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=RecordingRequester)
+        client.save({"conanfile.txt": "[requires]\nHello0/0.1@lasote/stable"})
+        with environment_append({"CONAN_METADATA_CACHE_TTL": "1000"}):
+            client.run("install .")
+            client.run("remove * -f")
+            client.run("install .")
+        # The urls might be signed and expire, they are requested every time
+        download_urls = [url for url, _ in RecordingRequester.calls
+                         if url.endswith("download_urls")]
+        self.assertEqual(len(download_urls), 4, RecordingRequester.calls)
+
+    def test_entries_per_user(self):
+        server = TestServer(read_permissions=[("Hello0/*@*/*", "lasote")],
+                            write_permissions=[("*/*@*/*", "lasote")],
+                            users={"lasote": "mypass", "other": "otherpass"})
+        client = TestClient(servers={"default": server},
+                            users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("create . lasote/stable")
+        client.run("upload Hello0/0.1@lasote/stable")
+        with environment_append({"CONAN_METADATA_CACHE_TTL": "1000"}):
+            client.run("search Hello* -r=default")
+            self.assertIn("Hello0/0.1@lasote/stable", client.out)
+            client.run("user other -p otherpass -r default")
+            client.run("search Hello* -r=default")
+            self.assertNotIn("Hello0/0.1@lasote/stable", client.out)
+            client.run("user lasote -p mypass -r default")
+            client.run("search Hello* -r=default")
+            self.assertIn("Hello0/0.1@lasote/stable", client.out)
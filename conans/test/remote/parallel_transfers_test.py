@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+import unittest
+
+from requests.packages.urllib3.exceptions import ConnectionError
+
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANFILE, CONAN_MANIFEST, CONANINFO, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+
+
+class ConcurrencyRequester(TestRequester):
+    """ Slows down each transfer to record how many of them happen at the same time
+    """
+    lock = threading.Lock()
+    current = 0
+    max_concurrent = 0
+
+    def _transfer(self, method, url, **kwargs):
+        cls = ConcurrencyRequester
+        with cls.lock:
+            cls.current += 1
+            cls.max_concurrent = max(cls.max_concurrent, cls.current)
+        try:
+            time.sleep(0.1)
+            return getattr(super(ConcurrencyRequester, self), method)(url, **kwargs)
+        finally:
+            with cls.lock:
+                cls.current -= 1
+
+    def put(self, url, **kwargs):
+        return self._transfer("put", url, **kwargs)
+
+    def get(self, url, **kwargs):
+        if "/v1/files/" in url:
+            return self._transfer("get", url, **kwargs)
+        return super(ConcurrencyRequester, self).get(url, **kwargs)
+
+
+class FailUploadRequester(TestRequester):
+    def put(self, *args, **kwargs):
+        raise ConnectionError("Can't connect because of the evil mock")
+
+
+class ParallelTransfersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        self.ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        ConcurrencyRequester.max_concurrent = 0
+
+    def _client(self, requester_class=ConcurrencyRequester):
+        return TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                          requester_class=requester_class)
+
+    def test_upload_download(self):
+        client = self._client()
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("export . lasote/stable")
+        client.run("install Hello0/0.1@lasote/stable --build")
+        with environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            client.run("upload Hello0/0.1@lasote/stable --all")
+        self.assertGreater(ConcurrencyRequester.max_concurrent, 1)
+
+        server_paths = self.servers["default"].paths
+        self.assertEqual(sorted(os.listdir(server_paths.export(self.ref))),
+                         sorted([CONANFILE, CONAN_MANIFEST, EXPORT_TGZ_NAME]))
+        package_id = os.listdir(client.paths.packages(self.ref))[0]
+        package_ref = PackageReference(self.ref, package_id)
+        self.assertEqual(sorted(os.listdir(server_paths.package(package_ref))),
+                         sorted([CONANINFO, CONAN_MANIFEST, PACKAGE_TGZ_NAME]))
+
+        ConcurrencyRequester.max_concurrent = 0
+        client = self._client()
+        with environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            client.run("install Hello0/0.1@lasote/stable")
+        self.assertGreater(ConcurrencyRequester.max_concurrent, 1)
+        self.assertIn("Hello0/0.1@lasote/stable: Package installed %s" % package_id, client.out)
+        package_folder = client.paths.package(package_ref)
+        self.assertTrue(os.path.exists(os.path.join(package_folder, "include", "helloHello0.h")))
+        self.assertFalse(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+
+    def test_sequential(self):
+        client = self._client()
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("export . lasote/stable")
+        client.run("upload Hello0/0.1@lasote/stable")
+        self.assertEqual(ConcurrencyRequester.max_concurrent, 1)
+
+    def test_failed_files_order(self):
+        client = self._client(FailUploadRequester)
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("export . lasote/stable")
+        with environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            error = client.run("upload Hello0/0.1@lasote/stable --retry 2 --retry-wait 0",
+                               ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Execute upload again to retry upload the failed files: "
+                      "conanmanifest.txt, conanfile.py, conan_export.tgz", client.out)
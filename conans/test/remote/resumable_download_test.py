@@ -0,0 +1,239 @@
+import os
+import unittest
+
+import mock
+from requests.exceptions import ConnectionError
+
+from conans.client.rest.uploader_downloader import Downloader, PartialDownload, PART_SUFFIX
+from conans.errors import ConanConnectionError
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME, CONANFILE
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput, TestClient, TestServer, TestRequester
+from conans.util.files import load
+
+
+class _Response(object):
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers
+        self.content = content
+
+    def iter_content(self, chunk_size):  # @UnusedVariable
+        return [self.content]
+
+    def close(self):
+        pass
+
+
+class _RangeServer(object):
+    """ Requester serving a file, with Range support, sending only max_size bytes per response
+    """
+    def __init__(self, content, max_size=None, ranges=True, last_modified="Mon, 01 Jan 2018"):
+        self.content = content
+        self.max_size = max_size
+        self.ranges = ranges
+        self.last_modified = last_modified
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):  # @UnusedVariable
+        headers = headers or {}
+        self.requests.append(headers.get("Range"))
+        response_headers = {"last-modified": self.last_modified}
+        offset = 0
+        status = 200
+        if self.ranges:
+            response_headers["accept-ranges"] = "bytes"
+            if "Range" in headers:
+                offset = int(headers["Range"][len("bytes="):-1])
+                if offset >= len(self.content):
+                    return _Response(416, response_headers, b"")
+                status = 206
+                response_headers["content-range"] = "bytes %d-%d/%d" % (offset,
+                                                                        len(self.content) - 1,
+                                                                        len(self.content))
+        content = self.content[offset:]
+        response_headers["content-length"] = str(len(content))
+        if self.max_size is not None:
+            content = content[:self.max_size]
+        return _Response(status, response_headers, content)
+
+
+class ResumableDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(temp_folder(), "conan_export.tgz")
+        self.content = os.urandom(1000)
+        self.output = TestBufferConanOutput()
+
+    def _download(self, server, retry=1):
+        downloader = Downloader(server, self.output, verify=False)
+        downloader.download("http://myserver/conan_export.tgz?signature=1", self.file_path,
+                            retry=retry)
+
+    def test_resumed(self):
+        server = _RangeServer(self.content, max_size=300)
+        self._download(server)
+        self.assertEqual(server.requests, [None, "bytes=300-", "bytes=600-", "bytes=900-"])
+        self.assertEqual(load(self.file_path, binary=True), self.content)
+        self.assertIn("Resuming the download from 600B", str(self.output))
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ["conan_export.tgz"])
+
+    def test_failed_cleaned(self):
+        server = _RangeServer(self.content, max_size=300)
+        server.get = _fail_after_first(server.get)
+        with self.assertRaisesRegexp(ConanConnectionError, "Connection refused"):
+            self._download(server)
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), [])
+
+    def _killed_download(self, last_modified="Mon, 01 Jan 2018"):
+        """ A download interrupted without cleaning the .part file, as if the process was killed
+        """
+        server = _RangeServer(self.content, max_size=300, last_modified=last_modified)
+        server.get = _fail_after_first(server.get)
+        with mock.patch.object(PartialDownload, "discard"):
+            with self.assertRaises(ConanConnectionError):
+                self._download(server)
+        self.assertEqual(os.path.getsize(self.file_path + PART_SUFFIX), 300)
+        self.assertFalse(os.path.exists(self.file_path))
+
+    def test_resumed_after_killed(self):
+        self._killed_download()
+        server = _RangeServer(self.content)
+        self._download(server)
+        self.assertEqual(server.requests, ["bytes=300-"])
+        self.assertEqual(load(self.file_path, binary=True), self.content)
+        self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX))
+
+    def test_remote_file_changed(self):
+        self._killed_download()
+        new_content = os.urandom(1000)
+        server = _RangeServer(new_content, last_modified="Tue, 02 Jan 2018")
+        self._download(server)
+        self.assertEqual(server.requests, ["bytes=300-", None])
+        self.assertEqual(load(self.file_path, binary=True), new_content)
+
+    def test_no_validators_not_resumed(self):
+        # Without ETag nor Last-Modified, other file of the same length could be appended
+        self._killed_download(last_modified=None)
+        self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX + ".json"))
+        new_content = os.urandom(1000)
+        server = _RangeServer(new_content, last_modified=None)
+        self._download(server)
+        self.assertEqual(server.requests, [None])
+        self.assertEqual(load(self.file_path, binary=True), new_content)
+
+    def test_ranges_not_supported(self):
+        server = _RangeServer(self.content, max_size=300, ranges=False)
+        with self.assertRaisesRegexp(ConanConnectionError, "Transfer interrupted before complete"):
+            self._download(server, retry=2)
+        self.assertEqual(server.requests, [None, None])
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), [])
+
+
+def _fail_after_first(get):
+    calls = []
+
+    def _get(url, **kwargs):
+        calls.append(url)
+        if len(calls) > 1:
+            raise ConnectionError("Connection refused")
+        return get(url, **kwargs)
+    return _get
+
+
+class InterruptedPackageRequester(TestRequester):
+    """ Sends only the first half of the package tgz in the requests without Range """
+    def get(self, url, **kwargs):
+        response = super(InterruptedPackageRequester, self).get(url, **kwargs)
+        headers = kwargs.get("headers") or {}
+        if PACKAGE_TGZ_NAME in url and "Range" not in headers:
+            content = response.content
+            response.iter_content = lambda chunk_size: [content[:len(content) // 2]]
+        return response
+
+
+class InterruptedRecipeRequester(TestRequester):
+    """ Sends only the first half of the recipe files in the requests without Range, and
+    corrupts the conanfile.py in the Range ones if corrupt
+    """
+    corrupt = False
+
+    def get(self, url, **kwargs):
+        response = super(InterruptedRecipeRequester, self).get(url, **kwargs)
+        headers = kwargs.get("headers") or {}
+        path = url.split("?")[0]
+        if not (path.endswith(".tgz") or path.endswith(CONANFILE)):
+            return response
+        content = response.content
+        if "Range" not in headers:
+            content = content[:len(content) // 2]
+        elif self.corrupt and path.endswith(CONANFILE):
+            content = b"#" * len(content)
+        response.iter_content = lambda chunk_size: [content]
+        return response
+
+
+class CorruptedRecipeRequester(InterruptedRecipeRequester):
+    corrupt = True
+
+
+class ResumableRecipeDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        self.users = {"default": [("lasote", "mypass")]}
+        client = TestClient(servers=self.servers, users=self.users)
+        files = cpp_hello_conan_files("Hello0", "0.1", build=False)
+        files["data.txt"] = "exported data" * 100
+        files[CONANFILE] = files[CONANFILE].replace("exports = '*'",
+                                                    "exports = 'data.txt'\n"
+                                                    "    exports_sources = '*'")
+        client.save(files)
+        client.run("export . lasote/stable")
+        client.run("upload Hello0/0.1@lasote/stable")
+        self.ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+
+    def test_recipe_resumed(self):
+        client = TestClient(servers=self.servers, users=self.users,
+                            requester_class=InterruptedRecipeRequester)
+        client.run("install Hello0/0.1@lasote/stable --build")
+        # conanfile.py, conan_export.tgz and conan_sources.tgz
+        self.assertEqual(str(client.out).count("Resuming the download"), 3)
+        export_folder = client.paths.export(self.ref)
+        self.assertEqual(load(os.path.join(export_folder, "data.txt")), "exported data" * 100)
+        self.assertTrue(os.path.exists(os.path.join(client.paths.export_sources(self.ref),
+                                                    "helloHello0.h")))
+
+    def test_recipe_corrupted(self):
+        client = TestClient(servers=self.servers, users=self.users,
+                            requester_class=CorruptedRecipeRequester)
+        error = client.run("install Hello0/0.1@lasote/stable --build", ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Corrupted download of recipe 'Hello0/0.1@lasote/stable', try again",
+                      client.out)
+        self.assertIn("Mismatched checksum 'conanfile.py'", client.out)
+        self.assertFalse(os.path.exists(client.paths.export(self.ref)))
+
+
+class ResumablePackageDownloadTest(unittest.TestCase):
+
+    def test_package_resumed(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("export . lasote/stable")
+        client.run("install Hello0/0.1@lasote/stable --build")
+        client.run("upload Hello0/0.1@lasote/stable --all")
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=InterruptedPackageRequester)
+        client.run("install Hello0/0.1@lasote/stable")
+        self.assertIn("Transfer interrupted before complete", client.out)
+        self.assertIn("Resuming the download", client.out)
+        ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        package_id = os.listdir(client.paths.packages(ref))[0]
+        package_folder = client.paths.package(PackageReference(ref, package_id))
+        self.assertTrue(os.path.exists(os.path.join(package_folder, "include", "helloHello0.h")))
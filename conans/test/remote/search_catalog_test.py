@@ -0,0 +1,79 @@
+import os
+import unittest
+
+from conans.model.ref import ConanFileReference
+from conans.paths import SimplePaths
+from conans.search.catalog import CatalogSearchManager
+from conans.test.utils.tools import TestClient, TestServer
+
+
+conanfile = """from conans import ConanFile
+
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = "0.1"
+    settings = "os", "compiler"
+    options = {"shared": [True, False]}
+    default_options = "shared=False"
+"""
+
+
+class SearchCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer(search_catalog=True),
+                        "disk": TestServer()}
+        self.client = TestClient(servers=self.servers,
+                                 users={"default": [("lasote", "mypass")],
+                                        "disk": [("lasote", "mypass")]})
+        self.client.save({"conanfile.py": conanfile})
+        self.client.run("export . lasote/stable")
+        for os_, compiler, version, shared in [("Linux", "gcc", "7", False),
+                                               ("Linux", "gcc", "6", True),
+                                               ("Windows", "Visual Studio", "15", False)]:
+            self.client.run("install Hello/0.1@lasote/stable --build -s os=%s -s compiler=\"%s\" "
+                            "-s compiler.version=%s -o shared=%s"
+                            % (os_, compiler, version, shared))
+        for remote in ("default", "disk"):
+            self.client.run("upload Hello* --all -r=%s --confirm" % remote)
+
+    def _search_ids(self, query, remote="default"):
+        self.client.run('search Hello/0.1@lasote/stable -r=%s -q "%s"' % (remote, query))
+        return sorted(line.split("Package_ID: ")[1] for line in str(self.client.user_io.out)
+                      .splitlines() if "Package_ID: " in line)
+
+    def test_queries(self):
+        for query in ["os=Linux", "os=Linux AND compiler.version=7", "compiler.version=6 OR "
+                      "compiler=\\\"Visual Studio\\\"", "shared=True", "os=Macos",
+                      "(os=Linux AND shared=False) OR os=Windows"]:
+            self.assertEqual(self._search_ids(query), self._search_ids(query, "disk"), query)
+        self.assertEqual(len(self._search_ids("os=Linux")), 2)
+        self.assertEqual(len(self._search_ids("os=Linux AND compiler.version=7")), 1)
+
+        self.client.run("search Hello* -r=default")
+        self.assertIn("Hello/0.1@lasote/stable", self.client.user_io.out)
+
+        error = self.client.run('search Hello/0.1@lasote/stable -r=default -q "!os=Linux"',
+                                ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("'!' character is not allowed", self.client.user_io.out)
+
+    def test_remove(self):
+        package_id = self._search_ids("os=Windows")[0]
+        self.client.run("remove Hello/0.1@lasote/stable -p %s -r=default -f" % package_id)
+        self.assertEqual(self._search_ids("os=Windows"), [])
+        self.assertEqual(len(self._search_ids("")), 2)
+
+        self.client.run("remove Hello/0.1@lasote/stable -r=default -f")
+        self.client.run("search Hello* -r=default")
+        self.assertIn("There are no packages matching the 'Hello*' pattern",
+                      self.client.user_io.out)
+
+    def test_rebuild(self):
+        server_paths = self.servers["disk"].paths
+        catalog = CatalogSearchManager(SimplePaths(server_paths.store),
+                                       os.path.join(server_paths.store, "..", "catalog.db"))
+        reference = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        self.assertEqual(catalog.search_recipes("hello*"), [reference])
+        self.assertEqual(len(catalog.search_packages(reference, "os=Linux")), 2)
+        self.assertEqual(len(catalog.search_packages(reference, None)), 3)
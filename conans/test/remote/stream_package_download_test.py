@@ -0,0 +1,68 @@
+import json
+import os
+import unittest
+
+from conans.client.rest.uploader_downloader import DownloadStream
+from conans.client.tools import environment_append
+from conans.errors import ConanConnectionError
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestServer, TestBufferConanOutput
+from conans.util.files import load, md5sum, sha1sum, md5
+
+
+class _Response(object):
+    def __init__(self, chunks, content_length):
+        self.chunks = chunks
+        self.headers = {"content-length": str(content_length)}
+
+    def iter_content(self, chunk_size):  # @UnusedVariable
+        return self.chunks
+
+
+class StreamPackageDownloadTest(unittest.TestCase):
+
+    def test_package_tgz_not_saved(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("export . lasote/stable")
+        client.run("install Hello0/0.1@lasote/stable --build")
+        client.run("upload Hello0/0.1@lasote/stable --all")
+
+        ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        package_id = os.listdir(client.paths.packages(ref))[0]
+        package_ref = PackageReference(ref, package_id)
+        server_tgz = os.path.join(servers["default"].paths.package(package_ref), PACKAGE_TGZ_NAME)
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        with environment_append({"CONAN_TRACE_FILE": trace_file}):
+            client.run("install Hello0/0.1@lasote/stable")
+        self.assertIn("Downloading %s" % PACKAGE_TGZ_NAME, client.out)
+        package_folder = client.paths.package(package_ref)
+        self.assertTrue(os.path.exists(os.path.join(package_folder, "include", "helloHello0.h")))
+        self.assertFalse(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+
+        actions = [json.loads(line) for line in load(trace_file).splitlines()]
+        downloaded = [a for a in actions if a["_action"] == "DOWNLOADED_PACKAGE"][0]
+        tgz_doc = [f for f in downloaded["files"] if f["name"] == PACKAGE_TGZ_NAME][0]
+        self.assertEqual(tgz_doc["md5"], md5sum(server_tgz))
+        self.assertEqual(tgz_doc["sha1"], sha1sum(server_tgz))
+
+    def test_stream_read(self):
+        output = TestBufferConanOutput()
+        stream = DownloadStream(_Response([b"Hello ", b"", b"world", b"!"], 12), "url", output)
+        self.assertEqual(stream.read(3), b"Hel")
+        self.assertEqual(stream.read(5), b"lo wo")
+        self.assertEqual(stream.read(), b"rld!")
+        self.assertEqual(stream.read(10), b"")
+        self.assertEqual(stream.checksums[0], md5("Hello world!"))
+
+    def test_stream_interrupted(self):
+        stream = DownloadStream(_Response([b"Hello "], 12), "url", TestBufferConanOutput())
+        self.assertEqual(stream.read(3), b"Hel")
+        with self.assertRaisesRegexp(ConanConnectionError, "Transfer interrupted before complete"):
+            stream.read()
@@ -85,6 +85,7 @@ text=value
         self.assertEquals(config.host_name, "localhost")
         self.assertEquals(config.public_port, 12345)
         self.assertEquals(config.public_url, "https://localhost:12345/v1")
+        self.assertFalse(config.xz_archives)
 
         # Now check with environments
         tmp_storage = temp_folder()
@@ -96,6 +97,7 @@ text=value
         self.environ["CONAN_SERVER_USERS"] = "lasote:lasotepass,pepe2:pepepass2"
         self.environ["CONAN_HOST_NAME"] = "remotehost"
         self.environ["CONAN_SERVER_PUBLIC_PORT"] = "33333"
+        self.environ["CONAN_XZ_ARCHIVES"] = "True"
 
         config = ConanServerConfigParser(self.file_path, environment=self.environ)
         self.assertEquals(config.jwt_secret,  "newkey")
@@ -110,3 +112,4 @@ text=value
         self.assertEquals(config.host_name, "remotehost")
         self.assertEquals(config.public_port, 33333)
         self.assertEquals(config.public_url, "http://remotehost:33333/v1")
+        self.assertTrue(config.xz_archives)
@@ -0,0 +1,111 @@
+import os
+import threading
+import unittest
+
+from conans import __version__
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.version import Version
+from conans.paths import CONAN_MANIFEST
+from conans.server.store.proxy_file_manager import Upstream, FETCH_FOLDER
+from conans.test.server.utils.server_launcher import TestServerLauncher
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.tools import TestClient, TestServer, UpstreamTestRequester
+from conans.util.files import load, save
+
+
+class CountingRequester(UpstreamTestRequester):
+    """ Counts the requests of the download urls of the recipe """
+    recipe_urls = 0
+
+    def get(self, url, **kwargs):
+        if url.endswith("Hello0/0.1/lasote/stable/download_urls"):
+            CountingRequester.recipe_urls += 1
+        return super(CountingRequester, self).get(url, **kwargs)
+
+
+class ProxyServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.upstream = TestServer(read_permissions=[("*/*@*/*", "lasote")],
+                                   write_permissions=[("*/*@*/*", "lasote")])
+        client = TestClient(servers={"default": self.upstream},
+                            users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", build=False))
+        client.run("create . lasote/stable")
+        client.run("upload Hello0/0.1@lasote/stable --all")
+        self.ref = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        self.package_id = os.listdir(client.paths.packages(self.ref))[0]
+
+    def test_read_through(self):
+        proxy = TestServer(upstream=self.upstream, upstream_user=("lasote", "mypass"))
+        client = TestClient(servers={"default": proxy}, users={"default": [("lasote", "mypass")]})
+        client.run("install Hello0/0.1@lasote/stable")
+        self.assertIn("Hello0/0.1@lasote/stable: Package installed %s" % self.package_id,
+                      client.out)
+        package_ref = PackageReference(self.ref, self.package_id)
+        self.assertTrue(os.path.exists(os.path.join(proxy.paths.package(package_ref),
+                                                    CONAN_MANIFEST)))
+        self.assertNotIn(FETCH_FOLDER, os.listdir(proxy.paths.store))
+
+        # Served from the proxy store, even if it is not in the upstream anymore
+        upstream_client = TestClient(servers={"default": self.upstream},
+                                     users={"default": [("lasote", "mypass")]})
+        upstream_client.run("remove Hello0/0.1@lasote/stable -r default -f")
+        client.run("remove * -f")
+        client.run("install Hello0/0.1@lasote/stable")
+        self.assertIn("Hello0/0.1@lasote/stable: Package installed %s" % self.package_id,
+                      client.out)
+
+    def test_not_found(self):
+        proxy = TestServer(upstream=self.upstream, upstream_user=("lasote", "mypass"))
+        client = TestClient(servers={"default": proxy}, users={"default": [("lasote", "mypass")]})
+        error = client.run("install Bye/0.1@lasote/stable", ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Unable to find 'Bye/0.1@lasote/stable' in remotes", client.out)
+        self.assertEqual(os.listdir(proxy.paths.store), [])
+
+    def test_upstream_authentication_error(self):
+        # Without upstream credentials, the upstream denies the access
+        proxy = TestServer(upstream=self.upstream)
+        client = TestClient(servers={"default": proxy}, users={"default": [("lasote", "mypass")]})
+        client.run("user lasote -p mypass")
+        error = client.run("install Hello0/0.1@lasote/stable", ignore_error=True)
+        self.assertTrue(error)
+        # Not an authentication error of the proxy, the client is not asked to log in again
+        self.assertNotIn("Please log in", client.user_io.out)
+        self.assertIn("Error retrieving from upstream", client.out)
+        self.assertEqual(os.listdir(proxy.paths.store), [])
+
+    def test_existing_folder_not_replaced(self):
+        upstream = Upstream(self.upstream.fake_url, "lasote", "mypass",
+                            requester=UpstreamTestRequester({"upstream": self.upstream}))
+        file_manager = TestServerLauncher(server_version=Version(__version__),
+                                          min_client_compatible_version=Version(__version__),
+                                          upstream=upstream).file_manager
+        # Being uploaded to the proxy, the manifest is not there yet
+        export_folder = file_manager.paths.export(self.ref)
+        save(os.path.join(export_folder, "conanfile.py"), "uploading")
+        snapshot = file_manager.get_conanfile_snapshot(self.ref)
+        self.assertEqual(list(snapshot), ["conanfile.py"])
+        self.assertEqual(load(os.path.join(export_folder, "conanfile.py")), "uploading")
+
+    def test_concurrent_requests(self):
+        CountingRequester.recipe_urls = 0
+        upstream = Upstream(self.upstream.fake_url, "lasote", "mypass",
+                            requester=CountingRequester({"upstream": self.upstream}))
+        file_manager = TestServerLauncher(server_version=Version(__version__),
+                                          min_client_compatible_version=Version(__version__),
+                                          upstream=upstream).file_manager
+        snapshots = []
+
+        def get_snapshot():
+            snapshots.append(file_manager.get_conanfile_snapshot(self.ref))
+
+        threads = [threading.Thread(target=get_snapshot) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(snapshots), 8)
+        self.assertIn(CONAN_MANIFEST, snapshots[0])
+        self.assertEqual(CountingRequester.recipe_urls, 1)
@@ -1,9 +1,11 @@
+import json
+import threading
 import unittest
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.service.service import ConanService, FileUploadDownloadService,\
     SearchService
 from conans.paths import CONAN_MANIFEST, CONANINFO, SimplePaths
-from conans.util.files import save_files, save, mkdir, load, md5sum
+from conans.util.files import save_files, save, mkdir, load, md5sum, sha1sum
 from conans.server.service.authorize import BasicAuthorizer
 import os
 from conans.errors import NotFoundException, RequestErrorException
@@ -14,6 +16,7 @@ from datetime import timedelta
 from time import sleep
 from conans.model.manifest import FileTreeManifest
 from conans.test.utils.test_files import temp_folder
+from conans.server.store.checksum_index import ChecksumIndex
 from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.search.search import DiskSearchManager
 
@@ -71,6 +74,45 @@ class FileUploadDownloadServiceTest(unittest.TestCase):
         # Raises if wrong size
         self.assertRaises(RequestErrorException, self.service.put_file, file_saver,
                           self.absolute_file_path, token, len(self.content) + 1)
+        # Raises if wrong checksum, and the previous file is kept
+        self.assertRaises(RequestErrorException, self.service.put_file,
+                          MockFileSaver("thefile.txt", "other content"), self.absolute_file_path,
+                          token, len(self.content), sha1="badsha1")
+        self.assertEqual(load(self.absolute_file_path), self.content)
+        # The temporary upload folders are removed
+        self.assertEqual(os.listdir(os.path.join(self.disk_path, ".uploads")), [])
+
+    def test_file_upload_checksum_deploy(self):
+        export_file = "zlib/1.2.11/lasote/stable/export/conan_export.tgz"
+        package_file = "zlib/1.2.11/lasote/stable/package/123/conan_package.tgz"
+        abs_export_file = os.path.join(self.storage_dir, export_file)
+        abs_package_file = os.path.join(self.storage_dir, package_file)
+        token = self.updown_auth_manager.get_token_for(package_file, "pepe", len(self.content))
+
+        # Not in the server, the client has to upload it
+        sha1 = sha1sum(self._save_tmp_file(self.content))
+        self.assertRaises(NotFoundException, self.service.deploy_checksum, abs_package_file,
+                          token, sha1)
+
+        export_token = self.updown_auth_manager.get_token_for(export_file, "pepe",
+                                                              len(self.content))
+        self.service.put_file(MockFileSaver("conan_export.tgz", self.content), abs_export_file,
+                              export_token, len(self.content), sha1=sha1)
+        self.service.deploy_checksum(abs_package_file, token, sha1)
+        self.assertEqual(load(abs_package_file), self.content)
+
+        # Different content or modified since indexed
+        self.assertRaises(NotFoundException, self.service.deploy_checksum, abs_package_file,
+                          token, "othersha1")
+        os.remove(abs_package_file)
+        save(abs_export_file, "modified!!!")
+        self.assertRaises(NotFoundException, self.service.deploy_checksum, abs_package_file,
+                          token, sha1)
+
+    def _save_tmp_file(self, content):
+        path = os.path.join(temp_folder(), "file")
+        save(path, content)
+        return path
 
 
 class ConanServiceTest(unittest.TestCase):
@@ -118,6 +160,52 @@ class ConanServiceTest(unittest.TestCase):
 
         self.assertEquals(snap, snap_expected)
 
+    def test_snapshot_checksum_index(self):
+        base_path = self.paths.export(self.conan_reference)
+        index_path = os.path.join(self.paths.conan(self.conan_reference), ".checksums",
+                                  "export.json")
+        snap = self.service.get_conanfile_snapshot(self.conan_reference)
+        self.assertTrue(os.path.exists(index_path))
+
+        # The snapshot is served from the index, not hashing the files again
+        index = json.loads(load(index_path))
+        index["main.cpp"]["md5"] = "indexed_md5"
+        save(index_path, json.dumps(index))
+        snap = self.service.get_conanfile_snapshot(self.conan_reference)
+        self.assertEqual(snap["main.cpp"], "indexed_md5")
+
+        # A modified file is hashed again
+        save(os.path.join(base_path, "main.cpp"), "modified main.cpp contents")
+        snap = self.service.get_conanfile_snapshot(self.conan_reference)
+        self.assertEqual(snap["main.cpp"], md5sum(os.path.join(base_path, "main.cpp")))
+
+        self.service.remove_conanfile_files(self.conan_reference, ["main.cpp"])
+        self.assertNotIn("main.cpp", json.loads(load(index_path)))
+        # The index is not a file of the recipe
+        self.assertNotIn(".checksums", str(self.service.get_conanfile_snapshot(self.conan_reference)))
+
+    def test_checksum_index_concurrent_updates(self):
+        # The files of a package are uploaded concurrently, no entry is lost
+        package_reference = PackageReference(self.conan_reference, "123123123")
+        package_folder = self.paths.package(package_reference)
+        names = ["file%d.txt" % index for index in range(20)]
+        for name in names:
+            save(os.path.join(package_folder, name), name)
+        index = ChecksumIndex(self.paths.store)
+        threads = [threading.Thread(target=index.update, args=(os.path.join(package_folder, name),))
+                   for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        index_folder = os.path.join(self.paths.conan(self.conan_reference), ".checksums", "package")
+        self.assertEqual(sorted(json.loads(load(os.path.join(index_folder,
+                                                             "123123123.json")))), sorted(names))
+        self.assertEqual([name for name in os.listdir(index_folder) if name.endswith(".tmp")], [])
+        self.assertEqual(index.find(os.path.join(package_folder, "other.txt"),
+                                    sha1sum(os.path.join(package_folder, "file3.txt")))[0],
+                         os.path.join(package_folder, "file3.txt"))
+
     def test_get_conanfile_download_urls(self):
         urls = self.service.get_conanfile_download_urls(self.conan_reference)
         # Remove parameters
@@ -10,6 +10,7 @@ from conans.util.files import mkdir
 from conans.test.utils.test_files import temp_folder
 from conans.server.migrate import migrate_and_get_server_config
 from conans.search.search import DiskSearchManager
+from conans.search.catalog import CatalogSearchManager
 from conans.paths import SimplePaths
 import time
 import shutil
@@ -27,7 +28,7 @@ class TestServerLauncher(object):
                  write_permissions=None, users=None, base_url=None, plugins=None,
                  server_version=None,
                  min_client_compatible_version=None,
-                 server_capabilities=None):
+                 server_capabilities=None, search_catalog=False, upstream=None):
 
         plugins = plugins or []
         if not base_path:
@@ -51,10 +52,16 @@ class TestServerLauncher(object):
         # Encode and Decode signature for Upload and Download service
         updown_auth_manager = JWTUpDownAuthManager(server_config.updown_secret,
                                                    server_config.authorize_timeout)
-        self.file_manager = get_file_manager(server_config, public_url=base_url,
-                                             updown_auth_manager=updown_auth_manager)
+        if search_catalog:
+            self.search_manager = CatalogSearchManager(SimplePaths(server_config.disk_storage_path),
+                                                       server_config.search_catalog_path)
+        else:
+            self.search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path))
 
-        self.search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path))
+        self.file_manager = get_file_manager(server_config, public_url=base_url,
+                                             updown_auth_manager=updown_auth_manager,
+                                             search_manager=self.search_manager,
+                                             upstream=upstream)
         # Prepare some test users
         if not read_permissions:
             read_permissions = server_config.read_permissions
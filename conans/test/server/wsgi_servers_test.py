@@ -0,0 +1,133 @@
+import os
+import signal
+import threading
+import time
+import unittest
+from wsgiref.simple_server import WSGIServer
+
+import bottle
+import requests
+
+from conans.server.rest.wsgi_servers import PreforkServer, ThreadedServer, _ThreadPoolWSGIServer
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestServer
+from conans.util.files import save
+
+
+class ThreadedServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.content = os.urandom(3 * 1024 * 1024)
+        save(os.path.join(self.folder, "file.bin"), self.content)
+        self.release = threading.Event()
+
+        app = bottle.Bottle()
+
+        @app.route("/slow")
+        def slow():
+            self.release.wait(10)
+            return "slow"
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        @app.route("/file")
+        def get_file():
+            return bottle.static_file("file.bin", root=self.folder)
+
+        adapter = ThreadedServer(host="127.0.0.1", port=0, workers=4, quiet=True)
+        self.server = adapter._make_server(app, _ThreadPoolWSGIServer)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = "http://127.0.0.1:%d" % self.server.server_port
+
+    def tearDown(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_no_head_of_line_blocking(self):
+        slow_result = []
+        slow = threading.Thread(target=lambda: slow_result.append(requests.get(self.url + "/slow")))
+        slow.start()
+        time.sleep(0.2)
+        # Served while the slow request is still running
+        self.assertEqual(requests.get(self.url + "/fast").text, "fast")
+        self.assertEqual(slow_result, [])
+        self.release.set()
+        slow.join()
+        self.assertEqual(slow_result[0].text, "slow")
+
+    def test_file_download(self):
+        response = requests.get(self.url + "/file")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.content)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "prefork needs fork()")
+class PreforkServerTest(unittest.TestCase):
+
+    def _get_pid(self, url):
+        for _ in range(50):
+            try:
+                return int(requests.get(url + "/pid", timeout=5).text)
+            except requests.exceptions.ConnectionError:  # The killed worker socket
+                time.sleep(0.1)
+        raise Exception("Server not responding")
+
+    def _alive(self, pid):
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+    def test_restart_workers_and_terminate(self):
+        app = bottle.Bottle()
+
+        @app.route("/pid")
+        def pid():
+            return str(os.getpid())
+
+        adapter = PreforkServer(host="127.0.0.1", port=0, workers=1, quiet=True)
+        adapter.restart_delay = 0
+        server = adapter._make_server(app, WSGIServer)
+        url = "http://127.0.0.1:%d" % server.server_port
+        parent = os.fork()
+        if parent == 0:
+            try:
+                adapter._serve(server)
+            finally:
+                os._exit(0)
+        server.server_close()
+        try:
+            worker = self._get_pid(url)
+            os.kill(worker, signal.SIGKILL)
+            new_worker = self._get_pid(url)
+            self.assertNotEqual(worker, new_worker)
+        finally:
+            os.kill(parent, signal.SIGTERM)
+            _, status = os.waitpid(parent, 0)
+        self.assertEqual(status, 0)
+        # The parent waited for its workers, nothing is serving anymore
+        self.assertFalse(self._alive(new_worker))
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            requests.get(url + "/pid", timeout=5)
+
+
+class HealthMetricsTest(unittest.TestCase):
+
+    def test_health_metrics(self):
+        server = TestServer()
+        response = server.app.get("/health")
+        self.assertEqual(response.json["status"], "ok")
+
+        server.app.get("/v1/ping")
+        server.app.get("/v1/conans/Hello/0.1/lasote/stable/digest", expect_errors=True)
+        metrics = server.app.get("/metrics").text
+        self.assertIn('conan_server_requests_total{method="GET",status="200"} 1', metrics)
+        self.assertIn('conan_server_requests_total{method="GET",status="404"} 1', metrics)
+        self.assertIn("conan_server_requests_in_progress 0", metrics)
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+import time
+import unittest
+
+from conans import tools
+from conans.client.store.download_cache import DownloadCache
+from conans.errors import ConanException
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import load, save
+
+
+class _Response(object):
+    def __init__(self, content):
+        self.status_code = 200
+        self.ok = True
+        self.headers = {"content-length": str(len(content))}
+        self.content = content
+
+    def iter_content(self, chunk_size):  # @UnusedVariable
+        return [self.content]
+
+    def close(self):
+        pass
+
+
+class _CountingRequester(object):
+    """ Serves the same content for every url, counting the requests """
+    def __init__(self, content, delay=0):
+        self.content = content
+        self.delay = delay
+        self.urls = []
+
+    def get(self, url, **kwargs):  # @UnusedVariable
+        self.urls.append(url)
+        time.sleep(self.delay)
+        return _Response(self.content)
+
+
+class DownloadCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_folder = temp_folder()
+        self.out = TestBufferConanOutput()
+        self._old_requester = tools.net._global_requester
+
+    def tearDown(self):
+        tools.net._global_requester = self._old_requester
+
+    def _download(self, url, **kwargs):
+        filename = os.path.join(temp_folder(), "file.tgz")
+        tools.download(url, filename, out=self.out, **kwargs)
+        return load(filename)
+
+    def test_keyed_by_checksum(self):
+        requester = _CountingRequester(b"the contents")
+        tools.net._global_requester = requester
+        sha256 = hashlib.sha256(b"the contents").hexdigest()
+        with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.cache_folder}):
+            self.assertEqual(self._download("http://mirror1/file.tgz", sha256=sha256),
+                             "the contents")
+            # Other url, same file
+            self.assertEqual(self._download("http://mirror2/file.tgz", sha256=sha256),
+                             "the contents")
+            self.assertIn("Using cached download of http://mirror2/file.tgz", self.out)
+            self.assertEqual(requester.urls, ["http://mirror1/file.tgz"])
+            self.assertTrue(os.path.exists(os.path.join(self.cache_folder, "sha256", sha256)))
+
+            # Without checksums, by url
+            self._download("http://mirror1/file.tgz?ref=v1.2")
+            self._download("http://mirror1/file.tgz?ref=v1.2")
+            self.assertEqual(len(requester.urls), 2)
+
+    def test_keyed_by_full_url(self):
+        tools.net._global_requester = _CountingRequester(b"version 1.2")
+        with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.cache_folder}):
+            self.assertEqual(self._download("http://mirror1/archive.tgz?ref=v1.2"), "version 1.2")
+            tools.net._global_requester = _CountingRequester(b"version 1.3")
+            # Only the query is different, it is other file
+            self.assertEqual(self._download("http://mirror1/archive.tgz?ref=v1.3"), "version 1.3")
+            self.assertEqual(self._download("http://mirror1/archive.tgz?ref=v1.2"), "version 1.2")
+
+    def test_checksum_mismatch_not_cached(self):
+        tools.net._global_requester = _CountingRequester(b"the contents")
+        with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.cache_folder}):
+            with self.assertRaisesRegexp(ConanException, "md5 signature failed"):
+                self._download("http://mirror1/file.tgz", md5="1234")
+        self.assertEqual(os.listdir(os.path.join(self.cache_folder, "md5")), ["1234.lock"])
+
+    def test_corrupted_entry(self):
+        requester = _CountingRequester(b"the contents")
+        tools.net._global_requester = requester
+        md5 = hashlib.md5(b"the contents").hexdigest()
+        save(os.path.join(self.cache_folder, "md5", md5), "corrupted")
+        with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.cache_folder}):
+            self.assertEqual(self._download("http://mirror1/file.tgz", md5=md5), "the contents")
+        self.assertIn("Corrupted cached download", self.out)
+        self.assertEqual(len(requester.urls), 1)
+        self.assertEqual(load(os.path.join(self.cache_folder, "md5", md5)), "the contents")
+
+    def test_concurrent_downloads(self):
+        requester = _CountingRequester(b"the contents", delay=0.2)
+        tools.net._global_requester = requester
+        results = []
+
+        def download():
+            results.append(self._download("http://mirror1/file.tgz"))
+
+        with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.cache_folder}):
+            threads = [threading.Thread(target=download) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ["the contents"] * 4)
+        self.assertEqual(len(requester.urls), 1)
+
+    def test_lru_eviction(self):
+        cache = DownloadCache(self.cache_folder, max_size=25)
+        entries = []
+        for index in range(3):
+            entry = os.path.join(self.cache_folder, "url", "entry%d" % index)
+            save(entry, "0123456789")
+            os.utime(entry, (index, index))
+            entries.append(entry)
+        save(entries[0] + ".lock", "")
+        os.utime(entries[0], (10, 10))  # Recently used
+        self.assertEqual(cache.evict(), 10)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.cache_folder, "url"))),
+                         ["entry0", "entry0.lock", "entry2"])
+        self.assertEqual(DownloadCache(self.cache_folder).evict(), 0)
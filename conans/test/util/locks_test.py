@@ -0,0 +1,123 @@
+import os
+import platform
+import threading
+import time
+import unittest
+
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput, TestClient
+from conans.util.files import load, save
+from conans.util.locks import FcntlReadLock, FcntlWriteLock
+
+
+@unittest.skipIf(platform.system() == "Windows", "fcntl is not available in Windows")
+class FcntlLockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "Hello", "0.1", "lasote", "stable")
+        self.output = TestBufferConanOutput()
+
+    def _lock(self, lock_class, timeout=None):
+        return lock_class(self.folder, "Hello/0.1@lasote/stable", self.output, timeout)
+
+    def test_shared_readers(self):
+        with self._lock(FcntlReadLock):
+            with self._lock(FcntlReadLock, timeout=1):
+                pass
+        self.assertNotIn("locked by another", str(self.output))
+        self.assertFalse(os.path.exists(self.folder + ".count"))
+
+    def test_writer_timeout(self):
+        with self._lock(FcntlReadLock):
+            with self.assertRaisesRegexp(ConanException, "Timeout waiting 0.1 seconds"):
+                with self._lock(FcntlWriteLock, timeout=0.1):
+                    pass
+        self.assertIn("Hello/0.1@lasote/stable is locked by another concurrent conan process",
+                      str(self.output))
+
+    def test_writer_timeout_thread(self):
+        errors = []
+
+        def writer():
+            try:
+                with self._lock(FcntlWriteLock, timeout=0.1):
+                    pass
+            except ConanException as e:
+                errors.append(str(e))
+
+        with self._lock(FcntlReadLock):
+            thread = threading.Thread(target=writer)
+            thread.start()
+            thread.join()
+        self.assertEqual(errors, ["Timeout waiting 0.1 seconds for the lock of "
+                                  "Hello/0.1@lasote/stable"])
+
+    def test_writer_waits_before_timeout(self):
+        reader = self._lock(FcntlReadLock)
+        reader.__enter__()
+        timer = threading.Timer(0.2, reader.__exit__, (None, None, None))
+        timer.start()
+        t1 = time.time()
+        with self._lock(FcntlWriteLock, timeout=10):
+            self.assertGreater(time.time() - t1, 0.1)
+        timer.join()
+
+    def test_writer_waits_readers(self):
+        events = []
+
+        def reader():
+            with self._lock(FcntlReadLock):
+                events.append("read")
+                time.sleep(0.3)
+                events.append("read done")
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        while not events:
+            time.sleep(0.01)
+        with self._lock(FcntlWriteLock):
+            events.append("write")
+        thread.join()
+        self.assertEqual(events, ["read", "read done", "write"])
+
+    def test_lock_wait_traced(self):
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        os.environ["CONAN_TRACE_FILE"] = trace_file
+        try:
+            with self._lock(FcntlWriteLock):
+                with self.assertRaises(ConanException):
+                    with self._lock(FcntlWriteLock, timeout=0.05):
+                        pass
+            # The waits that finish with the lock are traced
+            reader = self._lock(FcntlReadLock)
+            writer = self._lock(FcntlWriteLock)
+            reader.__enter__()
+            timer = threading.Timer(0.1, reader.__exit__, (None, None, None))
+            timer.start()
+            with writer:
+                pass
+            timer.join()
+        finally:
+            del os.environ["CONAN_TRACE_FILE"]
+        self.assertIn('"_action": "LOCK_WAIT"', load(trace_file))
+        self.assertIn('"type": "write"', load(trace_file))
+
+    def test_client_backend(self):
+        client = TestClient()
+        conf = load(client.client_cache.conan_conf_path)
+        save(client.client_cache.conan_conf_path,
+             conf.replace("[general]", "[general]\ncache_lock_backend = fcntl"))
+        client.save({"conanfile.py": """from conans import ConanFile
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = "0.1"
+"""})
+        client.run("create . lasote/stable")
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        conan_folder = client.client_cache.conan(ref)
+        self.assertTrue(os.path.exists(conan_folder + ".flock"))
+        self.assertFalse(os.path.exists(conan_folder + ".count"))
+        client.run("remove Hello* -f")
+        self.assertFalse(os.path.exists(conan_folder + ".flock"))
@@ -2,6 +2,7 @@ import os
 import shlex
 import shutil
 import sys
+import threading
 import uuid
 from collections import Counter
 from contextlib import contextmanager
@@ -23,10 +24,11 @@ from conans.client.conf import MIN_SERVER_COMPATIBLE_VERSION
 from conans.client.output import ConanOutput
 from conans.client.remote_registry import RemoteRegistry
 from conans.client.rest.conan_requester import ConanRequester
-from conans.client.rest.uploader_downloader import IterableToFileAdapter
+from conans.client.rest.uploader_downloader import FileUploadAdapter
 from conans.client.userio import UserIO
 from conans.model.version import Version
 from conans.search.search import DiskSearchManager
+from conans.server.store.proxy_file_manager import Upstream
 from conans.test.server.utils.server_launcher import (TESTING_REMOTE_PRIVATE_USER,
                                                       TESTING_REMOTE_PRIVATE_PASS,
                                                       TestServerLauncher)
@@ -54,7 +56,10 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        return self.test_response.status_code in (200, 206)
+
+    def close(self):
+        pass
 
     @property
     def content(self):
@@ -149,7 +154,7 @@ class TestRequester(object):
             kwargs.pop("cert", None)
             kwargs.pop("timeout", None)
             if "data" in kwargs:
-                if isinstance(kwargs["data"], IterableToFileAdapter):
+                if isinstance(kwargs["data"], FileUploadAdapter):
                     data_accum = b""
                     for tmp in kwargs["data"]:
                         data_accum += tmp
@@ -177,6 +182,30 @@ class TestRequester(object):
             kwargs["headers"].update(mock_request.headers)
 
 
+class UpstreamTestRequester(TestRequester):
+    """ TestRequester for the calls of a server to its upstream server. They are done in other
+    thread, the bottle request being served is thread local and it would be replaced
+    """
+    def _in_thread(self, method, url, kwargs):
+        result = []
+
+        def call():
+            try:
+                result.append((method(url, **kwargs), None))
+            except Exception as exc:
+                result.append((None, exc))
+        thread = threading.Thread(target=call)
+        thread.start()
+        thread.join()
+        response, exc = result[0]
+        if exc is not None:
+            raise exc
+        return response
+
+    def get(self, url, **kwargs):
+        return self._in_thread(super(UpstreamTestRequester, self).get, url, kwargs)
+
+
 class TestServer(object):
     from conans import __version__ as SERVER_VERSION
     from conans.server.conf import MIN_CLIENT_COMPATIBLE_VERSION
@@ -185,12 +214,16 @@ class TestServer(object):
                  write_permissions=None, users=None, plugins=None, base_path=None,
                  server_version=Version(SERVER_VERSION),
                  min_client_compatible_version=Version(MIN_CLIENT_COMPATIBLE_VERSION),
-                 server_capabilities=None, complete_urls=False):
+                 server_capabilities=None, complete_urls=False, search_catalog=False,
+                 upstream=None, upstream_user=None):
         """
              'read_permissions' and 'write_permissions' is a list of:
                  [("opencv/2.3.4@lasote/testing", "user1, user2")]
 
              'users':  {username: plain-text-passwd}
+
+             'upstream': TestServer, it works as a cache of it, with the
+                 (user, password) upstream_user
         """
         # Unique identifier for this server, will be used by TestRequester
         # to determine where to call. Why? remote_manager just assing an url
@@ -206,13 +239,19 @@ class TestServer(object):
         self.fake_url = "http://fake%s.com" % str(uuid.uuid4()).replace("-", "")
         min_client_ver = min_client_compatible_version
         base_url = "%s/v1" % self.fake_url if complete_urls else "v1"
+        if upstream:
+            user, password = upstream_user or (None, None)
+            upstream = Upstream(upstream.fake_url, user, password,
+                                requester=UpstreamTestRequester({"upstream": upstream}))
         self.test_server = TestServerLauncher(base_path, read_permissions,
                                               write_permissions, users,
                                               base_url=base_url,
                                               plugins=plugins,
                                               server_version=server_version,
                                               min_client_compatible_version=min_client_ver,
-                                              server_capabilities=server_capabilities)
+                                              server_capabilities=server_capabilities,
+                                              search_catalog=search_catalog,
+                                              upstream=upstream)
         self.app = TestApp(self.test_server.ra.root_app)
 
     @property
@@ -12,6 +12,10 @@ import six
 from conans.util.log import logger
 import tarfile
 import stat
+import struct
+import zlib
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
 
 def make_read_only(path):
@@ -95,7 +99,7 @@ def _generic_algorithm_sum(file_path, algorithm_name):
     with open(file_path, 'rb') as fh:
         m = hashlib.new(algorithm_name)
         while True:
-            data = fh.read(8192)
+            data = fh.read(1024 * 1024)
             if not data:
                 break
             m.update(data)
@@ -266,9 +270,98 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def taropen_for_write(name, fileobj, compression_format=None):
+    """ Opens a tar file to be written in the fileobj. It is gzip compressed (the default) or
+    xz if compression_format="xz". CONAN_COMPRESSION_LEVEL and CONAN_COMPRESSION_THREADS
+    define the compression level and the threads used to gzip it. The xz preset is
+    CONAN_XZ_COMPRESSION_PRESET, by default 6, the highest ones are slow and need a lot of memory
+    """
+    if compression_format == "xz":
+        preset = int(os.getenv("CONAN_XZ_COMPRESSION_PRESET", 6))
+        return tarfile.open(name, mode="w:xz", fileobj=fileobj, preset=preset)
+
+    compresslevel = int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+
+    threads = int(os.getenv("CONAN_COMPRESSION_THREADS", 1))
+    if threads <= 1:
+        return gzopen_without_timestamps(name, mode="w", fileobj=fileobj,
+                                         compresslevel=compresslevel)
+
+    gzfile = ParallelGzipFile(fileobj, compresslevel, threads)
+    try:
+        t = tarfile.TarFile.taropen(name, "w", gzfile)
+    except:
+        gzfile.close()
+        raise
+    t._extfileobj = False
+    return t
+
+
+def _deflate_block(data, compresslevel, last):
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends the block byte aligned, so the next one can be just appended
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last
+                                                        else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipFile(object):
+    """ Write only gzip file (like pigz), the data is split in blocks that are deflated
+    concurrently, then written in order as a single deflate stream. The result is a standard
+    gzip file, without timestamp, readable by any gzip implementation
+    """
+    block_size = 1024 * 1024
+
+    def __init__(self, fileobj, compresslevel, threads):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._pool = ThreadPool(threads)
+        self._max_pending = threads * 2  # Bounds the memory used while the blocks are deflated
+        self._pending = deque()
+        self._buffer = []
+        self._buffered = 0
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+        # magic, deflate, no flags, mtime=0, no extra flags, unknown OS
+        self._fileobj.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+
+    def tell(self):
+        return self._size
+
+    def write(self, data):
+        self._crc = zlib.crc32(data, self._crc) & 0xffffffff
+        self._size += len(data)
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.block_size:
+            self._deflate(last=False)
+        return len(data)
+
+    def _deflate(self, last):
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        self._pending.append(self._pool.apply_async(_deflate_block,
+                                                    (data, self._compresslevel, last)))
+        while self._pending and (last or len(self._pending) > self._max_pending):
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._deflate(last=True)
+            self._fileobj.write(struct.pack("<LL", self._crc, self._size & 0xffffffff))
+        finally:
+            self._pool.close()
+            self._pool.join()
+
+
+def tar_extract(fileobj, destination_dir, stream=False):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read only once,
+    sequentially, so it can be a non seekable one, like a download in progress"""
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
@@ -284,7 +377,7 @@ def tar_extract(fileobj, destination_dir):
                 finfo.name = finfo.name.replace("\\", "/")
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
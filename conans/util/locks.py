@@ -1,8 +1,17 @@
+import errno
 import fasteners
+from conans.errors import ConanException
 from conans.util.log import logger
+from conans.util.tracer import log_lock_wait
 import time
-from conans.util.files import save, load
+from conans.util.files import save, load, mkdir
 import os
+import signal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 class NoLock(object):
@@ -97,3 +106,108 @@ class WriteLock(Lock):
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
             save(self._count_file, "0")
+
+
+class _LockTimeout(Exception):
+    pass
+
+
+def _raise_lock_timeout(signum, frame):  # @UnusedVariable
+    raise _LockTimeout()
+
+
+class FcntlLock(Lock):
+    """ Reader/writer lock with fcntl shared/exclusive locks of the folder + ".flock" file. The
+    waiting processes are blocked in the kernel, without polling or counting the readers in a
+    file, and the locks are released by the system if a process dies, they can't become stale
+    """
+    exclusive = False
+
+    def __init__(self, folder, locked_item, output, timeout=None):
+        super(FcntlLock, self).__init__(folder, locked_item, output)
+        self._lock_file = folder + ".flock"
+        self._timeout = timeout
+        self._handle = None
+
+    @staticmethod
+    def available():
+        return fcntl is not None
+
+    @property
+    def files(self):
+        return (self._lock_file, )
+
+    def _try_lock(self, blocking=False):
+        operation = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+        try:
+            fcntl.flock(self._handle.fileno(), operation if blocking else operation | fcntl.LOCK_NB)
+            return True
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                raise
+            return False
+
+    def _wait(self, t1):
+        if not self._timeout:
+            self._try_lock(blocking=True)
+            return
+        # Blocked in the kernel until the lock or a SIGALRM at the timeout, only the main thread
+        # can handle signals, the other threads (install_jobs) poll the lock
+        try:
+            old_handler = signal.signal(signal.SIGALRM, _raise_lock_timeout)
+        except (ValueError, AttributeError):  # Not the main thread, or Windows
+            return self._poll(t1)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, max(t1 + self._timeout - time.time(), 0.001))
+            try:
+                self._try_lock(blocking=True)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _LockTimeout:  # If acquired just before, released when the handle is closed
+            self._raise_timeout()
+        finally:
+            signal.signal(signal.SIGALRM, old_handler)
+
+    def _poll(self, t1):
+        delay = 0.01
+        while not self._try_lock():
+            if time.time() - t1 > self._timeout:
+                self._raise_timeout()
+            time.sleep(delay)
+            delay = min(delay * 2, READ_BUSY_DELAY)
+
+    def _raise_timeout(self):
+        raise ConanException("Timeout waiting %s seconds for the lock of %s"
+                             % (self._timeout, str(self._locked_item)))
+
+    def __enter__(self):
+        mkdir(os.path.dirname(self._lock_file))
+        self._handle = open(self._lock_file, "a")
+        try:
+            if self._try_lock():
+                return
+            t1 = time.time()
+            self._info_locked()
+            self._wait(t1)
+        except BaseException:
+            self._handle.close()
+            raise
+        duration = time.time() - t1
+        lock_type = "write" if self.exclusive else "read"
+        logger.debug("Waited %f seconds for the %s lock of %s"
+                     % (duration, lock_type, str(self._locked_item)))
+        log_lock_wait(self._locked_item, lock_type, duration)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
+        try:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._handle.close()
+
+
+class FcntlReadLock(FcntlLock):
+    exclusive = False
+
+
+class FcntlWriteLock(FcntlLock):
+    exclusive = True
@@ -17,7 +17,8 @@ TRACER_ACTIONS = ["UPLOADED_RECIPE", "UPLOADED_PACKAGE",
                   "REST_API_CALL", "COMMAND",
                   "EXCEPTION",
                   "DOWNLOAD",
-                  "UNZIP", "ZIP"]
+                  "UNZIP", "ZIP",
+                  "LOCK_WAIT"]
 
 MASKED_FIELD = "**********"
 
@@ -64,14 +65,23 @@ def _append_action(action_name, props):
 
 # ############## LOG METHODS ######################
 
-def _file_document(name, path):
-    return {"name": name, "path": path, "md5": md5sum(path), "sha1": sha1sum(path)}
+def _file_document(name, path, checksums=None):
+    md5, sha1 = checksums or (md5sum(path), sha1sum(path))
+    return {"name": name, "path": path, "md5": md5, "sha1": sha1}
+
+
+def _file_documents(files, checksums=None):
+    """files is a dict with relative path as keys and abs path as values. checksums can
+    provide the already computed (md5, sha1) of some of them, i.e. streamed downloads"""
+    if not files or not _get_tracer_file():  # Do not read the files again if not tracing
+        return []
+    checksums = checksums or {}
+    return [_file_document(name, path, checksums.get(name)) for name, path in files.items()]
 
 
 def log_recipe_upload(conan_reference, duration, files_uploaded, remote):
     assert(isinstance(conan_reference, ConanFileReference))
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_RECIPE", {"_id": str(conan_reference),
                                        "duration": duration,
                                        "files": files_uploaded,
@@ -81,8 +91,7 @@ def log_recipe_upload(conan_reference, duration, files_uploaded, remote):
 def log_package_upload(package_ref, duration, files_uploaded, remote):
     """files_uploaded is a dict with relative path as keys and abs path as values"""
     assert(isinstance(package_ref, PackageReference))
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_PACKAGE", {"_id": str(package_ref),
                                         "duration": duration,
                                         "files": files_uploaded,
@@ -91,8 +100,7 @@ def log_package_upload(package_ref, duration, files_uploaded, remote):
 
 def log_recipe_download(conan_reference, duration, remote, files_downloaded):
     assert(isinstance(conan_reference, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE", {"_id": str(conan_reference),
                                          "duration": duration,
                                          "remote": remote.name,
@@ -101,18 +109,16 @@ def log_recipe_download(conan_reference, duration, remote, files_downloaded):
 
 def log_recipe_sources_download(conan_reference, duration, remote, files_downloaded):
     assert(isinstance(conan_reference, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE_SOURCES", {"_id": str(conan_reference),
                                                  "duration": duration,
                                                  "remote": remote.name,
                                                  "files": files_downloaded})
 
 
-def log_package_download(package_ref, duration, remote, files_downloaded):
+def log_package_download(package_ref, duration, remote, files_downloaded, checksums=None):
     assert(isinstance(package_ref, PackageReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded, checksums)
     _append_action("DOWNLOADED_PACKAGE", {"_id": str(package_ref),
                                           "duration": duration,
                                           "remote": remote.name,
@@ -162,6 +168,10 @@ def log_uncompressed_file(src_path, duration, dest_folder):
 
 
 def log_compressed_files(files, duration, tgz_path):
-    files = files or {}
-    files_compressed = [_file_document(name, path) for name, path in files.items()]
+    files_compressed = _file_documents(files)
     _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration})
+
+
+def log_lock_wait(locked_item, lock_type, duration):
+    _append_action("LOCK_WAIT", {"_id": str(locked_item), "type": lock_type,
+                                 "duration": duration})